@@ -1,11 +1,16 @@
 import bibtexparser.exceptions
 import bibtexparser.middlewares
 import bibtexparser.model
+from bibtexparser.entrypoint import Parser
+from bibtexparser.entrypoint import Writer
 from bibtexparser.entrypoint import parse_file
 from bibtexparser.entrypoint import parse_string
+from bibtexparser.entrypoint import parse_to_dicts
 from bibtexparser.entrypoint import write_file
 from bibtexparser.entrypoint import write_string
 from bibtexparser.library import Library
+from bibtexparser.patching import patch_file
+from bibtexparser.person_index import PersonIndex
 from bibtexparser.writer import BibtexFormat
 
 __version__ = "2.0.0b9"
@@ -0,0 +1,249 @@
+"""On-disk cache of parsed libraries, used by ``parse_file(..., cache_dir=...)``.
+
+Every cached library is stored in its own file, named after a hash of the content of the
+parsed file and of the configuration of the parser (its parse stack, the encoding and
+``track_modifications``). A cached library is hence only used if the file and the parser
+are unchanged; there is no need to invalidate the cache manually. Libraries are not
+cached if the configuration of a middleware can not be described completely, e.g. if
+it holds objects without attributes (other than compiled regular expressions), or
+objects nested too deeply. Middleware may describe its configuration itself (see
+``Middleware._configuration``).
+
+The files start with a versioned header, followed by a pickle of the library.
+Files with another header (e.g. written by another version of bibtexparser) or which
+can not be read are treated as missing, and are replaced.
+As loading a cached library unpickles its file, which can run arbitrary code,
+the cache directory must only be writable by trusted users.
+
+The size of a cache directory is bounded: when a library is added, the least recently
+used files are removed until the directory is smaller than the maximal size.
+"""
+
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import re
+import tempfile
+import types
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .library import Library
+from .middlewares.middleware import Middleware
+from .model import _RAW_STATE
+from .model import Block
+
+logger = logging.getLogger(__name__)
+
+# Increase whenever the format of the cache files changes.
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_MAX_SIZE = 1024**3  # 1 GiB
+
+_CACHE_FILE_SUFFIX = ".bibcache"
+_HEADER = b"bibtexparser-cache\x00" + CACHE_FORMAT_VERSION.to_bytes(4, "big")
+_HASH_CHUNK_SIZE = 1024 * 1024
+# Depth up to which the attributes of objects in middleware are described; configurations
+#   nested deeper are not cached.
+_MAX_DESCRIPTION_DEPTH = 8
+
+
+def cache_key(
+    source: Union[str, os.PathLike, bytes],
+    parse_stack: Iterable[Middleware],
+    encoding: str,
+    track_modifications: bool,
+) -> Optional[str]:
+    """The key under which the library parsed from a file is cached.
+
+    :param source: Path of the parsed file, or its content (as read before parsing it).
+    :param parse_stack: The middleware applied to the parsed library.
+    :param encoding: The encoding with which the file is read.
+    :param track_modifications: Whether the blocks are marked as unmodified.
+    :return: A hex digest of the content of the file and of the configuration, or ``None``
+        if the configuration of the middleware can not be described completely (see
+        :py:func:`_describe`), in which case the library must not be cached."""
+    from . import __version__
+
+    digest = hashlib.sha256()
+    for part in (
+        str(CACHE_FORMAT_VERSION),
+        __version__,
+        encoding.lower(),
+        str(track_modifications),
+    ):
+        digest.update(part.encode("UTF-8") + b"\x00")
+    for middleware in parse_stack:
+        try:
+            description = _describe(middleware)
+        except _NotDescribable as e:
+            logger.info(f"Not caching: the configuration of {middleware!r} is unknown ({e})")
+            return None
+        digest.update(description.encode("UTF-8") + b"\x00")
+    if isinstance(source, bytes):
+        digest.update(source)
+        return digest.hexdigest()
+    with open(source, "rb") as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load(cache_dir: Union[str, os.PathLike], key: str) -> Optional[Library]:
+    """Load the library cached under ``key``, or ``None`` if there is none.
+
+    Loading a library marks it as recently used.
+
+    :param cache_dir: The cache directory.
+    :param key: The key, as returned by :py:func:`cache_key`."""
+    path = _cache_file(cache_dir, key)
+    try:
+        with open(path, "rb") as file:
+            if file.read(len(_HEADER)) != _HEADER:
+                raise ValueError("Unknown cache file header")
+            library = pickle.load(file)
+        if not isinstance(library, Library):
+            raise ValueError("Cache file does not contain a library")
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring invalid cache file {path}: {e}")
+        _remove(path)
+        return None
+    return library
+
+
+def store(
+    cache_dir: Union[str, os.PathLike],
+    key: str,
+    library: Library,
+    max_size: int = DEFAULT_CACHE_MAX_SIZE,
+) -> None:
+    """Cache a library under ``key``, then evict old files to keep the cache below max_size.
+
+    The cache file is written atomically, hence processes sharing a cache directory
+    never read incomplete files. Libraries larger than ``max_size`` are not cached.
+
+    :param cache_dir: The cache directory; created if it does not exist.
+    :param key: The key, as returned by :py:func:`cache_key`.
+    :param library: The library to cache.
+    :param max_size: Maximum total size of the cache files in the directory, in bytes."""
+    snapshot = _HEADER + pickle.dumps(library, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(snapshot) > max_size:
+        logger.info(f"Not caching library of {len(snapshot)} bytes (max_size={max_size})")
+        return
+
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(snapshot)
+        os.replace(temp_path, _cache_file(cache_dir, key))
+    except BaseException:
+        _remove(temp_path)
+        raise
+    evict(cache_dir, max_size)
+
+
+def evict(cache_dir: Union[str, os.PathLike], max_size: int) -> None:
+    """Remove the least recently used cache files, until their total size is at most max_size.
+
+    :param cache_dir: The cache directory.
+    :param max_size: Maximum total size of the cache files, in bytes. ``0`` clears the cache."""
+    files = []
+    for dir_entry in os.scandir(cache_dir):
+        if not dir_entry.name.endswith(_CACHE_FILE_SUFFIX):
+            continue
+        try:
+            stat = dir_entry.stat()
+        except FileNotFoundError:
+            continue  # Removed by another process
+        files.append((stat.st_mtime, stat.st_size, dir_entry.path))
+
+    total_size = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total_size <= max_size:
+            break
+        _remove(path)
+        total_size -= size
+
+
+def _cache_file(cache_dir: Union[str, os.PathLike], key: str) -> str:
+    return os.path.join(cache_dir, key + _CACHE_FILE_SUFFIX)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class _NotDescribable(Exception):
+    """Raised for configurations which can not be described completely."""
+
+
+def _describe(value, ancestors: Tuple[int, ...] = ()) -> str:
+    """A deterministic description of the configuration held by ``value``.
+
+    Values of simple types are described by their repr, compiled regular expressions by
+    their pattern and flags, functions and classes by their qualified name (and, for
+    functions, their code), and other objects by their type and their attributes.
+    Of middleware, only the attributes of its ``_configuration`` are described, and of
+    blocks, the state recorded by ``mark_unmodified`` is ignored.
+
+    :raises _NotDescribable: If ``value`` holds objects without attributes (which may
+        hold configuration nonetheless, e.g. objects of C extensions), or is nested
+        deeper than ``_MAX_DESCRIPTION_DEPTH``.
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return repr(value)
+    if isinstance(value, re.Pattern):
+        return f"re.compile({value.pattern!r}, {value.flags})"
+    if isinstance(value, types.FunctionType):
+        # Lambdas share their qualified name, hence their code is described as well
+        code = value.__code__
+        code_hash = hashlib.sha256(code.co_code).hexdigest()
+        return f"{value.__module__}.{value.__qualname__}:{code.co_firstlineno}:{code_hash}"
+    if isinstance(value, (type, types.BuiltinFunctionType)):
+        return f"{value.__module__}.{value.__qualname__}"
+    if id(value) in ancestors:
+        # A reference to an enclosing object (e.g. a bound method of the middleware)
+        return f"<cycle {ancestors.index(id(value))}>"
+    if len(ancestors) > _MAX_DESCRIPTION_DEPTH:
+        raise _NotDescribable(f"{type(value)} is nested too deeply")
+    ancestors = (*ancestors, id(value))
+    name = f"{type(value).__module__}.{type(value).__qualname__}"
+
+    if isinstance(value, (list, tuple)):
+        items = ", ".join(_describe(item, ancestors) for item in value)
+        return f"{type(value).__name__}({items})"
+    if isinstance(value, (set, frozenset)):
+        items = ", ".join(sorted(_describe(item, ancestors) for item in value))
+        return f"{type(value).__name__}({items})"
+    if isinstance(value, dict):
+        items = ", ".join(
+            sorted(
+                f"{_describe(k, ancestors)}: {_describe(v, ancestors)}" for k, v in value.items()
+            )
+        )
+        return f"dict({items})"
+    if isinstance(value, types.MethodType):
+        return f"{_describe(value.__self__, ancestors)}.{value.__func__.__name__}"
+    if isinstance(value, functools.partial):
+        return name + _describe((value.func, value.args, value.keywords), ancestors)
+
+    attributes = getattr(value, "__dict__", None)
+    if attributes is None:
+        raise _NotDescribable(f"{type(value)} has no attributes")
+    if isinstance(value, Middleware):
+        attributes = value._configuration()
+    elif isinstance(value, Block):
+        # Whether a block was modified since it was parsed is not part of its content
+        attributes = {k: v for k, v in attributes.items() if k != _RAW_STATE}
+    return name + _describe(attributes, ancestors)
@@ -1,17 +1,32 @@
 import codecs
+import io
+import os
 import warnings
+from typing import Dict
 from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import TextIO
+from typing import Tuple
 from typing import Union
 
+from . import cache
+from .cache import DEFAULT_CACHE_MAX_SIZE
+from .events import ParseHandler
 from .library import Library
+from .middlewares.enclosing import AddEnclosingMiddleware
+from .middlewares.enclosing import RemoveEnclosingMiddleware
+from .middlewares.interpolate import _value_is_nonstring_or_enclosed
+from .middlewares.middleware import BlockMiddleware
 from .middlewares.middleware import Middleware
 from .middlewares.parsestack import default_parse_stack
 from .middlewares.parsestack import default_unparse_stack
+from .model import Block
 from .splitter import Splitter
+from .splitter import _scan_events
 from .writer import BibtexFormat
+from .writer import _write_iter
 from .writer import write
 
 
@@ -126,6 +141,7 @@ def parse_string(
     parse_stack: Optional[Iterable[Middleware]] = None,
     append_middleware: Optional[Iterable[Middleware]] = None,
     library: Optional[Library] = None,
+    track_modifications: bool = False,
 ):
     """Parse a BibTeX string.
 
@@ -141,16 +157,18 @@ def parse_string(
     :param library:
         Library to add entries to. If ``None`` (default), a new library will be created.
 
+    :param track_modifications:
+        Mark the parsed blocks as unmodified, to allow writing them as they were read
+        (see ``raw_passthrough`` of ``write_string``).
+
     :return: Library: Parsed BibTeX database
     """
-    splitter = Splitter(bibstr=bibtex_str)
-    library = splitter.split(library=library)
-
-    middleware: Middleware
-    for middleware in _build_parse_stack(parse_stack, append_middleware):
-        library = middleware.transform(library=library)
-
-    return library
+    parser = Parser(
+        parse_stack=parse_stack,
+        append_middleware=append_middleware,
+        track_modifications=track_modifications,
+    )
+    return parser.parse_string(bibtex_str, library=library)
 
 
 def parse_file(
@@ -158,6 +176,9 @@ def parse_file(
     parse_stack: Optional[Iterable[Middleware]] = None,
     append_middleware: Optional[Iterable[Middleware]] = None,
     encoding: str = "UTF-8",
+    track_modifications: bool = False,
+    cache_dir: Optional[Union[str, os.PathLike]] = None,
+    cache_max_size: int = DEFAULT_CACHE_MAX_SIZE,
 ) -> Library:
     """Parse a BibTeX file
 
@@ -171,19 +192,109 @@ def parse_file(
         (ignored if a not-``None`` parse_stack is passed).
 
     :param encoding: Encoding of the .bib file. Default encoding is ``"UTF-8"``.
+    :param track_modifications:
+        Mark the parsed blocks as unmodified, to allow writing them as they were read
+        (see ``raw_passthrough`` of ``write_file``).
+    :param cache_dir: If set, parsed libraries are cached in this directory, and parsing
+        the same file again with the same configuration loads the cached library instead.
+        See :py:mod:`bibtexparser.cache`. The cached libraries are unpickled when loaded,
+        hence the directory must be trusted (i.e., only be writable by trusted users).
+        Parse stacks whose configuration can not be described completely (e.g. holding
+        objects of C extensions) are not cached.
+    :param cache_max_size: Maximum size of the cache directory in bytes (default: 1 GiB).
+        The least recently used libraries are removed when it is exceeded.
     :return: Library: Parsed BibTeX library
     :raises LookupError: If the specified encoding is not recognized.
     """
-    try:
-        codecs.lookup(encoding)
-    except LookupError:
-        raise LookupError(f"Unknown encoding: {encoding!r}")
-
-    with open(path, encoding=encoding) as f:
-        bibtex_str = f.read()
-        return parse_string(
-            bibtex_str, parse_stack=parse_stack, append_middleware=append_middleware
-        )
+    parser = Parser(
+        parse_stack=parse_stack,
+        append_middleware=append_middleware,
+        track_modifications=track_modifications,
+    )
+    return parser.parse_file(
+        path, encoding=encoding, cache_dir=cache_dir, cache_max_size=cache_max_size
+    )
+
+
+class _EntryCollector(ParseHandler):
+    """Collects the entries (as type, key and field tuples) and strings of a bibtex string."""
+
+    def __init__(self):
+        self.entries: List[Tuple[str, str, List[Tuple[str, str]]]] = []
+        self.strings: List[Tuple[str, str]] = []
+        self._entry: Optional[Tuple[str, str, List[Tuple[str, str]]]] = None
+
+    # docstr-coverage: inherited
+    def on_entry_start(self, entry_type: str, key: str, line: int):
+        self._entry = (entry_type, key, [])
+
+    # docstr-coverage: inherited
+    def on_field(self, key: str, value, line: int):
+        self._entry[2].append((key, str(value)))
+
+    # docstr-coverage: inherited
+    def on_entry_end(self):
+        # Entries which fail after they started are never added
+        self.entries.append(self._entry)
+
+    # docstr-coverage: inherited
+    def on_string(self, key: str, value: str, line: int):
+        self.strings.append((key, value))
+
+
+def parse_to_dicts(
+    bibtex_str: str, resolve_strings: bool = True, remove_enclosing: bool = True
+) -> List[Dict[str, str]]:
+    """Parse a BibTeX string directly into plain dicts, one per entry.
+
+    This is a fast path for consumers which only need the entries' values
+    (e.g. to load them into a database): no blocks, fields or library are created,
+    and no middleware is applied. The dicts equal the ``dict(entry.items())``
+    of the entries of ``parse_string(bibtex_str)``, i.e., they map ``ENTRYTYPE``,
+    ``ID`` and the field keys to the values; the options correspond to the
+    middleware of the default parse stack.
+
+    As with ``parse_string``, entries with a duplicate key or duplicate field keys
+    are not included, and blocks with syntax errors are skipped.
+
+    :param bibtex_str: BibTeX string to parse
+    :param resolve_strings: Replace references to @string definitions with their values
+        (as the `ResolveStringReferencesMiddleware`).
+    :param remove_enclosing: Remove the enclosing braces or quotes of the values
+        (as the `RemoveEnclosingMiddleware`).
+    :return: The dicts of the entries, in order.
+    """
+    collector = _EntryCollector()
+    _scan_events(bibtex_str, collector)
+    entries, strings = collector.entries, collector.strings
+
+    string_values: Dict[str, str] = dict()
+    if resolve_strings:
+        for key, value in reversed(strings):
+            # The first definition of a string wins
+            string_values[key] = value
+    strip_enclosing = RemoveEnclosingMiddleware._strip_enclosing
+
+    dicts = []
+    seen_keys = set()
+    for entry_type, key, fields in entries:
+        if key in seen_keys:
+            continue
+        field_keys = {field_key for field_key, _ in fields}
+        if len(field_keys) < len(fields):
+            continue
+        seen_keys.add(key)
+
+        entry = {"ENTRYTYPE": entry_type, "ID": key}
+        for field_key, value in fields:
+            if value in string_values and not _value_is_nonstring_or_enclosed(value):
+                value = string_values[value]
+            # Values are stripped already: only enclosed values change
+            if remove_enclosing and value and value[0] in '{"':
+                value = strip_enclosing(value)[0]
+            entry[field_key] = value
+        dicts.append(entry)
+    return dicts
 
 
 def write_file(
@@ -193,6 +304,8 @@ def write_file(
     prepend_middleware: Optional[Iterable[Middleware]] = None,
     bibtex_format: Optional[BibtexFormat] = None,
     encoding: str = "UTF-8",
+    streaming: bool = False,
+    raw_passthrough: bool = False,
     **kwargs,
 ) -> None:
     """Write a BibTeX database to a file.
@@ -205,6 +318,11 @@ def write_file(
                         Only applicable if `unparse_stack` is None.
     :param bibtex_format: Customized BibTeX format to use (optional).
     :param encoding: Encoding of the .bib file. Default encoding is ``"UTF-8"``.
+    :param streaming: If true, serialize and write the library block by block,
+                        such that memory use is bounded by the largest block
+                        (see :py:meth:`bibtexparser.Writer.write_iter`).
+    :param raw_passthrough: If true, blocks which were not modified since they were parsed
+                        (with ``track_modifications``) are written as they were read.
 
     .. deprecated:: (next version)
         Parameters 'parse_stack' and 'append_middleware' are deprecated, will be deleted soon.
@@ -214,17 +332,13 @@ def write_file(
         unparse_stack, prepend_middleware, kwargs, "write_file"
     )
 
-    bibtex_str = write_string(
-        library=library,
+    writer = Writer(
         unparse_stack=unparse_stack,
         prepend_middleware=prepend_middleware,
         bibtex_format=bibtex_format,
+        raw_passthrough=raw_passthrough,
     )
-    if isinstance(file, str):
-        with open(file, "w", encoding=encoding) as f:
-            f.write(bibtex_str)
-    else:
-        file.write(bibtex_str)
+    writer.write_file(file, library, encoding=encoding, streaming=streaming)
 
 
 def write_string(
@@ -232,6 +346,7 @@ def write_string(
     unparse_stack: Optional[Iterable[Middleware]] = None,
     prepend_middleware: Optional[Iterable[Middleware]] = None,
     bibtex_format: Optional["BibtexFormat"] = None,
+    raw_passthrough: bool = False,
     **kwargs,
 ) -> str:
     """Serialize a BibTeX database to a string.
@@ -242,6 +357,8 @@ def write_string(
     :param prepend_middleware: List of middleware to prepend to the default stack.
                         Only applicable if `unparse_stack` is None.
     :param bibtex_format: Customized BibTeX format to use (optional).
+    :param raw_passthrough: If true, blocks which were not modified since they were parsed
+                        (with ``track_modifications``) are written as they were read.
 
     .. deprecated:: (next version)
         Parameters 'parse_stack' and 'append_middleware' are deprecated.
@@ -251,8 +368,324 @@ def write_string(
         unparse_stack, prepend_middleware, kwargs, "write_string"
     )
 
-    middleware: Middleware
-    for middleware in _build_unparse_stack(unparse_stack, prepend_middleware):
-        library = middleware.transform(library=library)
+    writer = Writer(
+        unparse_stack=unparse_stack,
+        prepend_middleware=prepend_middleware,
+        bibtex_format=bibtex_format,
+        raw_passthrough=raw_passthrough,
+    )
+    return writer.write_string(library)
+
+
+class Parser:
+    """A reusable parser, configured once and applied to many inputs.
+
+    The parse stack is built (and checked) once, when the parser is created,
+    and the middleware instances it contains are reused for every call.
+    This makes parsing many small inputs considerably cheaper than
+    calling ``bibtexparser.parse_string`` for each of them.
+
+    A parser keeps no per-call state, hence it may be shared between threads,
+    as long as the middleware in its parse stack does not keep per-call state either
+    (which is the case for all middleware shipped with bibtexparser).
 
-    return write(library, bibtex_format=bibtex_format)
+    :param parse_stack:
+        List of middleware to apply to the database after splitting.
+        If ``None`` (default), a default stack will be used providing simple standard functionality.
+    :param append_middleware:
+        List of middleware to append to the default stack
+        (ignored if a not-``None`` parse_stack is passed).
+    :param track_modifications:
+        If true, the parsed blocks are marked as unmodified after the parse stack was applied
+        (see :py:meth:`bibtexparser.model.Block.mark_unmodified`), such that a
+        :py:class:`Writer` with `raw_passthrough` writes the blocks which were not modified
+        since as they were read.
+    """
+
+    def __init__(
+        self,
+        parse_stack: Optional[Iterable[Middleware]] = None,
+        append_middleware: Optional[Iterable[Middleware]] = None,
+        track_modifications: bool = False,
+    ):
+        self._parse_stack: Tuple[Middleware, ...] = tuple(
+            _build_parse_stack(parse_stack, append_middleware)
+        )
+        self._track_modifications = track_modifications
+
+    @property
+    def parse_stack(self) -> Tuple[Middleware, ...]:
+        """The middleware applied after splitting, in order of application."""
+        return self._parse_stack
+
+    def parse_string(self, bibtex_str: str, library: Optional[Library] = None) -> Library:
+        """Parse a BibTeX string.
+
+        :param bibtex_str: BibTeX string to parse
+        :param library:
+            Library to add entries to. If ``None`` (default), a new library will be created.
+        :return: Library: Parsed BibTeX database
+        """
+        splitter = Splitter(bibstr=bibtex_str)
+        library = splitter.split(library=library)
+        return self._transform(library)
+
+    def _transform(self, library: Library) -> Library:
+        """Apply the parse stack to a library of freshly split blocks."""
+        middleware: Middleware
+        for middleware in self._parse_stack:
+            library = middleware.transform(library=library)
+        self._mark_unmodified(library)
+        return library
+
+    def _mark_unmodified(self, library: Library):
+        """Mark the blocks of a transformed library as unmodified, if modifications are tracked."""
+        if self._track_modifications:
+            for block in library.blocks:
+                # Blocks of a passed library may have been modified since they were parsed.
+                if not block._is_marked():
+                    block.mark_unmodified()
+
+    def parse_file(
+        self,
+        path: str,
+        encoding: str = "UTF-8",
+        cache_dir: Optional[Union[str, os.PathLike]] = None,
+        cache_max_size: int = DEFAULT_CACHE_MAX_SIZE,
+    ) -> Library:
+        """Parse a BibTeX file.
+
+        :param path: Path to BibTeX file
+        :param encoding: Encoding of the .bib file. Default encoding is ``"UTF-8"``.
+        :param cache_dir: If set, parsed libraries are cached in this directory
+            (see :py:func:`bibtexparser.parse_file`), which must be trusted.
+        :param cache_max_size: Maximum size of the cache directory in bytes.
+        :return: Library: Parsed BibTeX library
+        :raises LookupError: If the specified encoding is not recognized.
+        """
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            raise LookupError(f"Unknown encoding: {encoding!r}")
+
+        if cache_dir is None:
+            with open(path, encoding=encoding) as f:
+                bibtex_str = f.read()
+            return self.parse_string(bibtex_str)
+
+        # The file is read once, such that the cached library is parsed from the hashed content
+        with open(path, "rb") as f:
+            content = f.read()
+        key = cache.cache_key(content, self._parse_stack, encoding, self._track_modifications)
+        library = cache.load(cache_dir, key) if key is not None else None
+        if library is None:
+            # Decoded as when reading the file in text mode (e.g., with universal newlines)
+            bibtex_str = io.TextIOWrapper(io.BytesIO(content), encoding=encoding).read()
+            library = self.parse_string(bibtex_str)
+            if key is not None:
+                cache.store(cache_dir, key, library, max_size=cache_max_size)
+        return library
+
+
+class Writer:
+    """A reusable writer, configured once and applied to many libraries.
+
+    The unparse stack is built (and checked) once, when the writer is created,
+    and the middleware instances it contains are reused for every call.
+
+    Like the ``Parser``, a writer keeps no per-call state and may be shared between threads.
+
+    :param unparse_stack: List of middleware to apply to the database before writing.
+                        If None, a default stack will be used.
+    :param prepend_middleware: List of middleware to prepend to the default stack.
+                        Only applicable if `unparse_stack` is None.
+    :param bibtex_format: Customized BibTeX format to use (optional).
+    :param raw_passthrough: If true, blocks which were not modified since they were parsed
+                        (by a parser with `track_modifications`) are written as they were
+                        read, skipping the unparse stack and the formatting.
+                        All other blocks are written as usual.
+    :param workers: Number of processes applying the block middleware and formatting the
+                        blocks (see :py:meth:`write_iter`). Default: 1, i.e., no parallelism.
+
+    If the last middleware of the unparse stack is an `AddEnclosingMiddleware` which does not
+    modify blocks in-place (as in the default unparse stack), the enclosing is added while
+    the blocks are rendered, instead of transforming a copy of every block first.
+    The output is the same.
+    """
+
+    def __init__(
+        self,
+        unparse_stack: Optional[Iterable[Middleware]] = None,
+        prepend_middleware: Optional[Iterable[Middleware]] = None,
+        bibtex_format: Optional[BibtexFormat] = None,
+        raw_passthrough: bool = False,
+        workers: int = 1,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be positive.")
+        self._unparse_stack: Tuple[Middleware, ...] = tuple(
+            _build_unparse_stack(unparse_stack, prepend_middleware)
+        )
+        self._bibtex_format = bibtex_format
+        self._raw_passthrough = raw_passthrough
+        self._workers = workers
+
+        # The middleware to apply to the blocks before rendering, and the enclosing to
+        #   add while rendering (see class docstring).
+        self._transform_stack = self._unparse_stack
+        self._render_enclosing: Optional[AddEnclosingMiddleware] = None
+        if self._unparse_stack:
+            last = self._unparse_stack[-1]
+            if type(last) is AddEnclosingMiddleware and not last.allow_inplace_modification:
+                self._transform_stack = self._unparse_stack[:-1]
+                self._render_enclosing = last
+
+    @property
+    def unparse_stack(self) -> Tuple[Middleware, ...]:
+        """The middleware applied before writing, in order of application."""
+        return self._unparse_stack
+
+    @property
+    def bibtex_format(self) -> Optional[BibtexFormat]:
+        """The format used when writing, or ``None`` for the default format."""
+        return self._bibtex_format
+
+    @property
+    def raw_passthrough(self) -> bool:
+        """Whether blocks which were not modified since they were parsed are written as read."""
+        return self._raw_passthrough
+
+    @property
+    def workers(self) -> int:
+        """The number of processes applying the block middleware and formatting the blocks."""
+        return self._workers
+
+    def write_string(self, library: Library) -> str:
+        """Serialize a BibTeX database to a string.
+
+        :param library: BibTeX database to serialize.
+        """
+        if self._raw_passthrough or self._workers > 1:
+            return "".join(self.write_iter(library))
+
+        middleware: Middleware
+        for middleware in self._transform_stack:
+            library = middleware.transform(library=library)
+
+        return write(library, bibtex_format=self._bibtex_format, enclosing=self._render_enclosing)
+
+    def _split_unparse_stack(self) -> Tuple[Tuple[Middleware, ...], Tuple[BlockMiddleware, ...]]:
+        """Split the unparse stack into a prefix applied to the whole library,
+        and a suffix of block middleware which can be applied block by block."""
+        split = len(self._transform_stack)
+        while split > 0:
+            middleware = self._transform_stack[split - 1]
+            # Block middleware overriding `transform` may rely on seeing the whole library.
+            if not isinstance(middleware, BlockMiddleware) or (
+                type(middleware).transform is not BlockMiddleware.transform
+            ):
+                break
+            split -= 1
+        return self._transform_stack[:split], self._transform_stack[split:]
+
+    def write_iter(self, library: Library) -> Iterator[str]:
+        """Serialize a BibTeX database incrementally, one block at a time.
+
+        Concatenating the returned strings gives the output of :py:meth:`write_string`.
+        Block middleware at the end of the unparse stack (as in the default unparse stack)
+        is applied block by block, right before the block is serialized; hence, no
+        transformed copy of the whole library is created, and the memory needed on top of
+        the library is bounded by the largest block. The strings can be written to a file
+        (see :py:meth:`write_file`) or sent in a streaming response.
+
+        Note that such block middleware gets passed the library as it was before
+        the block middleware was applied. Library middleware, and block middleware
+        preceding library middleware in the unparse stack, are applied to the whole library
+        first, as in :py:meth:`write_string`. If the format's `value_column` is "auto",
+        all middleware is applied to the whole library, as the alignment depends
+        on all entries (except with `raw_passthrough`, where the alignment is computed
+        before the block middleware is applied).
+
+        With more than one `workers`, the block middleware is applied, and the blocks are
+        formatted, in that many forked processes, each handling contiguous chunks of blocks;
+        the returned strings are then the chunks (see :py:func:`bibtexparser.writer.write_iter`).
+        The middleware must hence not rely on state shared between blocks, and changes made
+        by middleware allowed to modify blocks in-place are not visible in the passed library.
+
+        :param library: BibTeX database to serialize.
+        :returns: The string representations of the blocks, each preceded by the block
+            separator (except for the first one)."""
+        library_stack, block_stack = self._split_unparse_stack()
+        if (
+            not self._raw_passthrough
+            and self._bibtex_format is not None
+            and self._bibtex_format.value_column == "auto"
+        ):
+            library_stack, block_stack = self._transform_stack, ()
+
+        middleware: Middleware
+        for middleware in library_stack:
+            library = middleware.transform(library=library)
+
+        def transform(block: Block) -> List[Block]:
+            return _transform_block(block, library, block_stack, self._raw_passthrough)
+
+        return _write_iter(
+            library,
+            self._bibtex_format,
+            self._raw_passthrough,
+            self._workers,
+            transform=transform if block_stack else None,
+            enclosing=self._render_enclosing,
+        )
+
+    def write_file(
+        self,
+        file: Union[str, TextIO],
+        library: Library,
+        encoding: str = "UTF-8",
+        streaming: bool = False,
+    ) -> None:
+        """Write a BibTeX database to a file.
+
+        :param file: File to write to. Can be a file name or a file object.
+        :param library: BibTeX database to serialize.
+        :param encoding: Encoding of the .bib file. Default encoding is ``"UTF-8"``.
+            Ignored if a file object is passed.
+        :param streaming: If true, the library is serialized and written block by block
+            (see :py:meth:`write_iter`) instead of being serialized into a single string first.
+            If writing fails half-way, the file is then left partially written.
+        """
+        if streaming:
+            pieces = self.write_iter(library)
+        else:
+            pieces = (self.write_string(library),)
+
+        if isinstance(file, str):
+            with open(file, "w", encoding=encoding) as f:
+                for piece in pieces:
+                    f.write(piece)
+        else:
+            for piece in pieces:
+                file.write(piece)
+
+
+def _transform_block(
+    block: Block,
+    library: Library,
+    block_stack: Tuple[BlockMiddleware, ...],
+    skip_unmodified: bool = False,
+) -> List[Block]:
+    """Transform a block by the block middleware.
+
+    If `skip_unmodified`, blocks which were not modified since parsing are not transformed."""
+    if skip_unmodified and block.is_unmodified():
+        return [block]
+    blocks = [block]
+    for middleware in block_stack:
+        blocks = [
+            transformed
+            for b in blocks
+            for transformed in middleware._transform_block_to_list(b, library)
+        ]
+    return blocks
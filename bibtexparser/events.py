@@ -0,0 +1,104 @@
+"""Event-driven parsing: reporting the parts of a bibtex file to a handler as they are read."""
+
+import os
+from typing import TextIO
+from typing import Union
+
+from .exceptions import BlockAbortedException
+from .splitter import ValueSpan
+from .splitter import _scan_events
+from .streaming import DEFAULT_CHUNK_SIZE
+from .streaming import _iter_chunks
+
+
+class ParseHandler:
+    """Receives the events of :py:func:`parse_events`.
+
+    All methods do nothing by default; subclasses override the ones they need.
+    Line numbers are zero-based, as the `start_line` of blocks.
+    """
+
+    def on_entry_start(self, entry_type: str, key: str, line: int):
+        """Called when an entry starts, i.e., once its key was read.
+
+        :param entry_type: The type of the entry, in lower case (e.g. ``"article"``).
+        :param key: The key of the entry.
+        :param line: The line of the `@` starting the entry."""
+
+    def on_field(self, key: str, value: ValueSpan, line: int):
+        """Called for every field of the current entry.
+
+        :param key: The key of the field.
+        :param value: The value; ``str(value)`` gives the value with enclosing
+            (e.g. ``"{Title}"``). Not converting values which are not needed saves time.
+        :param line: The line of the `=` between key and value."""
+
+    def on_entry_end(self):
+        """Called when the current entry ends (and is valid)."""
+
+    def on_string(self, key: str, value: str, line: int):
+        """Called for every @string definition.
+
+        :param key: The key of the string.
+        :param value: The value, with enclosing (e.g. ``"{Value}"``).
+        :param line: The line of the `@` starting the definition."""
+
+    def on_preamble(self, value: str, line: int):
+        """Called for every @preamble.
+
+        :param value: The content of the preamble.
+        :param line: The line of the `@` starting the preamble."""
+
+    def on_comment(self, comment: str, line: int, explicit: bool):
+        """Called for every comment.
+
+        :param comment: The comment; for explicit comments without the
+            enclosing ``@comment{...}``.
+        :param line: The first line of the comment.
+        :param explicit: Whether this is an explicit (``@comment{...}``) comment, or text
+            between blocks (an implicit comment)."""
+
+    def on_error(self, error: BlockAbortedException, line: int, raw: str):
+        """Called if a block could not be parsed.
+
+        If the failed block is an entry, this may follow :py:meth:`on_entry_start`
+        (and :py:meth:`on_field`), instead of :py:meth:`on_entry_end`.
+
+        :param error: The reason the block was aborted.
+        :param line: The line of the `@` starting the block.
+        :param raw: The text of the failed block."""
+
+
+def parse_events(
+    source: Union[str, os.PathLike, TextIO],
+    handler: ParseHandler,
+    encoding: str = "UTF-8",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    """Parse a bibtex file in a single pass, reporting its parts to a handler.
+
+    No blocks, fields or library are created: as the file is split, the methods of the
+    handler are called for every entry (start, fields and end), @string, @preamble,
+    comment and failed block, in the order of the file. This is the cheapest way to
+    look at every entry once, e.g. to validate or index a file.
+
+    The reported values are the ones of :py:func:`bibtexparser.streaming.iter_blocks`
+    (and thus, except for the caveats listed there, of the blocks of
+    :py:func:`bibtexparser.parse_file` with an empty parse stack); in particular,
+    values are reported with enclosing, and duplicate keys are not detected.
+    The file is read in chunks, hence it does not need to fit into memory.
+
+    :param source: Path of the file, or a file opened in text mode.
+    :param handler: The handler receiving the events.
+    :param encoding: Encoding of the file (ignored if a file object is passed).
+    :param chunk_size: Number of characters read at once.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive.")
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding=encoding) as file:
+            parse_events(file, handler, chunk_size=chunk_size)
+        return
+
+    for chunk, start_line in _iter_chunks(source, chunk_size):
+        _scan_events(chunk, handler, start_line=start_line)
@@ -30,6 +30,10 @@ class BlockAbortedException(ParsingException):
         self.abort_reason = abort_reason
         self.end_index = end_index
 
+    def __reduce__(self):
+        # Pickle by constructor arguments (e.g. to transfer blocks between processes).
+        return type(self), (self.abort_reason, self.end_index)
+
 
 class ParserStateException(ParsingException):
     """Parser is in a self-inflicted invalid state."""
@@ -37,6 +41,9 @@ class ParserStateException(ParsingException):
     def __init__(self, message: str):
         self.message = message
 
+    def __reduce__(self):
+        return type(self), (self.message,)
+
 
 class RegexMismatchException(ParserStateException):
     """Raised when regex matches are inconsistent, implying a bug in the parser.
@@ -56,10 +63,17 @@ class RegexMismatchException(ParserStateException):
             "Please report this issue at our issue tracker."
         )
 
+    def __reduce__(self):
+        return type(self), (self.first_match, self.expected_match, self.second_match)
+
 
 class PartialMiddlewareException(ParsingException):
     """Exception raised when a middleware could not be fully applied."""
 
     def __init__(self, reasons: List[str]):
+        self.reasons = reasons
         reasons_string = "\n\n=====\n\n".join(reasons)
         super().__init__(f"Middleware could not be fully applied: {reasons_string}")
+
+    def __reduce__(self):
+        return type(self), (self.reasons,)
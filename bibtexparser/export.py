@@ -0,0 +1,448 @@
+"""Export of entries to formats other than BibTeX: JSON Lines, CSV and CSL-JSON.
+
+All exporters write the entries incrementally, one at a time, and accept a
+:py:class:`bibtexparser.Library` as well as any iterable of blocks
+(e.g. from :py:func:`bibtexparser.streaming.iter_blocks`); blocks which are not entries
+are skipped. Use :py:func:`convert` to parse and export a file with bounded memory.
+
+Values are exported as they are, i.e., as the parse stack left them
+(e.g. without enclosing, but still LaTeX-encoded with the default parse stack).
+Lists of values (as produced by the `SeparateCoAuthors` middleware)
+and name parts (as produced by the `SplitNameParts` middleware) are supported.
+"""
+
+import collections
+import contextlib
+import copy
+import csv
+import dataclasses
+import json
+import os
+import re
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Literal
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import TextIO
+from typing import Union
+
+from .entrypoint import Parser
+from .library import Library
+from .middlewares.names import NameParts
+from .middlewares.names import _parse_single_name_into_parts_cached
+from .middlewares.names import _split_multiple_persons_names_cached
+from .model import Block
+from .model import Entry
+from .model import String
+from .streaming import iter_blocks
+
+# The columns written by `write_csv` if not specified otherwise.
+DEFAULT_CSV_FIELDS = (
+    "ID",
+    "ENTRYTYPE",
+    "author",
+    "editor",
+    "title",
+    "journal",
+    "booktitle",
+    "publisher",
+    "year",
+    "volume",
+    "number",
+    "pages",
+    "doi",
+    "url",
+)
+
+# Number of blocks parsed at once by `convert`.
+DEFAULT_BATCH_SIZE = 10_000
+
+# CSL types of the standard BibTeX entry types (and a few common biblatex ones).
+_CSL_TYPES = {
+    "article": "article-journal",
+    "book": "book",
+    "booklet": "pamphlet",
+    "conference": "paper-conference",
+    "inbook": "chapter",
+    "incollection": "chapter",
+    "inproceedings": "paper-conference",
+    "manual": "report",
+    "mastersthesis": "thesis",
+    "misc": "document",
+    "online": "webpage",
+    "phdthesis": "thesis",
+    "proceedings": "book",
+    "techreport": "report",
+    "thesis": "thesis",
+    "unpublished": "manuscript",
+}
+
+_CSL_GENRES = {"mastersthesis": "Master's thesis", "phdthesis": "PhD thesis"}
+
+# CSL variables of the BibTeX fields which are exported as plain text.
+_CSL_TEXT_FIELDS = {
+    "title": "title",
+    "journal": "container-title",
+    "booktitle": "container-title",
+    "series": "collection-title",
+    "publisher": "publisher",
+    "school": "publisher",
+    "institution": "publisher",
+    "organization": "publisher",
+    "address": "publisher-place",
+    "volume": "volume",
+    "number": "issue",
+    "chapter": "chapter-number",
+    "edition": "edition",
+    "pages": "page",
+    "doi": "DOI",
+    "url": "URL",
+    "isbn": "ISBN",
+    "issn": "ISSN",
+    "abstract": "abstract",
+    "note": "note",
+    "keywords": "keyword",
+}
+
+_CSL_NAME_FIELDS = {"author": "author", "editor": "editor", "translator": "translator"}
+
+_MONTHS = {
+    name: number
+    for number, names in enumerate(
+        [
+            ("jan", "january"),
+            ("feb", "february"),
+            ("mar", "march"),
+            ("apr", "april"),
+            ("may",),
+            ("jun", "june"),
+            ("jul", "july"),
+            ("aug", "august"),
+            ("sep", "september"),
+            ("oct", "october"),
+            ("nov", "november"),
+            ("dec", "december"),
+        ],
+        start=1,
+    )
+    for name in names
+}
+
+_PAGE_RANGE_DASHES = re.compile(r"\s*-+\s*")
+
+
+def _entries(blocks: Union[Library, Iterable[Block]]) -> Iterator[Entry]:
+    if isinstance(blocks, Library):
+        return iter(blocks.entries)
+    return (block for block in blocks if isinstance(block, Entry))
+
+
+@contextlib.contextmanager
+def _open_for_writing(
+    destination: Union[str, os.PathLike, TextIO], encoding: str
+) -> Iterator[TextIO]:
+    if isinstance(destination, (str, os.PathLike)):
+        # No newline translation: JSON Lines and CSV define their own line breaks.
+        with open(destination, "w", encoding=encoding, newline="") as file:
+            yield file
+    else:
+        yield destination
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, NameParts):
+        return dataclasses.asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, default=_json_default)
+
+
+def _text(value: Any) -> str:
+    """A plain text representation of a field value."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, NameParts):
+        return value.merge_last_name_first
+    if isinstance(value, (list, tuple)):
+        return " and ".join(_text(v) for v in value)
+    return str(value)
+
+
+def write_jsonl(
+    blocks: Union[Library, Iterable[Block]],
+    destination: Union[str, os.PathLike, TextIO],
+    encoding: str = "UTF-8",
+) -> int:
+    """Export entries as JSON Lines, i.e., one JSON object per line and entry.
+
+    The objects have the same keys as :py:meth:`bibtexparser.model.Entry.items`:
+    ``ENTRYTYPE``, ``ID`` and the field keys (if a key appears more than once
+    in an entry, the last field wins).
+
+    :param blocks: The library (or iterable of blocks) to export.
+    :param destination: Path of the file to write, or a file opened in text mode.
+    :param encoding: Encoding of the file (ignored if a file object is passed).
+    :returns: The number of entries written."""
+    encode = _JSON_ENCODER.encode
+    count = 0
+    with _open_for_writing(destination, encoding) as file:
+        for entry in _entries(blocks):
+            item = {"ENTRYTYPE": entry.entry_type, "ID": entry.key}
+            for field in entry.fields:
+                item[field.key] = field.value
+            file.write(encode(item) + "\n")
+            count += 1
+    return count
+
+
+def write_csv(
+    blocks: Union[Library, Iterable[Block]],
+    destination: Union[str, os.PathLike, TextIO],
+    fields: Sequence[str] = DEFAULT_CSV_FIELDS,
+    encoding: str = "UTF-8",
+    **csv_options: Any,
+) -> int:
+    """Export entries as CSV, with one row per entry and one column per field.
+
+    The first row is the header, containing the field keys. Fields missing in an entry
+    are written as empty cells, and fields which are not in `fields` are not exported.
+
+    :param blocks: The library (or iterable of blocks) to export.
+    :param destination: Path of the file to write, or a file opened in text mode
+        (which should be opened with ``newline=""``, see :py:mod:`csv`).
+    :param fields: The field keys of the columns, in order. The pseudo fields
+        ``ID`` and ``ENTRYTYPE`` are the entry key and type.
+    :param encoding: Encoding of the file (ignored if a file object is passed).
+    :param csv_options: Passed to :py:func:`csv.writer`, e.g. ``delimiter=";"``.
+    :returns: The number of entries written."""
+    fields = tuple(fields)
+    count = 0
+    with _open_for_writing(destination, encoding) as file:
+        writer = csv.writer(file, **csv_options)
+        writer.writerow(fields)
+        for entry in _entries(blocks):
+            values = {field.key: field.value for field in entry.fields}
+            values["ID"] = entry.key
+            values["ENTRYTYPE"] = entry.entry_type
+            writer.writerow([_text(values[key]) if key in values else "" for key in fields])
+            count += 1
+    return count
+
+
+def _csl_name(name: Union[str, NameParts]) -> Optional[Dict[str, str]]:
+    if isinstance(name, str):
+        first, von, last, jr = _parse_single_name_into_parts_cached(name, strict=False)
+    else:
+        first, von, last, jr = name.first, name.von, name.last, name.jr
+    if not last:
+        return None
+    csl_name = {"family": " ".join(last)}
+    if first:
+        csl_name["given"] = " ".join(first)
+    if von:
+        csl_name["non-dropping-particle"] = " ".join(von)
+    if jr:
+        csl_name["suffix"] = " ".join(jr)
+    return csl_name
+
+
+def _csl_names(value: Any) -> List[Dict[str, str]]:
+    if isinstance(value, str):
+        names = _split_multiple_persons_names_cached(value)
+    elif isinstance(value, NameParts):
+        names = [value]
+    elif isinstance(value, (list, tuple)):
+        names = value
+    else:
+        names = [str(value)]
+    return [csl_name for csl_name in map(_csl_name, names) if csl_name is not None]
+
+
+def _csl_date_part(value: Any) -> Union[int, str]:
+    text = _text(value).strip()
+    return int(text) if text.isdigit() else text
+
+
+def csl_item(entry: Entry) -> Dict[str, Any]:
+    """Convert an entry to a CSL-JSON item.
+
+    Standard BibTeX fields are mapped to the corresponding CSL variables;
+    other fields are not exported. Names are split into their parts,
+    and ``year`` and ``month`` are combined to the ``issued`` date.
+
+    :param entry: The entry to convert.
+    :returns: The CSL-JSON item, as dict."""
+    entry_type = entry.entry_type.lower()
+    item: Dict[str, Any] = {"id": entry.key, "type": _CSL_TYPES.get(entry_type, "document")}
+    if entry_type in _CSL_GENRES:
+        item["genre"] = _CSL_GENRES[entry_type]
+
+    year = month = None
+    for field in entry.fields:
+        key = field.key.lower()
+        if key in _CSL_TEXT_FIELDS:
+            variable = _CSL_TEXT_FIELDS[key]
+            text = _text(field.value)
+            if key == "pages":
+                text = _PAGE_RANGE_DASHES.sub("-", text)
+            # The first field wins, e.g. `journal` over `publisher` for `container-title`
+            item.setdefault(variable, text)
+        elif key in _CSL_NAME_FIELDS:
+            item[_CSL_NAME_FIELDS[key]] = _csl_names(field.value)
+        elif key == "year":
+            year = _csl_date_part(field.value)
+        elif key == "month":
+            month = _csl_date_part(field.value)
+
+    if isinstance(year, int):
+        date_parts = [year]
+        month = _MONTHS.get(month.lower(), month) if isinstance(month, str) else month
+        if isinstance(month, int) and 1 <= month <= 12:
+            date_parts.append(month)
+        item["issued"] = {"date-parts": [date_parts]}
+    elif year:
+        item["issued"] = {"literal": year}
+    return item
+
+
+def write_csl_json(
+    blocks: Union[Library, Iterable[Block]],
+    destination: Union[str, os.PathLike, TextIO],
+    encoding: str = "UTF-8",
+) -> int:
+    """Export entries as CSL-JSON, i.e., a JSON array of CSL items.
+
+    The array is written incrementally, one item per line. See :py:func:`csl_item`
+    for how entries are converted.
+
+    :param blocks: The library (or iterable of blocks) to export.
+    :param destination: Path of the file to write, or a file opened in text mode.
+    :param encoding: Encoding of the file (ignored if a file object is passed).
+    :returns: The number of entries written."""
+    encode = _JSON_ENCODER.encode
+    count = 0
+    with _open_for_writing(destination, encoding) as file:
+        file.write("[")
+        for entry in _entries(blocks):
+            file.write(("\n" if count == 0 else ",\n") + encode(csl_item(entry)))
+            count += 1
+        file.write("\n]\n" if count else "]\n")
+    return count
+
+
+_EXPORTERS: Dict[str, Callable[..., int]] = {
+    "jsonl": write_jsonl,
+    "csv": write_csv,
+    "csl-json": write_csl_json,
+}
+
+
+class _BatchLibrary(Library):
+    """A library of one batch of blocks, which also knows the @string blocks of
+    previous batches (the context), such that references to them can be resolved.
+
+    The context is shared by all batches: it is only read, never copied or transformed.
+    @string blocks redefining a string of the context are duplicates, as in a library
+    holding all blocks."""
+
+    def __init__(self, blocks: List[Block], context: Dict[str, String]):
+        self._context = context
+        super().__init__(blocks)
+
+    def _add_to_dicts(self, block):
+        if isinstance(block, String) and block.key in self._context:
+            return self._cast_to_duplicate(self._context[block.key], block)
+        return super()._add_to_dicts(block)
+
+    def __deepcopy__(self, memo):
+        memo[id(self._context)] = self._context
+        library = type(self).__new__(type(self))
+        memo[id(self)] = library
+        library.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return library
+
+    @property
+    def strings(self) -> List[String]:
+        """All @string blocks of the context and of the batch."""
+        return list(self.strings_dict.values())
+
+    @property
+    def strings_dict(self) -> Mapping[str, String]:
+        """The @string blocks of the context and of the batch, by key."""
+        return collections.ChainMap(self._strings_by_key, self._context)
+
+
+def _parse_in_batches(blocks: Iterable[Block], parser: Parser, batch_size: int) -> Iterator[Block]:
+    """Apply the parse stack of `parser` to consecutive batches of blocks.
+
+    The @string blocks of all previous batches are known to every batch (as unparsed
+    copies, made once), such that references to them can be resolved."""
+    context: Dict[str, String] = {}
+    batch: List[Block] = []
+    for block in blocks:
+        batch.append(block)
+        if len(batch) < batch_size:
+            continue
+        yield from _parse_batch(batch, context, parser)
+        batch = []
+    if batch:
+        yield from _parse_batch(batch, context, parser)
+
+
+def _parse_batch(batch: List[Block], context: Dict[str, String], parser: Parser) -> List[Block]:
+    new_strings = [copy.deepcopy(block) for block in batch if isinstance(block, String)]
+    library: Library = _BatchLibrary(batch, context)
+    for middleware in parser._parse_stack:
+        library = middleware.transform(library=library)
+        # Middleware returning a new library (e.g. block middleware) drops the context
+        if not isinstance(library, _BatchLibrary):
+            library = _BatchLibrary(library.blocks, context)
+    parser._mark_unmodified(library)
+    for string in new_strings:
+        context.setdefault(string.key, string)
+    return library.blocks
+
+
+def convert(
+    source: Union[str, os.PathLike, TextIO],
+    destination: Union[str, os.PathLike, TextIO],
+    to: Literal["jsonl", "csv", "csl-json"],
+    parser: Optional[Parser] = None,
+    encoding: str = "UTF-8",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    **options: Any,
+) -> int:
+    """Parse a bibtex file and export its entries, with bounded memory.
+
+    The file is split with :py:func:`bibtexparser.streaming.iter_blocks`, and the parse
+    stack is applied to batches of `batch_size` blocks, which are exported right away.
+    Hence, only one batch (plus the @string definitions read so far) is held in memory.
+    In contrast to parsing the whole file, @string definitions must appear before
+    the entries using them (as required by BibTeX anyway), and middleware which considers
+    the whole library (e.g. sorting) only sees one batch at a time.
+
+    :param source: Path of the bibtex file, or a file opened in text mode.
+    :param destination: Path of the file to write, or a file opened in text mode.
+    :param to: The export format: ``"jsonl"`` (see :py:func:`write_jsonl`),
+        ``"csv"`` (see :py:func:`write_csv`) or ``"csl-json"`` (see :py:func:`write_csl_json`).
+    :param parser: The parser whose parse stack is applied (default: ``Parser()``).
+    :param encoding: Encoding of the files passed as paths.
+    :param batch_size: Number of blocks parsed at once.
+    :param options: Passed to the exporter, e.g. the `fields` of :py:func:`write_csv`.
+    :returns: The number of entries written."""
+    if to not in _EXPORTERS:
+        raise ValueError(f"Unknown export format '{to}', expected one of {list(_EXPORTERS)}.")
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive.")
+    if parser is None:
+        parser = Parser()
+
+    blocks = _parse_in_batches(iter_blocks(source, encoding=encoding), parser, batch_size)
+    return _EXPORTERS[to](blocks, destination, encoding=encoding, **options)
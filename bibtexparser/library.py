@@ -1,3 +1,4 @@
+from typing import Any
 from typing import Dict
 from typing import List
 from typing import Union
@@ -156,6 +157,39 @@ class Library:
                 self._strings_by_key[block.key] = block
         return block
 
+    def _indexes_follow_blocks(self) -> bool:
+        """Whether the key indexes are the ones built by adding the blocks in order."""
+        entries = iter(self._entries_by_key.items())
+        strings = iter(self._strings_by_key.items())
+        for block in self._blocks:
+            if isinstance(block, Entry):
+                key, indexed = next(entries, (None, None))
+            elif isinstance(block, String):
+                key, indexed = next(strings, (None, None))
+            else:
+                continue
+            if indexed is not block or key != block.key:
+                return False
+        return next(entries, None) is None and next(strings, None) is None
+
+    def __reduce_ex__(self, protocol):
+        # The key indexes are not pickled, but rebuilt from the blocks when unpickling.
+        #   Libraries whose indexes are not in the order of the blocks (e.g. after `replace`)
+        #   are pickled as they are.
+        if not self._indexes_follow_blocks():
+            return super().__reduce_ex__(protocol)
+        state = {
+            name: value
+            for name, value in self.__dict__.items()
+            if name not in ("_entries_by_key", "_strings_by_key")
+        }
+        return _unpickle_library, (type(self), state)
+
+    def __copy__(self):
+        library = type(self).__new__(type(self))
+        library.__dict__.update(self.__dict__)
+        return library
+
     @property
     def blocks(self) -> List[Block]:
         """All blocks in the library, preserving order of insertion."""
@@ -199,3 +233,16 @@ class Library:
         return [
             block for block in self._blocks if isinstance(block, (ExplicitComment, ImplicitComment))
         ]
+
+
+def _unpickle_library(cls: type, state: Dict[str, Any]) -> Library:
+    library = cls.__new__(cls)
+    library.__dict__.update(state)
+    library._entries_by_key = {}
+    library._strings_by_key = {}
+    for block in library._blocks:
+        if isinstance(block, Entry):
+            library._entries_by_key[block.key] = block
+        elif isinstance(block, String):
+            library._strings_by_key[block.key] = block
+    return library
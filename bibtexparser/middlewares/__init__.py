@@ -1,6 +1,9 @@
 from bibtexparser.middlewares.enclosing import AddEnclosingMiddleware
 from bibtexparser.middlewares.enclosing import RemoveEnclosingMiddleware
 from bibtexparser.middlewares.fieldkeys import NormalizeFieldKeys
+from bibtexparser.middlewares.interpolate import ReplaceWithStringReferencesMiddleware
+from bibtexparser.middlewares.interpolate import ResolveCrossrefMiddleware
+from bibtexparser.middlewares.interpolate import ResolveStringExpressionsMiddleware
 from bibtexparser.middlewares.interpolate import ResolveStringReferencesMiddleware
 from bibtexparser.middlewares.latex_encoding import LatexDecodingMiddleware
 from bibtexparser.middlewares.latex_encoding import LatexEncodingMiddleware
@@ -1,3 +1,4 @@
+from typing import List
 from typing import Tuple
 from typing import Union
 
@@ -133,26 +134,45 @@ class AddEnclosingMiddleware(BlockMiddleware):
             f"enclosing must be either '{{' or '\"' or 'no-enclosing', " f"not '{enclosing}'"
         )
 
+    def enclosed_field_values(self, entry: Entry) -> List[str]:
+        """The values of the fields of an entry, with enclosing added.
+
+        The entry itself is not modified. This allows writers to add the enclosing
+        while rendering the entry, instead of transforming (and thus copying) it first.
+
+        :param entry: The entry.
+        :returns: The enclosed values, in the order of the entry's fields."""
+        metadata_enclosing = entry.parser_metadata.get(RemoveEnclosingMiddleware.metadata_key())
+        return [
+            self._enclose(
+                field.value,
+                metadata_enclosing.get(field.key) if metadata_enclosing is not None else None,
+                apply_int_rule=field.key in ENTRY_POTENTIALLY_INT_FIELDS,
+            )
+            for field in entry.fields
+        ]
+
+    def enclosed_string_value(self, string: String) -> str:
+        """The value of a string, with enclosing added (see :py:meth:`enclosed_field_values`).
+
+        :param string: The string.
+        :returns: The enclosed value."""
+        return self._enclose(
+            string.value,
+            string.parser_metadata.get(RemoveEnclosingMiddleware.metadata_key()),
+            apply_int_rule=STRINGS_CAN_BE_UNESCAPED_INTS,
+        )
+
     # docstr-coverage: inherited
     def transform_entry(self, entry: Entry, *args, **kwargs) -> Entry:
         field: Field
-        metadata_enclosing = entry.parser_metadata.pop(
-            RemoveEnclosingMiddleware.metadata_key(), None
-        )
-        for field in entry.fields:
-            apply_int_rule = field.key in ENTRY_POTENTIALLY_INT_FIELDS
-            prev_encoding = (
-                metadata_enclosing.get(field.key, None) if metadata_enclosing is not None else None
-            )
-            field.value = self._enclose(field.value, prev_encoding, apply_int_rule=apply_int_rule)
+        values = self.enclosed_field_values(entry)
+        entry.parser_metadata.pop(RemoveEnclosingMiddleware.metadata_key(), None)
+        for field, value in zip(entry.fields, values):
+            field.value = value
         return entry
 
     # docstr-coverage: inherited
     def transform_string(self, string: String, *args, **kwargs) -> String:
-        metadata_key = RemoveEnclosingMiddleware.metadata_key()
-        string.value = self._enclose(
-            string.value,
-            string.parser_metadata.get(metadata_key),
-            apply_int_rule=STRINGS_CAN_BE_UNESCAPED_INTS,
-        )
+        string.value = self.enclosed_string_value(string)
         return string
@@ -1,14 +1,24 @@
+import functools
+import logging
+import re
 import warnings
 from copy import deepcopy
 from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
 
 from bibtexparser.library import Library
 from bibtexparser.model import Entry
 from bibtexparser.model import Field
+from bibtexparser.model import String
 
 from .enclosing import REMOVED_ENCLOSING_KEY
 from .middleware import LibraryMiddleware
 
+logger = logging.getLogger(__name__)
+
 
 def _value_is_nonstring_or_enclosed(value: Any) -> bool:
     """Check if value is an int or enclosed in curly braces."""
@@ -21,6 +31,19 @@ def _value_is_nonstring_or_enclosed(value: Any) -> bool:
     return False
 
 
+def _warn_enclosing_removed(middleware_name: str):
+    """Warn that the enclosing of values was removed before resolving string references."""
+    warnings.warn(
+        (
+            "The RemoveEnclosingMiddleware must not run before "
+            f"the {middleware_name}."
+            "We continue, but string interpolation is likely to fail,"
+            "or to be too aggressive (i.e., replace too many strings)."
+        ),
+        UserWarning,
+    )
+
+
 class ResolveStringReferencesMiddleware(LibraryMiddleware):
     """Replace strings references with their values."""
 
@@ -44,15 +67,7 @@ class ResolveStringReferencesMiddleware(LibraryMiddleware):
             resolved_fields = list()
             if not raised_enclosing_warning and REMOVED_ENCLOSING_KEY in entry.parser_metadata:
                 raised_enclosing_warning = True
-                warnings.warn(
-                    (
-                        "The RemoveEnclosingMiddleware must not run before "
-                        "the ResolveStringReferencesMiddleware."
-                        "We continue, but string interpolation is likely to fail,"
-                        "or to be too aggressive (i.e., replace too many strings)."
-                    ),
-                    UserWarning,
-                )
+                _warn_enclosing_removed(type(self).__name__)
 
             field: Field
             for field in entry.fields:
@@ -69,6 +84,561 @@ class ResolveStringReferencesMiddleware(LibraryMiddleware):
         return library
 
 
-# TODO Middleware to replace field values with string references, if found
+# A bare operand of a value expression: a string reference or a number.
+_BARE_OPERAND = re.compile(r'[^\s#"{}]+')
+# Characters relevant when scanning a braced or quoted operand.
+_BRACES = re.compile(r"[{}]")
+_BRACES_AND_QUOTE = re.compile(r'[{}"]')
+_WHITESPACE = re.compile(r"\s*")
+
+# An operand of a value expression: its kind, and its content (without enclosing).
+#   The kinds are `{` and `"` for enclosed literals, `int` for numbers and `ref` for references.
+_Operand = Tuple[str, str]
+
+# A resolved value: its content, and the enclosing to use when re-assembling it
+#   (`{`, `"`, or None for numbers, which need no enclosing).
+_Resolved = Tuple[str, Optional[str]]
+
+
+def _scan_enclosed(value: str, pos: int) -> Optional[int]:
+    """Find the end of the braced or quoted operand starting at `pos`.
+
+    :returns: The index of the closing brace or quote, or None if there is none."""
+    pattern = _BRACES if value[pos] == "{" else _BRACES_AND_QUOTE
+    level = 1 if value[pos] == "{" else 0
+    for match in pattern.finditer(value, pos + 1):
+        char = match.group()
+        if char == "{":
+            level += 1
+        elif char == "}":
+            level -= 1
+            if level == 0 and value[pos] == "{":
+                return match.start()
+            if level < 0:
+                return None
+        elif level == 0:
+            return match.start()
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_expression(value: str) -> Optional[Tuple[_Operand, ...]]:
+    """Parse a raw value into the operands of its `#` concatenation.
+
+    Values are parsed once and cached, as the same expressions (e.g. `jan`,
+    or `proc_name # " 2023"`) typically appear in many entries.
+
+    :returns: The operands, or None if the value is not a valid expression."""
+    operands = []
+    pos = _WHITESPACE.match(value).end()
+    while pos < len(value):
+        if value[pos] in '{"':
+            end = _scan_enclosed(value, pos)
+            if end is None:
+                return None
+            operands.append((value[pos], value[pos + 1 : end]))
+            pos = end + 1
+        else:
+            match = _BARE_OPERAND.match(value, pos)
+            if match is None:
+                return None
+            text = match.group()
+            operands.append(("int" if text.isdigit() else "ref", text))
+            pos = match.end()
+
+        pos = _WHITESPACE.match(value, pos).end()
+        if pos == len(value):
+            return tuple(operands)
+        if value[pos] != "#":
+            return None
+        pos = _WHITESPACE.match(value, pos + 1).end()
+    # Empty value, or trailing `#`
+    return None
+
+
+class ResolveStringExpressionsMiddleware(LibraryMiddleware):
+    """Resolve string references and `#` concatenations in field values.
+
+    In contrast to the :py:class:`ResolveStringReferencesMiddleware`, which only
+    replaces values consisting of a single string reference, this middleware also
+    resolves concatenations such as ``jan # "~1st"`` and @string definitions
+    which themselves reference other @strings.
+
+    Every distinct value expression is parsed only once, and every @string is resolved
+    only once (in dependency order), such that the entries are processed in a single pass.
+    Values with references to undefined or cyclically defined @strings
+    are left unchanged; cycles are logged as warnings.
+
+    Resolved values consisting of more than one operand are enclosed in curly braces,
+    i.e., ``jan # "~1st"`` becomes ``{January~1st}`` if ``jan`` is defined as ``"January"``.
+    The @string blocks themselves are not modified.
+
+    :param allow_inplace_modification: See corresponding property.
+    :param predefined_strings: Values of references which are not defined as @string
+        in the library, e.g. the month macros of the standard BibTeX styles.
+        @string definitions in the library take precedence.
+    """
+
+    # docstr-coverage: inherited
+    def __init__(
+        self,
+        allow_inplace_modification: bool = True,
+        predefined_strings: Optional[Dict[str, str]] = None,
+    ):
+        super().__init__(allow_inplace_modification)
+        self._predefined_strings = dict(predefined_strings or {})
+
+    # docstr-coverage: inherited
+    @classmethod
+    def metadata_key(cls) -> str:
+        return "ResolveStringExpressions"
+
+    @staticmethod
+    def _concatenate(
+        operands: Tuple[_Operand, ...], resolved_strings: Dict[str, Optional[_Resolved]]
+    ) -> Optional[_Resolved]:
+        """Concatenate operands, whose references must be resolved already.
+
+        :returns: The resolved value, or None if a reference could not be resolved."""
+        parts = []
+        for kind, text in operands:
+            if kind == "ref":
+                resolved = resolved_strings.get(text)
+                if resolved is None:
+                    return None
+                parts.append(resolved[0])
+            else:
+                parts.append(text)
+
+        if len(operands) > 1:
+            return "".join(parts), "{"
+        kind, text = operands[0]
+        if kind == "ref":
+            return resolved_strings[text]
+        return parts[0], None if kind == "int" else kind
+
+    def _resolve_string(
+        self, key: str, library: Library, resolved_strings: Dict[str, Optional[_Resolved]]
+    ):
+        """Resolve the @string `key` and all @strings it depends on into `resolved_strings`.
+
+        Dependencies are resolved depth-first (without recursion, as chains of
+        @string definitions may be long), such that every @string is resolved once."""
+        strings = library.strings_dict
+        stack = [key]
+        on_stack = {key}
+        while stack:
+            current = stack[-1]
+            operands = _parse_expression(strings[current].value)
+            dependency = None
+            for kind, text in operands or ():
+                if kind != "ref" or text in resolved_strings or text not in strings:
+                    continue
+                if text in on_stack:
+                    cycle = stack[stack.index(text) :] + [text]
+                    logger.warning(
+                        "Cyclic @string definitions cannot be resolved: %s", " -> ".join(cycle)
+                    )
+                    resolved_strings[text] = None
+                    continue
+                dependency = text
+                break
+
+            if dependency is not None:
+                stack.append(dependency)
+                on_stack.add(dependency)
+                continue
+
+            resolved_strings[current] = (
+                self._concatenate(operands, resolved_strings) if operands else None
+            )
+            stack.pop()
+            on_stack.discard(current)
+
+    # docstr-coverage: inherited
+    def transform(self, library: Library) -> Library:
+        if not self.allow_inplace_modification:
+            library = deepcopy(library)
+
+        strings = library.strings_dict
+        resolved_strings: Dict[str, Optional[_Resolved]] = {
+            key: (value, "{")
+            for key, value in self._predefined_strings.items()
+            if key not in strings
+        }
+        # Resolved field values, by raw value
+        resolved_values: Dict[str, Optional[str]] = dict()
+
+        entry: Entry
+        raised_enclosing_warning = False
+        for entry in library.entries:
+            if not raised_enclosing_warning and REMOVED_ENCLOSING_KEY in entry.parser_metadata:
+                raised_enclosing_warning = True
+                _warn_enclosing_removed(type(self).__name__)
+
+            resolved_fields = list()
+            field: Field
+            for field in entry.fields:
+                value = field.value
+                if not isinstance(value, str):
+                    continue
+                try:
+                    resolved = resolved_values[value]
+                except KeyError:
+                    resolved = self._resolve_value(value, library, resolved_strings)
+                    resolved_values[value] = resolved
+                if resolved is not None:
+                    field.value = resolved
+                    resolved_fields.append(field.key)
+
+            if resolved_fields:
+                entry.parser_metadata[self.metadata_key()] = resolved_fields
+
+        return library
+
+    def _resolve_value(
+        self, value: str, library: Library, resolved_strings: Dict[str, Optional[_Resolved]]
+    ) -> Optional[str]:
+        """Resolve a raw field value.
+
+        :returns: The resolved value (enclosed if needed),
+            or None if it contains no references or cannot be resolved."""
+        operands = _parse_expression(value)
+        if operands is None or (len(operands) == 1 and operands[0][0] != "ref"):
+            return None
+
+        for kind, text in operands:
+            if kind == "ref" and text not in resolved_strings and text in library.strings_dict:
+                self._resolve_string(text, library, resolved_strings)
+
+        resolved = self._concatenate(operands, resolved_strings)
+        if resolved is None:
+            return None
+        text, enclosing = resolved
+        if enclosing is None:
+            return text
+        return f"{enclosing}{text}{'}' if enclosing == '{' else enclosing}"
+
+
+# Fields whose values typically repeat across entries,
+#   and are thus candidates for automatically generated @string definitions.
+DEFAULT_AUTO_STRING_FIELDS = (
+    "journal",
+    "booktitle",
+    "publisher",
+    "series",
+    "institution",
+    "organization",
+    "school",
+    "address",
+)
+
+# Macros predefined by the standard BibTeX styles, which must not be shadowed.
+_PREDEFINED_MACROS = frozenset(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+)
+
+# Words not contributing to the acronym of automatically generated @string keys.
+_ACRONYM_STOPWORDS = frozenset(
+    ("a", "an", "and", "at", "de", "for", "in", "of", "on", "the", "to", "und", "with")
+)
+_LATEX_MARKUP = re.compile(r"\\[A-Za-z]+|\\.|[{}]")
+_WORD = re.compile(r"[A-Za-z]+")
+
+
+def _enclosed_content(value: Any) -> Optional[str]:
+    """The content of a value enclosed in curly braces or quotes, None for other values."""
+    if not isinstance(value, str) or len(value) < 2:
+        return None
+    if (value[0] == "{" and value[-1] == "}") or (value[0] == '"' and value[-1] == '"'):
+        return value[1:-1]
+    return None
+
+
+class ReplaceWithStringReferencesMiddleware(LibraryMiddleware):
+    """Replace field values with references to @string definitions of the same value.
+
+    This is the reverse of the :py:class:`ResolveStringReferencesMiddleware`,
+    and meant to be used when writing a library: it must run after the
+    :py:class:`AddEnclosingMiddleware` (i.e., as last middleware of the unparse stack),
+    as the references it inserts must not be enclosed.
+
+    Values are looked up in a dict from @string value to @string key, i.e., in constant time
+    per field. A value is only replaced by a reference to a @string defined before the entry.
+
+    Optionally, @string definitions are generated for values repeating more than
+    `auto_string_min_occurrences` times (e.g. journal or booktitle names), and inserted
+    before the first entry. Their keys are derived from the values (e.g. ``jmlr`` for
+    ``Journal of Machine Learning Research``), without clashing with existing @string keys.
+
+    :param allow_inplace_modification: See corresponding property.
+    :param auto_string_min_occurrences: If not None, generate @strings for values
+        occurring more than this number of times in the `auto_string_fields`.
+    :param auto_string_fields: The fields whose values are considered
+        for automatically generated @strings.
+    """
+
+    # docstr-coverage: inherited
+    def __init__(
+        self,
+        allow_inplace_modification: bool = True,
+        auto_string_min_occurrences: Optional[int] = None,
+        auto_string_fields: Tuple[str, ...] = DEFAULT_AUTO_STRING_FIELDS,
+    ):
+        super().__init__(allow_inplace_modification)
+        if auto_string_min_occurrences is not None and auto_string_min_occurrences < 1:
+            raise ValueError("auto_string_min_occurrences must be at least 1.")
+        self._auto_string_min_occurrences = auto_string_min_occurrences
+        self._auto_string_fields = auto_string_fields
+
+    # docstr-coverage: inherited
+    @classmethod
+    def metadata_key(cls) -> str:
+        return "ReplaceWithStringReferences"
+
+    @staticmethod
+    def _string_key_for(value: str, taken: set) -> str:
+        """Derive a @string key from a value, which is not yet in `taken` (casefolded)."""
+        words = _WORD.findall(_LATEX_MARKUP.sub("", value))
+        significant = [w for w in words if w.casefold() not in _ACRONYM_STOPWORDS] or words
+        if len(significant) > 1:
+            base = "".join(w[0] for w in significant).lower()
+        elif significant:
+            base = significant[0][:12].lower()
+        else:
+            base = "str"
+
+        key = base
+        suffix = 2
+        while key in taken:
+            key = f"{base}{suffix}"
+            suffix += 1
+        taken.add(key)
+        return key
+
+    def _generate_strings(self, library: Library) -> List[String]:
+        """Create @string definitions for frequently repeating values."""
+        if self._auto_string_min_occurrences is None:
+            return []
+
+        defined = {_enclosed_content(string.value) for string in library.strings}
+        counts: Dict[str, int] = dict()
+        for entry in library.entries:
+            for field in entry.fields:
+                if field.key not in self._auto_string_fields:
+                    continue
+                content = _enclosed_content(field.value)
+                if content and content not in defined:
+                    counts[content] = counts.get(content, 0) + 1
+
+        taken = set(_PREDEFINED_MACROS)
+        taken.update(key.casefold() for key in library.strings_dict)
+        return [
+            String(key=self._string_key_for(content, taken), value=f"{{{content}}}")
+            for content, count in counts.items()
+            if count > self._auto_string_min_occurrences
+        ]
+
+    # docstr-coverage: inherited
+    def transform(self, library: Library) -> Library:
+        if not self.allow_inplace_modification:
+            library = deepcopy(library)
+
+        generated = self._generate_strings(library)
+        available: Dict[str, str] = {
+            _enclosed_content(string.value): string.key for string in generated
+        }
+
+        raised_enclosing_warning = False
+        first_entry_index = None
+        for index, block in enumerate(library.blocks):
+            if isinstance(block, String):
+                content = _enclosed_content(block.value)
+                if content is not None:
+                    available.setdefault(content, block.key)
+                continue
+            if not isinstance(block, Entry):
+                continue
+
+            if first_entry_index is None:
+                first_entry_index = index
+            if not raised_enclosing_warning and REMOVED_ENCLOSING_KEY in block.parser_metadata:
+                raised_enclosing_warning = True
+                warnings.warn(
+                    (
+                        f"The AddEnclosingMiddleware must run before the {type(self).__name__}. "
+                        "We continue, but the inserted references are likely to be enclosed."
+                    ),
+                    UserWarning,
+                )
+
+            replaced_fields = list()
+            for field in block.fields:
+                key = available.get(_enclosed_content(field.value))
+                if key is not None:
+                    field.value = key
+                    replaced_fields.append(field.key)
+            if replaced_fields:
+                block.parser_metadata[self.metadata_key()] = replaced_fields
+
+        if generated:
+            blocks = library.blocks
+            position = len(blocks) if first_entry_index is None else first_entry_index
+            library = Library(blocks=blocks[:position] + generated + blocks[position:])
+        return library
+
+
+class ResolveCrossrefMiddleware(LibraryMiddleware):
+    """Inherit fields from entries referenced by `crossref` (and BibLaTeX `xdata`) fields.
+
+    An entry inherits every field it does not define itself from the entries
+    listed in its `xdata` field (in the given order), and then from the entry referenced
+    in its `crossref` field. Referenced entries themselves are resolved first,
+    such that chains of references are inherited transitively.
+
+    Parent entries are looked up by key in constant time, and every entry is resolved
+    once. References to unknown entries are ignored, and references forming cycles
+    are logged as warnings and ignored.
+
+    Optionally, a BibTeX-like `min_crossrefs` rule can be applied:
+    entries referenced (through `crossref`) by fewer than `min_crossrefs` entries
+    are removed from the library, and the `crossref` field of their children is dropped,
+    as all fields of the parent are contained in the children.
+
+    :param allow_inplace_modification: See corresponding property.
+    :param min_crossrefs: If not None, remove parents with fewer `crossref` references.
+    """
+
+    # docstr-coverage: inherited
+    def __init__(
+        self, allow_inplace_modification: bool = True, min_crossrefs: Optional[int] = None
+    ):
+        super().__init__(allow_inplace_modification)
+        self._min_crossrefs = min_crossrefs
+
+    # docstr-coverage: inherited
+    @classmethod
+    def metadata_key(cls) -> str:
+        return "ResolveCrossref"
+
+    @staticmethod
+    def _reference(entry: Entry, field_key: str) -> Optional[str]:
+        field = entry.fields_dict.get(field_key)
+        if field is None or not isinstance(field.value, str):
+            return None
+        value = field.value.strip()
+        content = _enclosed_content(value)
+        return (value if content is None else content).strip() or None
+
+    def _parent_keys(self, entry: Entry) -> List[str]:
+        """The keys of the entries `entry` inherits from, in order of precedence."""
+        parents = []
+        xdata = self._reference(entry, "xdata")
+        if xdata is not None:
+            parents.extend(key.strip() for key in xdata.split(",") if key.strip())
+        crossref = self._reference(entry, "crossref")
+        if crossref is not None:
+            parents.append(crossref)
+        return parents
 
-# TODO Middleware to resolve Crossref
+    def _inherit(self, entry: Entry, parents: List[Entry]):
+        """Copy the fields missing in `entry` from its (already resolved) parents."""
+        present = {field.key for field in entry.fields}
+        inherited = []
+        for parent in parents:
+            parent_enclosing = parent.parser_metadata.get(REMOVED_ENCLOSING_KEY)
+            for field in parent.fields:
+                if field.key in present or field.key in ("crossref", "xdata"):
+                    continue
+                entry.fields.append(Field(key=field.key, value=deepcopy(field.value)))
+                present.add(field.key)
+                inherited.append(field.key)
+                # Allow the AddEnclosingMiddleware to reuse the enclosing of the parent field.
+                child_enclosing = entry.parser_metadata.get(REMOVED_ENCLOSING_KEY)
+                if isinstance(parent_enclosing, dict) and isinstance(child_enclosing, dict):
+                    if field.key in parent_enclosing:
+                        child_enclosing[field.key] = parent_enclosing[field.key]
+        if inherited:
+            entry.parser_metadata[self.metadata_key()] = inherited
+
+    # docstr-coverage: inherited
+    def transform(self, library: Library) -> Library:
+        if not self.allow_inplace_modification:
+            library = deepcopy(library)
+
+        entries_by_key = library.entries_dict
+        # Like BibTeX, fall back to case-insensitive lookup of references.
+        entries_by_casefolded_key: Dict[str, Entry] = dict()
+        for key, entry in entries_by_key.items():
+            entries_by_casefolded_key.setdefault(key.casefold(), entry)
+
+        def lookup(key: str) -> Optional[Entry]:
+            """Find the entry with the given key."""
+            entry = entries_by_key.get(key)
+            if entry is None:
+                entry = entries_by_casefolded_key.get(key.casefold())
+            return entry
+
+        resolved = set()
+        crossref_counts: Dict[str, int] = dict()
+        for root in library.entries:
+            # Resolve parents before children, depth-first without recursion.
+            stack = [root]
+            on_stack = {root.key}
+            while stack:
+                current = stack[-1]
+                if current.key in resolved:
+                    stack.pop()
+                    continue
+
+                parents = []
+                unresolved_parent = None
+                for parent_key in self._parent_keys(current):
+                    parent = lookup(parent_key)
+                    if parent is None:
+                        logger.warning(
+                            "Entry `%s` references unknown entry `%s`.", current.key, parent_key
+                        )
+                    elif parent.key in on_stack:
+                        start = next(i for i, e in enumerate(stack) if e is parent)
+                        cycle = [e.key for e in stack[start:]] + [parent.key]
+                        logger.warning(
+                            "Cyclic references cannot be resolved: %s", " -> ".join(cycle)
+                        )
+                    elif parent.key not in resolved:
+                        unresolved_parent = parent
+                        break
+                    else:
+                        parents.append(parent)
+
+                if unresolved_parent is not None:
+                    stack.append(unresolved_parent)
+                    on_stack.add(unresolved_parent.key)
+                    continue
+
+                self._inherit(current, parents)
+                crossref = self._reference(current, "crossref")
+                crossref_parent = lookup(crossref) if crossref is not None else None
+                if crossref_parent is not None and crossref_parent is not current:
+                    crossref_counts[crossref_parent.key] = (
+                        crossref_counts.get(crossref_parent.key, 0) + 1
+                    )
+                resolved.add(current.key)
+                stack.pop()
+                on_stack.discard(current.key)
+
+        if self._min_crossrefs is not None:
+            self._apply_min_crossrefs(library, crossref_counts, lookup)
+        return library
+
+    def _apply_min_crossrefs(self, library: Library, crossref_counts: Dict[str, int], lookup):
+        """Remove rarely referenced parents, and the references to them."""
+        removed = {key for key, count in crossref_counts.items() if count < self._min_crossrefs}
+        if not removed:
+            return
+        for entry in library.entries:
+            crossref = self._reference(entry, "crossref")
+            parent = lookup(crossref) if crossref is not None else None
+            if parent is not None and parent.key in removed:
+                entry.pop("crossref")
+        library.remove([library.entries_dict[key] for key in removed])
@@ -1,7 +1,13 @@
 import abc
+import functools
 import logging
 import re
+import time
+from typing import Any
+from typing import Dict
 from typing import List
+from typing import Literal
+from typing import NamedTuple
 from typing import Optional
 from typing import Tuple
 
@@ -24,11 +30,68 @@ from .names import NameParts
 
 logger = logging.getLogger(__name__)
 
+# Characters and character sequences which the default pylatexenc decoder may transform.
+#   Values not containing any of these are returned unchanged by the decoder.
+_LATEX_DECODING_TRIGGERS = re.compile(r"[\\{}$~%&`]|--|''")
+
+
+class TransformCacheInfo(NamedTuple):
+    """Statistics about the value cache of a latex en- or decoding middleware."""
+
+    fast_path: int
+    """Number of values returned unchanged, without calling pylatexenc."""
+    hits: int
+    """Number of values taken from the cache."""
+    misses: int
+    """Number of values passed to pylatexenc."""
+    maxsize: int
+    """Maximum number of values kept in the cache."""
+    currsize: int
+    """Number of values currently in the cache."""
+    time_saved: float
+    """Estimated time (seconds) saved by cache hits, based on the average time of a miss."""
+
 
 class _PyStringTransformerMiddleware(BlockMiddleware, abc.ABC):
-    """Abstract utility class allowing to modify python-strings"""
+    """Abstract utility class allowing to modify python-strings
+
+    Transformed values are kept in a bounded LRU cache, and values which are known
+    to be left unchanged (see ``_is_unchanged_by_transform``) skip the transformation entirely.
+    """
+
+    _runtime_attributes = ("_fast_path_count", "_transform_time", "_cached_transform")
+
+    def _init_value_cache(self, cache_size: int) -> None:
+        """Set up the value cache. To be called from the constructor of subclasses.
+
+        :param cache_size: Maximum number of cached values. ``0`` disables caching."""
+        if cache_size < 0:
+            raise ValueError(f"cache_size must be >= 0, got {cache_size}")
+        self._fast_path_count = 0
+        self._transform_time = 0.0
+        self._cached_transform = functools.lru_cache(maxsize=cache_size)(self._timed_transform)
 
     @abc.abstractmethod
+    def _transform_value(self, python_string: str) -> Tuple[str, str]:
+        """Transform a single value, without caching.
+
+        Returns:
+            - The transformed string, if the transformation was successful
+            - An error message, if any, or an empty string
+        """
+        raise NotImplementedError("called abstract method")
+
+    def _is_unchanged_by_transform(self, python_string: str) -> bool:
+        """Fast check whether ``_transform_value`` is known to return the value unchanged."""
+        return False
+
+    def _timed_transform(self, python_string: str) -> Tuple[str, str]:
+        start = time.perf_counter()
+        try:
+            return self._transform_value(python_string)
+        finally:
+            self._transform_time += time.perf_counter() - start
+
     def _transform_python_value_string(self, python_string: str) -> Tuple[str, str]:
         """Called for every python (value, not key) string found on Entry and String blocks.
 
@@ -36,7 +99,29 @@ class _PyStringTransformerMiddleware(BlockMiddleware, abc.ABC):
             - The transformed string, if the transformation was successful
             - An error message, if any, or an empty string
         """
-        raise NotImplementedError("called abstract method")
+        if self._is_unchanged_by_transform(python_string):
+            self._fast_path_count += 1
+            return python_string, ""
+        return self._cached_transform(python_string)
+
+    def cache_info(self) -> TransformCacheInfo:
+        """Statistics about fast-path skips and the value cache of this middleware."""
+        info = self._cached_transform.cache_info()
+        mean_transform_time = self._transform_time / info.misses if info.misses > 0 else 0.0
+        return TransformCacheInfo(
+            fast_path=self._fast_path_count,
+            hits=info.hits,
+            misses=info.misses,
+            maxsize=info.maxsize,
+            currsize=info.currsize,
+            time_saved=info.hits * mean_transform_time,
+        )
+
+    def cache_clear(self) -> None:
+        """Clear the value cache and reset its statistics."""
+        self._cached_transform.cache_clear()
+        self._fast_path_count = 0
+        self._transform_time = 0.0
 
     # docstr-coverage: inherited
     def _transform_all_strings(self, list_of_strings: List[str], errors: List[str]) -> List[str]:
@@ -85,6 +170,52 @@ class _PyStringTransformerMiddleware(BlockMiddleware, abc.ABC):
         return string
 
 
+@functools.lru_cache(maxsize=None)
+def _default_encoder(
+    keep_math: bool, enclose_urls: bool
+) -> Tuple[UnicodeToLatexEncoder, re.Pattern]:
+    """The encoder used if none is specified, built once per configuration.
+
+    Returns the encoder, together with a pattern matching all values
+    which the encoder may change (i.e., values not matching are returned unchanged).
+    """
+    conversion_rules = []
+    triggers = []
+    if keep_math is True:
+        conversion_rules.append(
+            UnicodeToLatexConversionRule(
+                rule_type=RULE_REGEX,
+                # keep math mode parts as is
+                rule=[(re.compile(r"(?<!\\)(\$.*[^\\]\$)"), r"\1")],
+            )
+        )
+        triggers.append(re.escape("$"))
+    if enclose_urls is True:
+        conversion_rules.append(
+            UnicodeToLatexConversionRule(
+                rule_type=RULE_REGEX,
+                rule=[
+                    (re.compile(r"(https?://\S*\.\S*)"), r"\\url{\1}"),
+                    (re.compile(r"(www.\S*\.\S*)"), r"\\url{\1}"),
+                ],
+            )
+        )
+        triggers.extend(["https?://", "www"])
+
+    conversion_rules.append("defaults")
+    encoder = UnicodeToLatexEncoder(conversion_rules=conversion_rules)
+
+    # Everything but printable ascii and common whitespace may be encoded,
+    #   and so may the printable ascii characters the encoder changes (e.g. `&` or `_`).
+    triggers.append(r"[^\t\n\r\x20-\x7e]")
+    encoded_ascii = [
+        chr(c) for c in range(0x20, 0x7F) if encoder.unicode_to_latex(chr(c)) != chr(c)
+    ]
+    if encoded_ascii:
+        triggers.append("[" + "".join(re.escape(c) for c in encoded_ascii) + "]")
+    return encoder, re.compile("|".join(triggers))
+
+
 class LatexEncodingMiddleware(_PyStringTransformerMiddleware):
     """Latex-Encodes all strings in the library"""
 
@@ -94,7 +225,18 @@ class LatexEncodingMiddleware(_PyStringTransformerMiddleware):
         enclose_urls: bool = None,
         encoder: Optional[UnicodeToLatexEncoder] = None,
         allow_inplace_modification: bool = True,
+        cache_size: int = 1024,
     ):
+        """
+        :param keep_math: Whether to keep math mode (``$...$``) as is. Default: True.
+        :param enclose_urls: Whether to wrap urls in ``\\url{...}``. Default: True.
+        :param encoder: Custom pylatexenc encoder.
+            Cannot be combined with ``keep_math`` or ``enclose_urls``.
+        :param allow_inplace_modification: See corresponding property.
+        :param cache_size: Number of encoded values kept in an LRU cache,
+            which pays off for values repeated across entries (journals, publishers, ...).
+            ``0`` disables caching.
+        """
         super().__init__(
             allow_inplace_modification=allow_inplace_modification,
             allow_parallel_execution=True,
@@ -116,30 +258,16 @@ class LatexEncodingMiddleware(_PyStringTransformerMiddleware):
         keep_math = keep_math if keep_math is not None else True
         enclose_urls = enclose_urls if enclose_urls is not None else True
 
+        self._init_value_cache(cache_size)
+
         # Build encoder if no encoder was specified
+        #   (the fast path is only known to be safe for our own encoders)
+        self._encoding_triggers: Optional[re.Pattern] = None
+        # The options of the default encoder, which is fully determined by them
+        self._default_encoder_options: Optional[Tuple[bool, bool]] = None
         if encoder is None:
-            conversion_rules = []
-            if keep_math is True:
-                conversion_rules.append(
-                    UnicodeToLatexConversionRule(
-                        rule_type=RULE_REGEX,
-                        # keep math mode parts as is
-                        rule=[(re.compile(r"(?<!\\)(\$.*[^\\]\$)"), r"\1")],
-                    )
-                )
-            if enclose_urls is True:
-                conversion_rules.append(
-                    UnicodeToLatexConversionRule(
-                        rule_type=RULE_REGEX,
-                        rule=[
-                            (re.compile(r"(https?://\S*\.\S*)"), r"\\url{\1}"),
-                            (re.compile(r"(www.\S*\.\S*)"), r"\\url{\1}"),
-                        ],
-                    )
-                )
-
-            conversion_rules.append("defaults")
-            encoder = UnicodeToLatexEncoder(conversion_rules=conversion_rules)
+            encoder, self._encoding_triggers = _default_encoder(keep_math, enclose_urls)
+            self._default_encoder_options = (keep_math, enclose_urls)
         self._encoder = encoder
 
     # docstr-coverage: inherited
@@ -147,13 +275,162 @@ class LatexEncodingMiddleware(_PyStringTransformerMiddleware):
         return "latex_encoding"
 
     # docstr-coverage: inherited
-    def _transform_python_value_string(self, python_string: str) -> Tuple[str, str]:
+    def _configuration(self) -> Dict[str, Any]:
+        configuration = super()._configuration()
+        if self._default_encoder_options is not None:
+            del configuration["_encoder"], configuration["_encoding_triggers"]
+        return configuration
+
+    # docstr-coverage: inherited
+    def _is_unchanged_by_transform(self, python_string: str) -> bool:
+        return (
+            self._encoding_triggers is not None
+            and self._encoding_triggers.search(python_string) is None
+        )
+
+    # docstr-coverage: inherited
+    def _transform_value(self, python_string: str) -> Tuple[str, str]:
         try:
             return self._encoder.unicode_to_latex(python_string), ""
         except Exception as e:
             return python_string, str(e)
 
 
+@functools.lru_cache(maxsize=None)
+def _default_decoder(keep_braced_groups: bool, keep_math_mode: bool) -> LatexNodes2Text:
+    """The decoder used if none is specified, built once per configuration.
+
+    Building the pylatexenc context database is expensive, while the resulting
+    decoder does not keep any per-call state. Hence, it is shared between middleware instances.
+    """
+    lw_context_db = pylatexenc.latex2text.get_default_latex_context_db()
+    lw_context_db.add_context_category(
+        "bibtexparse-default-context",
+        prepend=True,
+        macros=[
+            # Do not wrap urls in '< ... >'
+            MacroTextSpec("url", simplify_repl="%s")
+        ],
+    )
+
+    return LatexNodes2Text(
+        # Use custom latex context
+        latex_context=lw_context_db,
+        # Optionally, do not remove curly braces
+        keep_braced_groups=keep_braced_groups,
+        # Optionally, decode math notation
+        math_mode="verbatim" if keep_math_mode is True else "text",
+    )
+
+
+# Accents written with a non-letter macro, e.g. `\"o` or `\'{e}`
+_NATIVE_SYMBOL_ACCENTS = "\"'^`~=."
+# Accents written with a letter macro, e.g. `\c{c}` or `\v s`
+_NATIVE_LETTER_ACCENTS = "cvuHkrdb"
+# Macros standing for a single character, e.g. `{\ss}` or `\o{}`
+_NATIVE_SYMBOL_MACROS = ("ss", "o", "O", "ae", "AE", "oe", "OE", "aa", "AA", "l", "L", "i", "j")
+_NATIVE_ESCAPED_CHARS = "&%$#_{}"
+_NATIVE_LETTERS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+_NATIVE_TOKENS = re.compile(
+    "|".join(
+        [
+            # Accents of single letters, e.g. `\"o` or `\"{o}`
+            r"\\(?P<symacc>[" + re.escape(_NATIVE_SYMBOL_ACCENTS) + r"])"
+            r"(?:\{(?P<symacc_b>[A-Za-z])\}|(?P<symacc_l>[A-Za-z]))",
+            # Accents with letter macros, e.g. `\c{c}` or `\c c`
+            r"\\(?P<letacc>[" + _NATIVE_LETTER_ACCENTS + r"])"
+            r"(?:\{(?P<letacc_b>[A-Za-z])\}|[ \t]+(?P<letacc_l>[A-Za-z]))",
+            # Symbol macros, followed by `{}` or by whitespace which latex swallows.
+            #   (a line break after the macro is left to pylatexenc)
+            #   Note that, as for pylatexenc, macro names end at the first non-(unicode-)letter.
+            r"\\(?P<macro>" + "|".join(_NATIVE_SYMBOL_MACROS) + r")(?![^\W\d_])"
+            r"(?:\{\}|[ \t]*(?![ \t\r\n]))",
+            r"\\(?P<escaped>[" + re.escape(_NATIVE_ESCAPED_CHARS) + r"])",
+            r"(?P<dash>---|--)",
+            r"(?P<tilde>~)",
+            r"(?P<open>\{)",
+            r"(?P<close>\})",
+            # Anything else potentially meaningful to latex: we cannot decode the value natively
+            r"(?P<unsupported>[\\$%&`]|'')",
+        ]
+    )
+)
+
+
+class _NativeLatexDecoder:
+    """Table-driven decoder for the latex commonly found in bibliographies.
+
+    Covers accented letters (``{\\"o}``, ``\\'e``, ``\\c{c}``, ...), single-character
+    macros (``{\\ss}``, ``\\o{}``, ...), escaped special characters (``\\&``, ...),
+    dashes, ties and (non-kept) braced groups.
+    The replacement table is computed by the given pylatexenc decoder itself,
+    hence, on the covered subset, the output is identical to the one of pylatexenc.
+
+    ``decode`` returns ``None`` for values containing anything else,
+    which then have to be decoded by pylatexenc.
+    """
+
+    def __init__(self, decoder: LatexNodes2Text):
+        def to_text(latex: str) -> str:
+            return decoder.latex_to_text(latex)
+
+        self._symbol_accents = {
+            (accent, letter): to_text(f"\\{accent}{{{letter}}}")
+            for accent in _NATIVE_SYMBOL_ACCENTS
+            for letter in _NATIVE_LETTERS
+        }
+        self._letter_accents = {
+            (accent, letter): to_text(f"\\{accent}{{{letter}}}")
+            for accent in _NATIVE_LETTER_ACCENTS
+            for letter in _NATIVE_LETTERS
+        }
+        self._macros = {macro: to_text(f"\\{macro}{{}}") for macro in _NATIVE_SYMBOL_MACROS}
+        self._escaped = {char: to_text(f"\\{char}") for char in _NATIVE_ESCAPED_CHARS}
+        self._dashes = {dash: to_text(dash) for dash in ("--", "---")}
+        self._tilde = to_text("~")
+
+    def decode(self, latex: str) -> Optional[str]:
+        """Decode the value, or return ``None`` if it is not covered by this decoder."""
+        pieces = []
+        depth = 0
+        position = 0
+        for m in _NATIVE_TOKENS.finditer(latex):
+            pieces.append(latex[position : m.start()])
+            position = m.end()
+            kind = m.lastgroup
+            if kind == "open":
+                depth += 1
+            elif kind == "close":
+                depth -= 1
+                if depth < 0:
+                    return None
+            elif kind in ("symacc_b", "symacc_l"):
+                pieces.append(self._symbol_accents[m.group("symacc"), m.group(kind)])
+            elif kind in ("letacc_b", "letacc_l"):
+                pieces.append(self._letter_accents[m.group("letacc"), m.group(kind)])
+            elif kind == "macro":
+                pieces.append(self._macros[m.group("macro")])
+            elif kind == "escaped":
+                pieces.append(self._escaped[m.group("escaped")])
+            elif kind == "dash":
+                pieces.append(self._dashes[m.group("dash")])
+            elif kind == "tilde":
+                pieces.append(self._tilde)
+            else:
+                return None
+        if depth != 0:
+            return None
+        pieces.append(latex[position:])
+        return "".join(pieces)
+
+
+@functools.lru_cache(maxsize=None)
+def _native_decoder(keep_math_mode: bool) -> _NativeLatexDecoder:
+    """The native decoder, with its table computed from the default pylatexenc decoder."""
+    return _NativeLatexDecoder(_default_decoder(False, keep_math_mode))
+
+
 class LatexDecodingMiddleware(_PyStringTransformerMiddleware):
     """Latex-Decodes all strings in the library"""
 
@@ -163,7 +440,25 @@ class LatexDecodingMiddleware(_PyStringTransformerMiddleware):
         keep_braced_groups: bool = None,
         keep_math_mode: bool = None,
         decoder: Optional[LatexNodes2Text] = None,
+        cache_size: int = 1024,
+        backend: Literal["pylatexenc", "native"] = "pylatexenc",
     ):
+        """
+        :param allow_inplace_modification: See corresponding property.
+        :param keep_braced_groups: Whether to keep curly braces around groups. Default: False.
+        :param keep_math_mode: Whether to keep math mode (``$...$``) verbatim. Default: True.
+        :param decoder: Custom pylatexenc decoder.
+            Cannot be combined with ``keep_braced_groups`` or ``keep_math_mode``.
+        :param cache_size: Number of decoded values kept in an LRU cache,
+            which pays off for values repeated across entries (journals, publishers, ...).
+            ``0`` disables caching.
+        :param backend: ``"pylatexenc"`` (default) decodes all values using pylatexenc.
+            ``"native"`` decodes the most common latex (accents such as ``{\\"o}``,
+            ``{\\ss}``, ``\\&``, ``--``, ...) using a much faster built-in decoder,
+            with identical output, and falls back to pylatexenc for all other values.
+            The native backend cannot be combined with a custom ``decoder``
+            or with ``keep_braced_groups=True``.
+        """
         super().__init__(
             allow_inplace_modification=allow_inplace_modification,
             allow_parallel_execution=True,
@@ -182,30 +477,33 @@ class LatexDecodingMiddleware(_PyStringTransformerMiddleware):
                 f"decoder must be a LatexNodes2Text instance, got {type(decoder).__name__}"
             )
 
+        if backend not in ("pylatexenc", "native"):
+            raise ValueError(f"backend must be 'pylatexenc' or 'native', got {backend!r}")
+
+        if backend == "native" and (decoder is not None or keep_braced_groups is True):
+            raise ValueError(
+                "The native backend cannot be combined with a custom decoder "
+                "or with `keep_braced_groups=True`."
+            )
+
         # Defaults (not specified as defaults in args,
         #   to make sure we can identify if they were specified)
         keep_braced_groups = keep_braced_groups if keep_braced_groups is not None else False
         keep_math_mode = keep_math_mode if keep_math_mode is not None else True
 
-        if decoder is None:
-            lw_context_db = pylatexenc.latex2text.get_default_latex_context_db()
-            lw_context_db.add_context_category(
-                "bibtexparse-default-context",
-                prepend=True,
-                macros=[
-                    # Do not wrap urls in '< ... >'
-                    MacroTextSpec("url", simplify_repl="%s")
-                ],
-            )
+        self._init_value_cache(cache_size)
 
-            decoder = LatexNodes2Text(
-                # Use custom latex context
-                latex_context=lw_context_db,
-                # Optionally, do not remove curly braces
-                keep_braced_groups=keep_braced_groups,
-                # Optionally, decode math notation
-                math_mode="verbatim" if keep_math_mode is True else "text",
-            )
+        self._native_decoder: Optional[_NativeLatexDecoder] = None
+        if backend == "native":
+            self._native_decoder = _native_decoder(keep_math_mode)
+
+        # The fast path is only known to be safe for our own decoders
+        self._fast_path_enabled = decoder is None
+        # The options of the default decoders, which are fully determined by them
+        self._default_decoder_options: Optional[Tuple[bool, bool, str]] = None
+        if decoder is None:
+            decoder = _default_decoder(keep_braced_groups, keep_math_mode)
+            self._default_decoder_options = (keep_braced_groups, keep_math_mode, backend)
 
         self._decoder = decoder
 
@@ -214,12 +512,27 @@ class LatexDecodingMiddleware(_PyStringTransformerMiddleware):
         return "latex_decoding"
 
     # docstr-coverage: inherited
-    def _transform_python_value_string(self, python_string: str) -> Tuple[str, str]:
-        """Transforms a python string to a latex string
+    def _configuration(self) -> Dict[str, Any]:
+        configuration = super()._configuration()
+        if self._default_decoder_options is not None:
+            del configuration["_decoder"], configuration["_native_decoder"]
+        return configuration
+
+    # docstr-coverage: inherited
+    def _is_unchanged_by_transform(self, python_string: str) -> bool:
+        return self._fast_path_enabled and _LATEX_DECODING_TRIGGERS.search(python_string) is None
+
+    # docstr-coverage: inherited
+    def _transform_value(self, python_string: str) -> Tuple[str, str]:
+        """Transforms a latex string to a python string
 
         Returns:
             Tuple[str, str]: The transformed string and a possible error message
         """
+        if self._native_decoder is not None:
+            decoded = self._native_decoder.decode(python_string)
+            if decoded is not None:
+                return decoded, ""
         try:
             return self._decoder.latex_to_text(python_string), ""
         except Exception as e:
@@ -1,7 +1,11 @@
 import abc
 import logging
 from copy import deepcopy
+from typing import Any
 from typing import Collection
+from typing import Dict
+from typing import List
+from typing import Tuple
 from typing import Union
 
 from bibtexparser.library import Library
@@ -21,6 +25,10 @@ class Middleware(abc.ABC):
     Abstract Class. You should extend either BlockMiddleware
     or LibraryMiddleware"""
 
+    # Attributes holding state collected while transforming (e.g. statistics),
+    # rather than configuration. Ignored when comparing configurations of parse stacks.
+    _runtime_attributes: Tuple[str, ...] = ()
+
     def __init__(
         self,
         allow_parallel_execution: bool = True,
@@ -34,6 +42,14 @@ class Middleware(abc.ABC):
         self._allow_inplace_modification = allow_inplace_modification
         self._allow_parallel_execution = allow_parallel_execution
 
+    def _configuration(self) -> Dict[str, Any]:
+        """The attributes which determine the output of the middleware.
+
+        Used to compare the configurations of parse stacks, e.g. for caching parsed files.
+        By default, all attributes except the `_runtime_attributes`. Subclasses holding
+        objects derived from other attributes may leave them out."""
+        return {k: v for k, v in vars(self).items() if k not in self._runtime_attributes}
+
     @property
     def allow_inplace_modification(self) -> bool:
         """If true, the middleware **may** modify the block in-place.
@@ -77,27 +93,29 @@ class BlockMiddleware(Middleware, abc.ABC):
         # TODO Multiprocessing (only for large library and if allow_multi..)
         blocks = []
         for b in library.blocks:
-            transformed = self.transform_block(b, library)
-            # Case 1: None. Skip it.
-            if transformed is None:
-                pass
-            # Case 2: A single block. Add it to the list.
-            elif isinstance(transformed, Block):
-                blocks.append(transformed)
-            # Case 3: A collection. Append all the elements.
-            elif isinstance(transformed, Collection):
-                # check that all the items are indeed blocks
-                for item in transformed:
-                    if not isinstance(item, Block):
-                        raise TypeError(
-                            f"Non-Block type found in transformed collection: {type(item)}"
-                        )
-                blocks.extend(transformed)
-            # Case 4: Something else. Error.
-            else:
-                raise TypeError(f"Illegal output type from transform_block: {type(transformed)}")
+            blocks.extend(self._transform_block_to_list(b, library))
         return Library(blocks=blocks)
 
+    def _transform_block_to_list(self, block: Block, library: "Library") -> List[Block]:
+        """Transform a block, and check and normalize the output to a list of blocks."""
+        transformed = self.transform_block(block, library)
+        # Case 1: None. Skip it.
+        if transformed is None:
+            return []
+        # Case 2: A single block. Add it to the list.
+        elif isinstance(transformed, Block):
+            return [transformed]
+        # Case 3: A collection. Append all the elements.
+        elif isinstance(transformed, Collection):
+            # check that all the items are indeed blocks
+            for item in transformed:
+                if not isinstance(item, Block):
+                    raise TypeError(f"Non-Block type found in transformed collection: {type(item)}")
+            return list(transformed)
+        # Case 4: Something else. Error.
+        else:
+            raise TypeError(f"Illegal output type from transform_block: {type(transformed)}")
+
     def transform_block(
         self, block: Block, library: "Library"
     ) -> Union[Block, Collection[Block], None]:
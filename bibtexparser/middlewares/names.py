@@ -6,6 +6,8 @@ Much of the code is taken from Blair Bonnetts never merged v0 pull request
 
 import abc
 import dataclasses
+import functools
+import re
 from typing import List
 from typing import Literal
 from typing import Tuple
@@ -18,14 +20,26 @@ from bibtexparser.model import MiddlewareErrorBlock
 
 from .middleware import BlockMiddleware
 
+# A ' and ' separating two names (note that `~` is not whitespace here).
+_NAMES_SEPARATOR = re.compile(r"[ \r\n\t]+[aA][nN][dD][ \r\n\t]+")
+
+# Tokens relevant for splitting names: escapes, braces and separators.
+_NAMES_TOKENS = re.compile(r"\\.?|[{}]|" + _NAMES_SEPARATOR.pattern, re.DOTALL)
+
 
 class InvalidNameError(ValueError):
     """Exception raised by :py:func:`parse_single_name_into_parts` when facing an invalid name."""
 
     def __init__(self, name: str, reason: str):
+        self.name = name
+        self.reason = reason
         message: str = f"Cannot split the following name `{name}` into parts: {reason}"
         super().__init__(message)
 
+    def __reduce__(self):
+        # Pickle by constructor arguments (e.g. to transfer blocks between processes).
+        return type(self), (self.name, self.reason)
+
 
 class _NameTransformerMiddleware(BlockMiddleware, abc.ABC):
     """Internal utility class - superclass for all name-transforming middlewares.
@@ -75,7 +89,7 @@ class SeparateCoAuthors(_NameTransformerMiddleware):
 
     # docstr-coverage: inherited
     def _transform_field_value(self, name: str) -> List[str]:
-        return split_multiple_persons_names(name)
+        return list(_split_multiple_persons_names_cached(name))
 
 
 class MergeCoAuthors(_NameTransformerMiddleware):
@@ -169,7 +183,10 @@ class SplitNameParts(_NameTransformerMiddleware):
                 "before using `SplitNameParts` middleware.".format(name)
             )
 
-        return [parse_single_name_into_parts(n) for n in name]
+        return [
+            NameParts(*(list(part) for part in _parse_single_name_into_parts_cached(n)))
+            for n in name
+        ]
 
 
 class MergeNameParts(_NameTransformerMiddleware):
@@ -208,116 +225,102 @@ class MergeNameParts(_NameTransformerMiddleware):
             raise ValueError(f"""Expected "first" or "last" style, got {self.style}. """)
 
 
-def parse_single_name_into_parts(name: str, strict: bool = True) -> NameParts:
-    """
-    Parse a name into its constituent parts: First, von, Last, and Jr.
+# Characters which make a name need the full (brace- and escape-aware) tokenizer.
+_NAME_MARKUP = re.compile(r"[\\{}]")
 
-    :param string name: a string containing a single name
-    :param Boolean strict: whether to use strict mode
-    :returns: dictionary of constituent parts
-    :raises `utils.InvalidName`: If an invalid name is given and
-                                 ``strict_mode = True``.
+# Whitespace characters that can separate words within a name.
+_NAME_WORD_SEPARATORS = re.compile(r"[ ~\r\n\t]+")
 
-    In BibTeX, a name can be represented in any of three forms:
-        * First von Last
-        * von Last, First
-        * von Last, Jr, First
+# Tokens of a name containing markup: an escape (`esc` is None if the backslash is
+# followed by whitespace or ends the name), a brace, a run of whitespace, a comma,
+# or a run of characters without any special meaning.
+_NAME_TOKENS = re.compile(
+    r"\\(?P<esc>[^ ~\r\n\t])?"
+    r"|(?P<brace>[{}])"
+    r"|(?P<space>[ ~\r\n\t]+)"
+    r"|(?P<comma>,)"
+    r"|(?P<text>[^\\{} ~\r\n\t,]+)"
+)
 
-    This function attempts to break a given name into its four parts. The
-    returned dictionary has keys of ``first``, ``last``, ``von`` and ``jr``.
-    Each value is a list of the words making up that part; this may be an empty
-    list.  If the input has no non-whitespace characters, a blank dictionary is
-    returned.
 
-    It is capable of detecting some errors with the input name. If the
-    ``strict_mode`` parameter is ``True``, which is the default, this results in
-    a :class:`utils.InvalidName` exception being raised. If it is ``False``,
-    the function continues, working around the error as best it can.  The
-    errors that can be detected are listed below along with the handling
-    for non-strict mode:
+def _case_of(text: str) -> int:
+    """Case of the first letter in `text`: 1 = uppercase, 0 = lowercase, -1 = caseless."""
+    for char in text:
+        if char.isalpha():
+            return 1 if char.isupper() else 0
+    return -1
 
-        * Name finishes with a trailing comma: delete the comma
-        * Too many parts (e.g., von Last, Jr, First, Error): merge extra parts
-          into First
-        * Unterminated opening brace: add closing brace to end of input
-        * Unmatched closing brace: add opening brace at start of word
 
-    Examples::
+def _split_plain_name_into_words(
+    name: str, strict: bool
+) -> Tuple[List[List[str]], List[List[int]]]:
+    """Split a name without braces or escapes into sections of words, and their cases.
 
-        >>> parse_single_name_into_parts("Donald E. Knuth")
-        {'last': ['Knuth'], 'von': [], 'first': ['Donald', 'E.'], 'jr': []}
+    This is the fast path of :py:func:`parse_single_name_into_parts`,
+    without any of the bookkeeping needed for braces and escapes."""
+    raw_sections = name.split(",")
+    if len(raw_sections) > 3:
+        if strict:
+            raise InvalidNameError(name=name, reason="Too many commas")
+        # Superfluous commas only separate words.
+        raw_sections[2:] = [" ".join(raw_sections[2:])]
 
-        >>> parse_single_name_into_parts("Brinch Hansen, Per")
-        {'last': ['Brinch', 'Hansen'], 'von': [], 'first': ['Per'], 'jr': []}
+    sections = []
+    cases = []
+    for raw_section in raw_sections:
+        words = [word for word in _NAME_WORD_SEPARATORS.split(raw_section) if word]
+        sections.append(words)
+        cases.append([_case_of(word) for word in words])
+    return sections, cases
 
-        >>> parse_single_name_into_parts("Beeblebrox, IV, Zaphod")
-        {'last': ['Beeblebrox'], 'von': [], 'first': ['Zaphod'], 'jr': ['IV']}
 
-        >>> parse_single_name_into_parts("Ludwig van Beethoven")
-        {'last': ['Beethoven'], 'von': ['van'], 'first': ['Ludwig'], 'jr': []}
+def _split_name_into_words(name: str, strict: bool) -> Tuple[List[List[str]], List[List[int]]]:
+    """Split a name into sections of words, and their cases, respecting braces and escapes.
 
+    The case of a word is determined by its first letter at brace level 0,
+    or by the first letter of a special character (a brace group starting with
+    an escape, e.g. `{\\'E}`). Control sequence names do not determine the case.
     """
-    # Useful references:
-    # http://maverick.inria.fr/~Xavier.Decoret/resources/xdkbibtex/bibtex_summary.html#names
-    # http://tug.ctan.org/info/bibtex/tamethebeast/ttb_en.pdf
-
-    # Whitespace characters that can separate words.
-    whitespace = set(" ~\r\n\t")
-
-    # We'll iterate over the input once, dividing it into a list of words for
-    # each comma-separated section. We'll also calculate the case of each word
-    # as we work.
     sections = [[]]  # Sections of the name.
     cases = [[]]  # 1 = uppercase, 0 = lowercase, -1 = caseless.
     word = []  # Current word.
     case = -1  # Case of the current word.
     level = 0  # Current brace level.
-    bracestart = False  # Will the next character be the first within a brace?
-    controlseq = True  # Are we currently processing a control sequence?
-    specialchar = None  # Are we currently processing a special character?
+    bracestart = False  # Will the next token be the first within a brace?
+    controlseq = False  # Are we currently processing a control sequence?
+    specialchar = False  # Are we currently processing a special character?
+
+    for match in _NAME_TOKENS.finditer(name):
+        kind = match.lastgroup
+        token = match.group()
 
-    # Using an iterator allows us to deal with escapes in a simple manner.
-    nameiter = iter(name)
-    for char in nameiter:
         # An escape.
-        if char == "\\":
-            try:
-                escaped = next(nameiter)
-
-                # BibTeX doesn't allow whitespace escaping. Copy the slash and fall
-                # through to the normal case to handle the whitespace.
-                if escaped in whitespace:
-                    word.append(char)
-                    char = escaped
-
-                else:
-                    # Is this the first character in a brace?
-                    if bracestart:
-                        bracestart = False
-                        controlseq = escaped.isalpha()
-                        specialchar = True
-
-                    # Can we use it to determine the case?
-                    elif (case == -1) and escaped.isalpha():
-                        if escaped.isupper():
-                            case = 1
-                        else:
-                            case = 0
-
-                    # Copy the escape to the current word and go to the next
-                    # character in the input.
-                    word.append(char)
-                    word.append(escaped)
-                    continue
-
-            # If we're at the end of the string, then the \ is just a \.
-            except StopIteration:
-                word.append(char)
+        if token[0] == "\\":
+            escaped = match.group("esc")
+            if escaped is not None:
+                # Is this the first character in a brace?
+                if bracestart:
+                    bracestart = False
+                    controlseq = escaped.isalpha()
+                    specialchar = True
+
+                # Can we use it to determine the case?
+                elif case == -1 and escaped.isalpha():
+                    case = 1 if escaped.isupper() else 0
+
+                word.append(token)
+                continue
+
+            # BibTeX doesn't allow whitespace escaping. Copy the slash and handle
+            # the whitespace (if any) as the next token.
+            word.append(token)
+            bracestart = False
+            continue
 
         # Start of a braced expression.
-        if char == "{":
+        if token == "{":
             level += 1
-            word.append(char)
+            word.append(token)
             bracestart = True
             controlseq = False
             specialchar = False
@@ -327,7 +330,7 @@ def parse_single_name_into_parts(name: str, strict: bool = True) -> NameParts:
         bracestart = False
 
         # End of a braced expression.
-        if char == "}":
+        if token == "}":
             # Check and reduce the level.
             if level:
                 level -= 1
@@ -339,70 +342,133 @@ def parse_single_name_into_parts(name: str, strict: bool = True) -> NameParts:
             # Update the state, append the character, and move on.
             controlseq = False
             specialchar = False
-            word.append(char)
+            word.append(token)
             continue
 
         # Inside a braced expression.
         if level:
-            # Is this the end of a control sequence?
-            if controlseq:
-                if not char.isalpha():
-                    controlseq = False
-
-            # If it's a special character, can we use it for a case?
-            elif specialchar:
-                if (case == -1) and char.isalpha():
-                    if char.isupper():
-                        case = 1
+            if kind == "text":
+                rest = token
+                # Is this the end of a control sequence?
+                if controlseq:
+                    for i, char in enumerate(token):
+                        if not char.isalpha():
+                            controlseq = False
+                            rest = token[i + 1 :]
+                            break
                     else:
-                        case = 0
+                        rest = ""
+                # If it's a special character, can we use it for a case?
+                if specialchar and case == -1:
+                    case = _case_of(rest)
+            else:
+                # Whitespace and commas end control sequences.
+                controlseq = False
 
-            # Append the character and move on.
-            word.append(char)
+            # Append the token and move on.
+            word.append(token)
+            continue
+
+        # Regular characters.
+        if kind == "text":
+            word.append(token)
+            if case == -1:
+                case = _case_of(token)
             continue
 
         # End of a word.
         # NB. we know we're not in a brace here due to the previous case.
-        if char == "," or char in whitespace:
-            # Don't add empty words due to repeated whitespace.
-            if word:
-                sections[-1].append("".join(word))
-                word = []
-                cases[-1].append(case)
-                case = -1
-                controlseq = False
-                specialchar = False
-
-            # End of a section.
-            if char == ",":
-                if len(sections) < 3:
-                    sections.append([])
-                    cases.append([])
-                elif strict:
-                    raise InvalidNameError(name=name, reason="Too many commas")
-            continue
+        # Don't add empty words due to repeated whitespace.
+        if word:
+            sections[-1].append("".join(word))
+            word = []
+            cases[-1].append(case)
+            case = -1
+            controlseq = False
+            specialchar = False
 
-        # Regular character.
-        word.append(char)
-        if (case == -1) and char.isalpha():
-            if char.isupper():
-                case = 1
-            else:
-                case = 0
+        # End of a section.
+        if kind == "comma":
+            if len(sections) < 3:
+                sections.append([])
+                cases.append([])
+            elif strict:
+                raise InvalidNameError(name=name, reason="Too many commas")
 
     # Unterminated brace?
     if level:
         if strict:
             raise InvalidNameError(name=name, reason="Unterminated opening brace")
-        while level:
-            word.append("}")
-            level -= 1
+        word.append("}" * level)
 
     # Handle the final word.
     if word:
         sections[-1].append("".join(word))
         cases[-1].append(case)
 
+    return sections, cases
+
+
+def parse_single_name_into_parts(name: str, strict: bool = True) -> NameParts:
+    """
+    Parse a name into its constituent parts: First, von, Last, and Jr.
+
+    :param string name: a string containing a single name
+    :param Boolean strict: whether to use strict mode
+    :returns: dictionary of constituent parts
+    :raises `utils.InvalidName`: If an invalid name is given and
+                                 ``strict_mode = True``.
+
+    In BibTeX, a name can be represented in any of three forms:
+        * First von Last
+        * von Last, First
+        * von Last, Jr, First
+
+    This function attempts to break a given name into its four parts. The
+    returned dictionary has keys of ``first``, ``last``, ``von`` and ``jr``.
+    Each value is a list of the words making up that part; this may be an empty
+    list.  If the input has no non-whitespace characters, a blank dictionary is
+    returned.
+
+    It is capable of detecting some errors with the input name. If the
+    ``strict_mode`` parameter is ``True``, which is the default, this results in
+    a :class:`utils.InvalidName` exception being raised. If it is ``False``,
+    the function continues, working around the error as best it can.  The
+    errors that can be detected are listed below along with the handling
+    for non-strict mode:
+
+        * Name finishes with a trailing comma: delete the comma
+        * Too many parts (e.g., von Last, Jr, First, Error): merge extra parts
+          into First
+        * Unterminated opening brace: add closing brace to end of input
+        * Unmatched closing brace: add opening brace at start of word
+
+    Examples::
+
+        >>> parse_single_name_into_parts("Donald E. Knuth")
+        {'last': ['Knuth'], 'von': [], 'first': ['Donald', 'E.'], 'jr': []}
+
+        >>> parse_single_name_into_parts("Brinch Hansen, Per")
+        {'last': ['Brinch', 'Hansen'], 'von': [], 'first': ['Per'], 'jr': []}
+
+        >>> parse_single_name_into_parts("Beeblebrox, IV, Zaphod")
+        {'last': ['Beeblebrox'], 'von': [], 'first': ['Zaphod'], 'jr': ['IV']}
+
+        >>> parse_single_name_into_parts("Ludwig van Beethoven")
+        {'last': ['Beethoven'], 'von': ['van'], 'first': ['Ludwig'], 'jr': []}
+
+    """
+    # Useful references:
+    # http://maverick.inria.fr/~Xavier.Decoret/resources/xdkbibtex/bibtex_summary.html#names
+    # http://tug.ctan.org/info/bibtex/tamethebeast/ttb_en.pdf
+
+    # We divide the input into a list of words for each comma-separated section,
+    # and calculate the case of each word along the way.
+    if _NAME_MARKUP.search(name) is None:
+        sections, cases = _split_plain_name_into_words(name, strict)
+    else:
+        sections, cases = _split_name_into_words(name, strict)
+
     # Get rid of trailing sections.
     if not sections[-1]:
         # Trailing comma?
@@ -542,112 +608,58 @@ def split_multiple_persons_names(names: str) -> List[str]:
     if not names:
         return []
 
-    # Steps to find the ' and ' token.
-    START_WHITESPACE, FIND_A, FIND_N, FIND_D, END_WHITESPACE, NEXT_WORD = (
-        0,
-        1,
-        2,
-        3,
-        4,
-        5,
-    )
-
-    # Processing variables.
-    step = START_WHITESPACE  # Current step.
-    pos = 0  # Current position in string.
-    bracelevel = 0  # Current bracelevel.
-    spans = [[0]]  # Spans of names within the string.
-    possible_end = 0  # Possible end position of a name.
-    whitespace = set(" \r\n\t")  # Allowed whitespace characters.
-
-    # Loop over the string.
-    namesiter = iter(names)
-    for char in namesiter:
-        pos += 1
-
-        # Escaped character.
-        if char == "\\":
-            try:
-                next(namesiter)
-            # If we're at the end of the string, then the \ is just a \.
-            except StopIteration:
-                pass
-            pos += 1
-            continue
-
-        # Change in brace level.
-        if char == "{":
-            if step == NEXT_WORD:
-                spans[-1].append(possible_end)
-                spans.append([pos - 1])
+    # Most fields hold a single name: no need to track braces then.
+    if _NAMES_SEPARATOR.search(names) is None:
+        return [names]
+
+    # Split at the ' and ' separators outside of braces. A separator followed
+    # by a closing brace does not start a new name.
+    spans = []
+    start = 0
+    bracelevel = 0
+    for match in _NAMES_TOKENS.finditer(names):
+        token = match.group()
+        if token == "{":
             bracelevel += 1
-            step = START_WHITESPACE
-            continue
-        if char == "}":
+        elif token == "}":
             if bracelevel:
                 bracelevel -= 1
-            step = START_WHITESPACE
-            continue
+        elif token[0] != "\\" and not bracelevel and names[match.end()] != "}":
+            spans.append((start, match.start()))
+            start = match.end()
+    spans.append((start, None))
 
-        # Ignore everything inside a brace.
-        if bracelevel:
-            step = START_WHITESPACE
-            continue
+    # Extract and return the names.
+    return [names[start:end] for start, end in spans]
 
-        # Looking for a whitespace character to start the ' and '. When we find
-        # one, mark it as the possible end of the previous word.
-        if step == START_WHITESPACE:
-            if char in whitespace:
-                step = FIND_A
-                possible_end = pos - 1
-
-        # Looking for the letter "a".
-        # NB, we can have multiple whitespace characters so we need to handle that here.
-        elif step == FIND_A:
-            if char in ("a", "A"):
-                step = FIND_N
-            elif char not in whitespace:
-                step = START_WHITESPACE
-
-        # Looking for the letter n.
-        elif step == FIND_N:
-            if char in ("n", "N"):
-                step = FIND_D
-            elif char in whitespace:
-                step = FIND_A
-                possible_end = pos - 1
-            else:
-                step = START_WHITESPACE
-
-        # Looking for the letter d.
-        elif step == FIND_D:
-            if char in ("d", "D"):
-                step = END_WHITESPACE
-            elif char in whitespace:
-                step = FIND_A
-                possible_end = pos - 1
-            else:
-                step = START_WHITESPACE
 
-        # And now the whitespace to end the ' and '.
-        elif step == END_WHITESPACE:
-            if char in whitespace:
-                step = NEXT_WORD
-            else:
-                step = START_WHITESPACE
+# Size of the caches shared by all name-parsing middlewares.
+_NAME_CACHE_SIZE = 8192
 
-        # Again, we need to handle multiple whitespace characters. Keep going
-        # until we find the start of the next word.
-        elif step == NEXT_WORD:
-            if char not in whitespace:
-                # Finish the previous word span, start the next,
-                # and do it all again.
-                spans[-1].append(possible_end)
-                spans.append([pos - 1])
-                step = START_WHITESPACE
 
-    # Finish the last word.
-    spans[-1].append(None)
+@functools.lru_cache(maxsize=_NAME_CACHE_SIZE)
+def _split_multiple_persons_names_cached(names: str) -> Tuple[str, ...]:
+    """Cached variant of :py:func:`split_multiple_persons_names`."""
+    return tuple(split_multiple_persons_names(names))
 
-    # Extract and return the names.
-    return [names[start:end] for start, end in spans]
+
+@functools.lru_cache(maxsize=_NAME_CACHE_SIZE)
+def _parse_single_name_into_parts_cached(
+    name: str, strict: bool = True
+) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    """Cached variant of :py:func:`parse_single_name_into_parts`.
+
+    Returns the (first, von, last, jr) parts as tuples, such that the cached value
+    cannot be modified by callers."""
+    parts = parse_single_name_into_parts(name, strict=strict)
+    return tuple(parts.first), tuple(parts.von), tuple(parts.last), tuple(parts.jr)
+
+
+def clear_name_cache() -> None:
+    """Clear the cache of split and parsed names shared by the name middlewares.
+
+    :py:class:`SeparateCoAuthors` and :py:class:`SplitNameParts` remember the results
+    for recently seen names, as the same persons typically appear in many entries
+    of a library. The cache is bounded; clearing it is only needed to free memory."""
+    _split_multiple_persons_names_cached.cache_clear()
+    _parse_single_name_into_parts_cached.cache_clear()
@@ -1,7 +1,12 @@
+import functools
 from copy import deepcopy
-from dataclasses import dataclass
-from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
 from typing import List
+from typing import Optional
+from typing import Sequence
 from typing import Tuple
 from typing import Type
 
@@ -18,40 +23,96 @@ from .middleware import LibraryMiddleware
 DEFAULT_BLOCK_TYPE_ORDER = (String, Preamble, Entry, ImplicitComment, ExplicitComment)
 
 
-@dataclass
-class _BlockJunk:
-    """Data-Structure reflecting zero or more comments together with a block."""
+@functools.lru_cache(maxsize=None)
+def _is_comment_type(block_type: type) -> bool:
+    """Whether blocks of this type are comments.
 
-    sort_key: str = ""
-    # The blocks (comments and the main block) are stored in the order they were parsed.
-    blocks: List[Block] = field(default_factory=list)
+    `isinstance` checks against the (abstract) block classes are slow: cache them per type."""
+    return issubclass(block_type, (ExplicitComment, ImplicitComment))
 
-    @property
-    def main_block_type(self) -> type:
-        """Returns the type of the main (i.e., non-comment) block."""
-        try:
-            return type(self.blocks[-1])
-        except IndexError:
-            raise RuntimeError(
-                "Block junk must contain at least one block. "
-                "This is a bug in bibtexparser, please report it."
-            )
+
+def _block_junk_bounds(blocks: Sequence[Block]) -> Iterator[Tuple[int, int]]:
+    """Group blocks into junks: zero or more comments, followed by a non-comment block.
+
+    Junks are returned as (start, end) slice bounds into `blocks`, i.e., the last
+    block of a junk (at `end - 1`) is its main block. Comments at the very end
+    form a last junk on their own."""
+    start = 0
+    for position, block in enumerate(blocks):
+        if not _is_comment_type(type(block)):
+            # We reached a non-comment block, hence we finish the junk and
+            # start a new one
+            yield start, position + 1
+            start = position + 1
+
+    if start < len(blocks):
+        # That would be a junk with only comments, but we add it at the end for completeness
+        yield start, len(blocks)
+
+
+def _iter_block_junks(blocks: Iterable[Block]) -> Iterator[List[Block]]:
+    """Streaming variant of :py:func:`_block_junk_bounds`, yielding the junks as lists."""
+    current_junk = []
+    for block in blocks:
+        current_junk.append(block)
+        if not _is_comment_type(type(block)):
+            yield current_junk
+            current_junk = []
+
+    if current_junk:
+        yield current_junk
+
+
+def _block_key(block: Block) -> str:
+    """The key of a block, or an empty string for blocks without key (e.g. comments)."""
+    return getattr(block, "key", "")
 
 
 class SortBlocksByTypeAndKeyMiddleware(LibraryMiddleware):
-    """Sorts the blocks of a library by type and key. Optionally, comments remain above same block."""
+    """Sorts the blocks of a library by type and key. Optionally, comments remain above same block.
+
+    Blocks of the same type are sorted by their key, or by a custom `key` function,
+    which is called once per (main) block. For example, to sort entries by year
+    and then by the surname of the first author (assuming the `SplitNameParts`
+    middleware was applied)::
+
+        def year_and_first_author(block):
+            if not isinstance(block, Entry):
+                return "", ""
+            authors = block.get("author")
+            surname = " ".join(authors.value[0].last) if authors and authors.value else ""
+            year = block.get("year")
+            return (year.value if year else ""), surname
+
+        SortBlocksByTypeAndKeyMiddleware(key=year_and_first_author)
+
+    :param block_type_order: The order of the block types.
+        Blocks of types not listed are put at the end.
+    :param preserve_comments_on_top: Whether comments remain above the block below them.
+    :param allow_inplace_modification: If True, the blocks of the passed library are
+        reordered in-place, without copying them. See corresponding property.
+    :param key: A function computing the sort key of a block (within its block type).
+        Defaults to the key of the block (empty string for blocks without key).
+    """
 
     def __init__(
         self,
         block_type_order: Tuple[Type[Block], ...] = DEFAULT_BLOCK_TYPE_ORDER,
         preserve_comments_on_top: bool = True,
+        allow_inplace_modification: bool = False,
+        key: Optional[Callable[[Block], Any]] = None,
     ):
         self._verify_all_types_are_block_types(block_type_order)
         self._block_type_order = block_type_order
         self._preserve_comments_on_top = preserve_comments_on_top
+        self._key = _block_key if key is None else key
+
+        # Ranks of the block types, looked up by type in constant time.
+        self._type_ranks = dict()
+        for rank, block_type in enumerate(block_type_order):
+            self._type_ranks.setdefault(block_type, rank)
 
-        # In-place modification is not yet supported, we make this explicit here,
-        super().__init__(allow_inplace_modification=False)
+        super().__init__(allow_inplace_modification=allow_inplace_modification)
 
     @staticmethod
     def _verify_all_types_are_block_types(sort_order):
@@ -61,62 +122,43 @@ class SortBlocksByTypeAndKeyMiddleware(LibraryMiddleware):
                     "Sort order must only contain Block subclasses, " f"but got {str(t)}"
                 )
 
-    @staticmethod
-    def _block_junks(blocks: List[Block]) -> List[_BlockJunk]:
-        block_junks = []
-        current_junk = _BlockJunk()
-        for block in blocks:
-            current_junk.blocks.append(block)
-            try:
-                current_junk.sort_key = block.key
-            except AttributeError:
-                # Block has no key that could be used as sort key
-                #   (this happens for comments, preambles and parsing-failed blocks, for example)
-                pass
-
-            if not (isinstance(block, ExplicitComment) or isinstance(block, ImplicitComment)):
-                # We added a non-comment block, hence we finish the junk and
-                # start a new one
-                block_junks.append(current_junk)
-                current_junk = _BlockJunk()
-
-        if current_junk.blocks:
-            # That would be a junk with only comments, but we add it at the end for completeness
-            block_junks.append(current_junk)
-
-        return block_junks
+    def _sort_key(self, block: Block) -> Tuple[int, Any]:
+        """Sort key of a (main) block: the rank of its type, and its (custom) key.
+
+        Blocks of types not in the order list are put at the end."""
+        return (
+            self._type_ranks.get(type(block), len(self._block_type_order)),
+            self._key(block),
+        )
 
     # docstr-coverage: inherited
     def transform(self, library: Library) -> Library:
-        blocks = deepcopy(library.blocks)
+        blocks = library.blocks
+        if not self.allow_inplace_modification:
+            blocks = deepcopy(blocks)
+
         if self._preserve_comments_on_top:
-            block_junks = self._block_junks(blocks)
-
-            def _sort_key(block_junk):
-                """Sort key for block junks. Based on (block type, string-or-entry-key)."""
-                try:
-                    return (
-                        self._block_type_order.index(block_junk.main_block_type),
-                        block_junk.sort_key,
-                    )
-                except ValueError:
-                    # If the block type is not in the order list, put it at the end
-                    return len(self._block_type_order), block_junk.sort_key
-
-            block_junks.sort(key=_sort_key)
-            return Library(
-                blocks=[block for block_junk in block_junks for block in block_junk.blocks]
-            )
+            bounds = _block_junk_bounds(blocks)
         else:
-
-            def _sort_key(block: Block):
-                """Sort key for blocks. Based on (block type, string-or-entry-key)."""
-                block_key = getattr(block, "key", "")
-                try:
-                    return self._block_type_order.index(block.__class__), block_key
-                except ValueError:
-                    # If the block type is not in the order list, put it at the end
-                    return len(self._block_type_order), block_key
-
-            blocks.sort(key=_sort_key)
-            return Library(blocks=blocks)
+            bounds = ((position, position + 1) for position in range(len(blocks)))
+
+        # Decorate-sort-undecorate: the sort key of every main block is computed once,
+        #   and the position breaks ties (keeping the sort stable without comparing blocks).
+        #   Blocks of types not in the order list are put at the end.
+        type_rank = self._type_ranks.get
+        default_rank = len(self._block_type_order)
+        key = self._key
+        decorated = [
+            (type_rank(type(blocks[end - 1]), default_rank), key(blocks[end - 1]), start, end)
+            for start, end in bounds
+        ]
+        decorated.sort()
+        sorted_blocks = []
+        for _, _, start, end in decorated:
+            sorted_blocks.extend(blocks[start:end])
+
+        if self.allow_inplace_modification:
+            # Same blocks, same keys: only the order of the block list changes.
+            library.blocks[:] = sorted_blocks
+            return library
+        return Library(blocks=sorted_blocks)
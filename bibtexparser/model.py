@@ -1,4 +1,5 @@
 import abc
+import sys
 from typing import Any
 from typing import Dict
 from typing import List
@@ -6,6 +7,67 @@ from typing import Optional
 from typing import Set
 from typing import Tuple
 
+# Attribute storing the state of a block which is represented by its ``raw`` string
+#   (see `Block.mark_unmodified`). It is only set on marked blocks, and ignored by `__eq__`.
+_RAW_STATE = "_raw_state"
+
+
+def _freeze(value: Any) -> Any:
+    """An immutable snapshot of a (field) value, e.g. of lists of names or ``NameParts``."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if hasattr(value, "__dict__"):
+        return type(value), _freeze(vars(value))
+    return value
+
+
+# Attribute names of pickled objects, shared between all objects with the same attributes
+#   such that pickles contain each tuple of names only once (see `_pickled_attributes`).
+_ATTRIBUTE_LAYOUTS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _pickled_attributes(obj: Any) -> tuple:
+    """The arguments of `_unpickle` recreating ``obj``: its type, attribute names and values.
+
+    Model objects are pickled this way (instead of as a dict per object), as the names
+    of the attributes, which are the same for all objects of a type, are only pickled once.
+    """
+    state = obj.__dict__
+    names = tuple(state)
+    return (type(obj), _ATTRIBUTE_LAYOUTS.setdefault(names, names), *state.values())
+
+
+def _unpickle(cls: type, names: Tuple[str, ...], *values: Any) -> Any:
+    obj = cls.__new__(cls)
+    obj.__dict__.update(zip(names, values))
+    return obj
+
+
+def _unpickle_entry(cls: type, names: Tuple[str, ...], *values: Any) -> "Entry":
+    entry = _unpickle(cls, names, *values)
+    # Fields are packed as a flat tuple of keys, values and start lines, the latter
+    #   relative to the start line of the entry (see `Entry.__reduce_ex__`)
+    first_line = _line_offset(entry._start_line_in_file)
+    packed = iter(entry._fields)
+    entry._fields = [
+        Field(key, value, line + first_line if type(line) is int else line)
+        for key, value, line in zip(packed, packed, packed)
+    ]
+    return entry
+
+
+def _content(block: "Block") -> Dict[str, Any]:
+    """The attributes of a block, without the state recorded by `mark_unmodified`."""
+    return {name: value for name, value in block.__dict__.items() if name != _RAW_STATE}
+
+
+def _line_offset(start_line: Optional[int]) -> int:
+    return start_line if type(start_line) is int else 0
+
 
 class Block(abc.ABC):
     """An abstract superclass of all top-level building blocks of a bibtex file.
@@ -68,13 +130,53 @@ class Block(abc.ABC):
         See attribute ``parser_metadata`` for more information."""
         self._parser_metadata[key] = value
 
+    def _relocate(self, start_line: Optional[int], raw: Optional[str] = None):
+        """Update the position (and raw string) of the block after its file was changed."""
+        self._start_line_in_file = start_line
+        if raw is not None:
+            self._raw = raw
+
+    def _state(self) -> Optional[Any]:
+        """The content of the block which determines its bibtex representation.
+
+        None if the block's `raw` string may never be written as is."""
+        return None
+
+    def mark_unmodified(self):
+        """EXPERIMENTAL: remember that `raw` represents the current content of this block.
+
+        Typically called right after parsing (see the `track_modifications` argument of
+        :py:class:`bibtexparser.Parser`). Writers with `raw_passthrough` enabled then
+        write `raw` as is for blocks which were not modified since."""
+        state = self._state()
+        if state is not None and self._raw is not None:
+            self._raw_state = state
+
+    def is_unmodified(self) -> bool:
+        """EXPERIMENTAL: whether the content of the block is still the one represented by `raw`,
+        i.e., the block was not modified since :py:meth:`mark_unmodified` was called."""
+        state = self.__dict__.get(_RAW_STATE)
+        return state is not None and state == self._state()
+
+    def _is_marked(self) -> bool:
+        """Whether :py:meth:`mark_unmodified` recorded the state of the block."""
+        return _RAW_STATE in self.__dict__
+
     def __eq__(self, other: object) -> bool:
         # make sure they have the same type and same content
-        return (
-            isinstance(other, self.__class__)
-            and isinstance(self, other.__class__)
-            and self.__dict__ == other.__dict__
-        )
+        if not (isinstance(other, self.__class__) and isinstance(self, other.__class__)):
+            return False
+        # The recorded state only tracks modifications, it is not part of the content
+        if _RAW_STATE in self.__dict__ or _RAW_STATE in other.__dict__:
+            return _content(self) == _content(other)
+        return self.__dict__ == other.__dict__
+
+    def __reduce_ex__(self, protocol):
+        return _unpickle, _pickled_attributes(self)
+
+    def __copy__(self):
+        # As `copy.copy` would otherwise use the (compact) pickling of the block
+        return _unpickle(*_pickled_attributes(self))
 
 
 class String(Block):
@@ -109,6 +211,10 @@ class String(Block):
     def value(self, value: str):
         self._value = value
 
+    # docstr-coverage: inherited
+    def _state(self) -> Optional[Any]:
+        return self._key, _freeze(self._value)
+
     def __str__(self) -> str:
         return f"String (line: {self.start_line}, key: `{self.key}`): `{self.value}`"
 
@@ -135,6 +241,10 @@ class Preamble(Block):
     def value(self, value: str):
         self._value = value
 
+    # docstr-coverage: inherited
+    def _state(self) -> Optional[Any]:
+        return _freeze(self._value)
+
     def __str__(self) -> str:
         return f"Preamble (line: {self.start_line}): `{self.value}`"
 
@@ -158,6 +268,10 @@ class ExplicitComment(Block):
     def comment(self, value: str):
         self._comment = value
 
+    # docstr-coverage: inherited
+    def _state(self) -> Optional[Any]:
+        return self._comment
+
     def __str__(self) -> str:
         return f"ExplicitComment (line: {self.start_line}): `{self.comment}`"
 
@@ -184,6 +298,10 @@ class ImplicitComment(Block):
     def comment(self, value: str):
         self._comment = value
 
+    # docstr-coverage: inherited
+    def _state(self) -> Optional[Any]:
+        return self._comment
+
     def __str__(self) -> str:
         return f"ImplicitComment (line: {self.start_line}): `{self.comment}`"
 
@@ -233,6 +351,12 @@ class Field:
             and self.__dict__ == other.__dict__
         )
 
+    def __reduce_ex__(self, protocol):
+        return _unpickle, _pickled_attributes(self)
+
+    def __copy__(self):
+        return _unpickle(*_pickled_attributes(self))
+
     def __str__(self) -> str:
         return f"Field (line: {self.start_line}, key: `{self.key}`): `{self.value}`"
 
@@ -362,6 +486,35 @@ class Entry(Block):
             ("ID", self.key),
         ] + [(f.key, f.value) for f in self.fields]
 
+    # docstr-coverage: inherited
+    def _state(self) -> Optional[Any]:
+        return (
+            self._entry_type,
+            self._key,
+            tuple((field.key, _freeze(field.value)) for field in self._fields),
+        )
+
+    def __reduce_ex__(self, protocol):
+        # The fields are packed into one flat tuple of keys, values and start lines, with
+        #   interned keys (pickled only once) and lines relative to the entry (small ints).
+        if type(self._fields) is not list:
+            return super().__reduce_ex__(protocol)
+        first_line = _line_offset(self._start_line_in_file)
+        packed = []
+        for field in self._fields:
+            if type(field) is not Field or len(field.__dict__) != 3:
+                # Fields with additional state are pickled as they are
+                return super().__reduce_ex__(protocol)
+            key, line = field._key, field._start_line
+            packed += (
+                sys.intern(key) if type(key) is str else key,
+                field._value,
+                line - first_line if type(line) is int else line,
+            )
+        cls, names, *values = _pickled_attributes(self)
+        values[names.index("_fields")] = tuple(packed)
+        return _unpickle_entry, (cls, names, *values)
+
     def __str__(self) -> str:
         lines = [f"Entry (line: {self.start_line}, type: `{self.entry_type}`, key: `{self.key}`):"]
         lines.extend([f"\t`{f.key}` = `{f.value}`" for f in self.fields])
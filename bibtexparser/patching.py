@@ -0,0 +1,211 @@
+"""Saving changes to a library by patching the file it was parsed from."""
+
+import bisect
+import itertools
+import os
+import shutil
+import tempfile
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+
+from .entrypoint import Writer
+from .library import Library
+from .model import Block
+from .model import ParsingFailedBlock
+
+# Number of lines copied at once between the patched regions.
+_LINES_PER_BATCH = 10_000
+
+
+class _Output:
+    """A text file being written, keeping track of the number of line breaks written."""
+
+    def __init__(self, file: TextIO):
+        self.file = file
+        self.line_breaks = 0
+        self.ends_with_line_break = True
+
+    def write(self, text: str):
+        if text:
+            self.file.write(text)
+            self.line_breaks += text.count("\n")
+            self.ends_with_line_break = text.endswith("\n")
+
+
+def _render(block: Block, writer: Writer) -> str:
+    """The bibtex of a single block, without the trailing line break."""
+    rendered = writer.write_string(Library(blocks=[block]))
+    return rendered[:-1] if rendered.endswith("\n") else rendered
+
+
+def _patch(src: TextIO, out: _Output, replacements: List[Tuple[Block, str]]) -> List[int]:
+    """Copy `src` to `out`, replacing the raw strings of blocks.
+
+    Blocks replaced by an empty string are removed together with their line
+    (if they are the only content of the line) and a following empty line.
+
+    :param replacements: Blocks (sorted by start line) and the strings replacing their raw strings.
+    :returns: For every replacement, the difference between the line numbers
+        in the output and in `src` of the text following it.
+    :raises ValueError: If the raw string of a block is not found at its start line."""
+    line_offsets = []
+    # Number of lines read from `src`
+    lines_read = 0
+    # Text read from `src`, but not yet written (the remainder of the last line read)
+    pending = ""
+    for block, replacement in replacements:
+        if block.start_line >= lines_read:
+            out.write(pending)
+            while lines_read < block.start_line:
+                batch = list(
+                    itertools.islice(src, min(block.start_line - lines_read, _LINES_PER_BATCH))
+                )
+                if not batch:
+                    break
+                out.write("".join(batch))
+                lines_read += len(batch)
+            buffer = ""
+        else:
+            # The block starts on the line on which the previous block ended
+            buffer = pending
+
+        index = buffer.find(block.raw)
+        while index == -1:
+            line = src.readline()
+            if not line:
+                raise ValueError(
+                    f"Block `{getattr(block, 'key', type(block).__name__)}` was not found "
+                    f"at line {block.start_line}. Was the file changed since it was parsed?"
+                )
+            buffer += line
+            lines_read += 1
+            index = buffer.find(block.raw)
+
+        before, after = buffer[:index], buffer[index + len(block.raw) :]
+        if not replacement and not before.strip() and not after.strip():
+            # Remove the whole line, and the empty line separating the block from the next one
+            before = after = ""
+            line = src.readline()
+            if line:
+                lines_read += 1
+                if line.strip():
+                    after = line
+
+        out.write(before)
+        out.write(replacement)
+        pending = after
+        line_offsets.append(out.line_breaks - (lines_read - pending.count("\n")))
+
+    out.write(pending)
+    for chunk in iter(lambda: src.read(1 << 20), ""):
+        out.write(chunk)
+    return line_offsets
+
+
+def patch_file(
+    path: str,
+    library: Library,
+    changed_blocks: Optional[Iterable[Block]] = None,
+    removed_blocks: Iterable[Block] = (),
+    writer: Optional[Writer] = None,
+    encoding: str = "UTF-8",
+) -> None:
+    """Save changes to a library by patching the file it was parsed from.
+
+    Only the text of the changed and removed blocks is replaced; the rest of the file is
+    copied as is, without being parsed or rendered. New blocks (i.e., blocks
+    which were not parsed from the file) are appended at the end of the file.
+    The patched file is written to a temporary file first, which then replaces the original,
+    such that the original file is never left half-written.
+
+    Blocks are located in the file by their `start_line` and `raw` string. These are updated
+    once the file is patched (and the changed blocks are marked as unmodified, see
+    :py:meth:`bibtexparser.model.Block.mark_unmodified`); hence, the library can be
+    patched into the file again after further changes.
+
+    Files with mixed line endings are written with the first line ending of the file.
+
+    :param path: Path of the file the library was parsed from.
+    :param library: The library parsed from the file.
+    :param changed_blocks: The blocks which were changed or added. If None, these are the
+        blocks of the library which were modified (see
+        :py:meth:`bibtexparser.model.Block.is_unmodified`), which requires the library to be
+        parsed with `track_modifications`; otherwise, all blocks are re-rendered.
+        Blocks which could not be parsed (including duplicates) are never included
+        by default, such that their text is kept as is.
+    :param removed_blocks: The blocks which were removed from the library.
+    :param writer: The writer used to render the changed blocks (default: ``Writer()``).
+    :param encoding: Encoding of the file.
+    :raises ValueError: If a block is not found in the file at its start line.
+    """
+    if writer is None:
+        writer = Writer()
+    if changed_blocks is None:
+        # Failed blocks have no parsed state to compare with: they are kept as they are
+        changed_blocks = [
+            block
+            for block in library.blocks
+            if not block.is_unmodified() and not isinstance(block, ParsingFailedBlock)
+        ]
+
+    replacements = []
+    new_blocks = []
+    for block in changed_blocks:
+        if block.start_line is None or block.raw is None:
+            new_blocks.append((block, _render(block, writer)))
+        else:
+            replacements.append((block, _render(block, writer)))
+    removed_blocks = list(removed_blocks)
+    replacements.extend((block, "") for block in removed_blocks)
+    replacements.sort(key=lambda replacement: replacement[0].start_line)
+
+    with open(path, encoding=encoding) as src:
+        # Read the first line to detect the line endings of the file
+        src.readline()
+        newline = src.newlines if isinstance(src.newlines, str) else None
+        src.seek(0)
+
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding=encoding,
+            newline=newline,
+            dir=os.path.dirname(os.path.abspath(path)),
+            delete=False,
+        ) as dst:
+            try:
+                out = _Output(dst)
+                line_offsets = _patch(src, out, replacements)
+
+                new_start_lines = []
+                for block, rendered in new_blocks:
+                    if out.line_breaks > 0 or not out.ends_with_line_break:
+                        # Separate from the previous block by an empty line
+                        out.write("\n" if out.ends_with_line_break else "\n\n")
+                    new_start_lines.append(out.line_breaks)
+                    out.write(rendered + "\n")
+            except BaseException:
+                dst.close()
+                os.remove(dst.name)
+                raise
+
+    shutil.copymode(path, dst.name)
+    os.replace(dst.name, path)
+
+    # Update the positions of the blocks to the patched file
+    replaced_start_lines = [block.start_line for block, _ in replacements]
+    for block in library.blocks:
+        if block.start_line is not None:
+            i = bisect.bisect_left(replaced_start_lines, block.start_line)
+            if i > 0:
+                block._relocate(block.start_line + line_offsets[i - 1])
+    removed_block_ids = {id(block) for block in removed_blocks}
+    for block, replacement in replacements:
+        if id(block) not in removed_block_ids:
+            block._relocate(block.start_line, raw=replacement)
+            block.mark_unmodified()
+    for (block, rendered), start_line in zip(new_blocks, new_start_lines):
+        block._relocate(start_line, raw=rendered)
+        block.mark_unmodified()
@@ -0,0 +1,276 @@
+"""An index of the persons (authors, editors, ...) appearing in a library."""
+
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .library import Library
+from .middlewares.names import NameParts
+from .middlewares.names import _parse_single_name_into_parts_cached
+from .middlewares.names import _split_multiple_persons_names_cached
+from .model import Entry
+from .model import _freeze
+
+# Accents which only modify the following letter, e.g. `\'e`, `\"{o}` or `\c{c}`.
+_LATEX_ACCENTS = re.compile(r"\\(?:[^A-Za-z]|[cvuHkrdbt](?![A-Za-z]))")
+
+# The backslash of the remaining control sequences (e.g. `\ss`, `\o`), braces and ties.
+_LATEX_MARKUP = re.compile(r"\\|[{}]")
+
+# Separators of the words and initials in a first name, e.g. `D.E.` or `Jean-Paul`.
+_INITIALS_SEPARATORS = re.compile(r"[\s.\-~]+")
+
+
+class PersonKey(NamedTuple):
+    """The normalized key identifying a person in a :py:class:`PersonIndex`.
+
+    All parts are free of LaTeX markup, diacritics and case, such that e.g.
+    ``{\\"O}zt{\\"u}rk, Ay{\\c{s}}e`` and ``Öztürk, A.`` map to the same key."""
+
+    last: str
+    """The last name(s), separated by spaces."""
+
+    first_initials: str
+    """The initials of the first name(s), e.g. ``"de"`` for ``Donald E.``."""
+
+    von: str
+    """The von part(s), separated by spaces."""
+
+
+class PersonOccurrence(NamedTuple):
+    """A place where a person appears in a library."""
+
+    entry_key: str
+    """The key of the entry."""
+
+    field: str
+    """The key of the field in the entry, e.g. ``"author"``."""
+
+    position: int
+    """The (zero-based) position of the person in the list of names of the field."""
+
+
+def _normalize(text: str) -> str:
+    """Remove LaTeX markup and diacritics from `text`, and casefold it."""
+    text = _LATEX_MARKUP.sub("", _LATEX_ACCENTS.sub("", text))
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold()
+
+
+def _join_normalized(words: Iterable[str]) -> str:
+    return " ".join(_normalize(word).replace("~", " ") for word in words)
+
+
+def person_key(name: Union[str, NameParts]) -> Optional[PersonKey]:
+    """Compute the normalized key of a single person name.
+
+    :param name: A single name, either as string or already split into its parts.
+    :returns: The key, or None if the name is empty (i.e., has no last name)."""
+    if isinstance(name, str):
+        first, von, last, _ = _parse_single_name_into_parts_cached(name, strict=False)
+    else:
+        first, von, last = name.first, name.von, name.last
+    if not last:
+        return None
+
+    initials = []
+    for word in first:
+        initials.extend(part[0] for part in _INITIALS_SEPARATORS.split(_normalize(word)) if part)
+    return PersonKey(
+        last=_join_normalized(last),
+        first_initials="".join(initials),
+        von=_join_normalized(von),
+    )
+
+
+def _names_of(value) -> List[Union[str, NameParts]]:
+    """The single names contained in a name field value.
+
+    Supports raw strings as well as the outputs of the
+    `SeparateCoAuthors` and `SplitNameParts` middlewares."""
+    if isinstance(value, str):
+        return list(_split_multiple_persons_names_cached(value))
+    if isinstance(value, list):
+        return value
+    return []
+
+
+class PersonIndex:
+    """An index of the persons appearing in the name fields of a library's entries.
+
+    Persons are identified by a :py:class:`PersonKey` (normalized last name,
+    first name initials and von part). Names are parsed once when an entry is indexed,
+    using the cache shared with the name middlewares; lookups do not parse any names.
+
+    The name fields may contain raw strings, or the lists produced
+    by the `SeparateCoAuthors` and `SplitNameParts` middlewares.
+
+    The index is not updated automatically when the library changes. Use
+    :py:meth:`add_entry`, :py:meth:`remove_entry` and :py:meth:`update_entry`
+    to keep it up to date, or :py:meth:`sync` to re-index only the entries which
+    were added, removed or changed since the last update.
+
+    :param library: The library to index. Can be omitted to build the index entry by entry.
+    :param name_fields: The fields that contain names.
+    """
+
+    def __init__(
+        self,
+        library: Optional[Library] = None,
+        name_fields: Tuple[str, ...] = ("author", "editor", "translator"),
+    ):
+        self._library = library
+        self._name_fields = name_fields
+        self._occurrences: Dict[PersonKey, List[PersonOccurrence]] = dict()
+        # For every indexed entry key: the entry, a snapshot of its name fields,
+        # and the persons (with the field they appear in) it has been indexed under.
+        self._indexed: Dict[str, Tuple[Entry, tuple, List[Tuple[PersonKey, str]]]] = dict()
+        # Entries may change their key after being indexed: remember the key they were indexed by.
+        self._keys_by_entry_id: Dict[int, str] = dict()
+
+        if library is not None:
+            for entry in library.entries:
+                self.add_entry(entry)
+
+    @property
+    def name_fields(self) -> Tuple[str, ...]:
+        """The fields that contain names, considered by this index."""
+        return self._name_fields
+
+    @property
+    def persons(self) -> List[PersonKey]:
+        """All persons in the index."""
+        return list(self._occurrences)
+
+    def __len__(self) -> int:
+        return len(self._occurrences)
+
+    def __contains__(self, person) -> bool:
+        return self._key(person) in self._occurrences
+
+    def _snapshot(self, entry: Entry) -> tuple:
+        return tuple(
+            (field.key, _freeze(field.value))
+            for field in entry.fields
+            if field.key in self._name_fields
+        )
+
+    def add_entry(self, entry: Entry):
+        """Add the persons of an entry to the index.
+
+        :param entry: The entry to index.
+        :raises ValueError: If an entry with the same key is already indexed."""
+        if entry.key in self._indexed:
+            raise ValueError(f"An entry with key `{entry.key}` is already indexed.")
+
+        persons = []
+        for field in entry.fields:
+            if field.key not in self._name_fields:
+                continue
+            for position, name in enumerate(_names_of(field.value)):
+                person = person_key(name)
+                if person is None:
+                    continue
+                occurrence = PersonOccurrence(entry.key, field.key, position)
+                self._occurrences.setdefault(person, []).append(occurrence)
+                persons.append((person, field.key))
+        self._indexed[entry.key] = (entry, self._snapshot(entry), persons)
+        self._keys_by_entry_id[id(entry)] = entry.key
+
+    def remove_entry(self, entry: Union[Entry, str]):
+        """Remove the persons of an entry from the index.
+
+        :param entry: The entry (or its key) to remove.
+        :raises KeyError: If no entry with this key is indexed."""
+        key = entry.key if isinstance(entry, Entry) else entry
+        indexed_entry, _, persons = self._indexed.pop(key)
+        del self._keys_by_entry_id[id(indexed_entry)]
+        for person in {person for person, _ in persons}:
+            remaining = [o for o in self._occurrences[person] if o.entry_key != key]
+            if remaining:
+                self._occurrences[person] = remaining
+            else:
+                del self._occurrences[person]
+
+    def update_entry(self, entry: Entry):
+        """Re-index an entry whose name fields (or key) may have changed.
+
+        Entries which are not yet indexed are added.
+
+        :param entry: The entry to re-index."""
+        previous_key = self._keys_by_entry_id.get(id(entry))
+        if previous_key is not None:
+            self.remove_entry(previous_key)
+        if entry.key in self._indexed:
+            self.remove_entry(entry.key)
+        self.add_entry(entry)
+
+    def sync(self):
+        """Bring the index up to date with the library it was created for.
+
+        Only entries which were added, removed, replaced or whose name fields
+        changed since they were indexed are (re-)indexed.
+
+        :raises ValueError: If the index was not created for a library."""
+        if self._library is None:
+            raise ValueError("This index was not created for a library; nothing to sync with.")
+
+        entries = self._library.entries
+        current_keys = {entry.key for entry in entries}
+        for key in [k for k in self._indexed if k not in current_keys]:
+            self.remove_entry(key)
+
+        for entry in entries:
+            indexed = self._indexed.get(entry.key)
+            if indexed is None or indexed[0] is not entry or indexed[1] != self._snapshot(entry):
+                self.update_entry(entry)
+
+    @staticmethod
+    def _key(person: Union[PersonKey, NameParts, str]) -> Optional[PersonKey]:
+        if isinstance(person, PersonKey):
+            return person
+        return person_key(person)
+
+    def occurrences(self, person: Union[PersonKey, NameParts, str]) -> List[PersonOccurrence]:
+        """All places where a person appears.
+
+        :param person: The person, as key, name parts or name string (e.g. "Knuth, D. E.").
+        :returns: The occurrences, in the order in which the entries were indexed."""
+        return list(self._occurrences.get(self._key(person), ()))
+
+    def entries_for(
+        self, person: Union[PersonKey, NameParts, str], fields: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """The keys of all entries in which a person appears.
+
+        :param person: The person, as key, name parts or name string.
+        :param fields: If given, only consider these fields (e.g. ``("author",)``).
+        :returns: The entry keys, without duplicates, in the order in which
+            the entries were indexed."""
+        fields = None if fields is None else set(fields)
+        keys = (
+            o.entry_key
+            for o in self._occurrences.get(self._key(person), ())
+            if fields is None or o.field in fields
+        )
+        return list(dict.fromkeys(keys))
+
+    def coauthors(self, person: Union[PersonKey, NameParts, str], field: str = "author") -> Counter:
+        """The persons appearing together with a person in the same field of an entry.
+
+        :param person: The person, as key, name parts or name string.
+        :param field: The field to consider, e.g. "author" or "editor".
+        :returns: A counter mapping each co-author to the number of shared entries."""
+        person = self._key(person)
+        counter = Counter()
+        for key in self.entries_for(person, fields=(field,)):
+            _, _, persons = self._indexed[key]
+            counter.update({other for other, f in persons if f == field and other != person})
+        return counter
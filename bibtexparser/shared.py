@@ -0,0 +1,430 @@
+"""A read-only, columnar copy of the entries of a library in shared memory.
+
+Processes serving the same (large) library, e.g. the workers of a web server, would each
+hold their own copy of the parsed library. Instead, one process exports the entries
+once with :py:meth:`SharedLibrary.create`, and all processes attach to this single copy
+with :py:meth:`SharedLibrary.attach`, which takes constant time: no entry is copied
+or decoded before it is accessed.
+
+The segment holds a table of all (distinct) strings, UTF-8 encoded, and arrays of ids
+into this table: the key and type of every entry, and the key and value of every field.
+A hash table, stored in the segment as well, maps entry keys to entries.
+
+Example::
+
+    # In the main process
+    shared = SharedLibrary.create(library)  # Keep it open while workers use it
+
+    # In the workers (`name` is e.g. passed as argument, or as environment variable)
+    shared = SharedLibrary.attach(shared.name)
+    shared["Cesar2013"]["title"]
+
+    # In the main process, once all workers are done
+    shared.close()
+    shared.unlink()
+"""
+
+import os
+import struct
+import zlib
+from array import array
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from .library import Library
+from .model import Entry
+from .model import Field
+
+_MAGIC = b"BIBSHM\x00\x00"
+# Increase whenever the layout of the shared memory changes.
+_LAYOUT_VERSION = 1
+# Magic, version, and the number of entries, fields, strings and hash slots.
+_HEADER = struct.Struct("=8sI4x4Q")
+_ALIGNMENT = 8
+
+# Names of the segments created by this process (see `_attach`).
+_created_names: Set[str] = set()
+
+
+class SharedEntry:
+    """A read-only view of an entry of a :py:class:`SharedLibrary`.
+
+    Offers the read-only part of the interface of :py:class:`bibtexparser.model.Entry`.
+    Keys and values are read from the shared memory whenever they are accessed.
+    """
+
+    __slots__ = ("_library", "_index")
+
+    def __init__(self, library: "SharedLibrary", index: int):
+        self._library = library
+        self._index = index
+
+    @property
+    def entry_type(self) -> str:
+        """The type of the entry, e.g. ``article``."""
+        return self._library._cached_string(self._library._entry_types[self._index])
+
+    @property
+    def key(self) -> str:
+        """The key of the entry, e.g. ``Cesar2013``."""
+        return self._library._string(self._library._entry_keys[self._index])
+
+    def _field_range(self) -> range:
+        field_starts = self._library._field_starts
+        return range(field_starts[self._index], field_starts[self._index + 1])
+
+    @property
+    def fields(self) -> List[Field]:
+        """The fields of the entry, as (new) ``Field`` instances."""
+        library = self._library
+        return [
+            Field(
+                library._cached_string(library._field_keys[i]), library._string(library._values[i])
+            )
+            for i in self._field_range()
+        ]
+
+    @property
+    def fields_dict(self) -> Dict[str, Field]:
+        """A dict of fields, with field keys as keys."""
+        return {field.key: field for field in self.fields}
+
+    def _value_id(self, key: str) -> Optional[int]:
+        library = self._library
+        for i in self._field_range():
+            if library._cached_string(library._field_keys[i]) == key:
+                return library._values[i]
+        return None
+
+    def get(self, key: str, default=None) -> Optional[Field]:
+        """Returns the field with the given key, or the default value if it does not exist.
+
+        :param key: The key of the field.
+        :param default: The value to return if the field does not exist."""
+        value_id = self._value_id(key)
+        if value_id is None:
+            return default
+        return Field(key, self._library._string(value_id))
+
+    def __contains__(self, key: str) -> bool:
+        """Dict-mimicking ``in`` operator."""
+        return self._value_id(key) is not None
+
+    def __getitem__(self, key: str) -> str:
+        """Dict-mimicking index, as :py:meth:`bibtexparser.model.Entry.__getitem__`."""
+        if key == "ENTRYTYPE":
+            return self.entry_type
+        if key == "ID":
+            return self.key
+        value_id = self._value_id(key)
+        if value_id is None:
+            raise KeyError(key)
+        return self._library._string(value_id)
+
+    def items(self) -> List[Tuple[str, Any]]:
+        """Dict-mimicking, as :py:meth:`bibtexparser.model.Entry.items`."""
+        return [("ENTRYTYPE", self.entry_type), ("ID", self.key)] + [
+            (f.key, f.value) for f in self.fields
+        ]
+
+    def to_entry(self) -> Entry:
+        """A (modifiable) copy of the entry, as :py:class:`bibtexparser.model.Entry`."""
+        return Entry(self.entry_type, self.key, self.fields)
+
+    def __repr__(self) -> str:
+        return f"SharedEntry(entry_type=`{self.entry_type}`, key=`{self.key}`)"
+
+
+class SharedLibrary:
+    """The entries of a library, in shared memory, readable by all processes of a machine.
+
+    Create instances with :py:meth:`create` or :py:meth:`attach`. Every process must
+    :py:meth:`close` its instance when done (closing invalidates its ``SharedEntry`` views),
+    and the creator must eventually :py:meth:`unlink` the shared memory to free it.
+    Instances may also be used as context managers, which close them on exit.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory):
+        # Use `create` or `attach` rather than calling this directly.
+        self._memory = memory
+        buffer = memory.buf
+        magic, version, num_entries, num_fields, num_strings, num_slots = _HEADER.unpack_from(
+            buffer
+        )
+        if magic != _MAGIC or version != _LAYOUT_VERSION:
+            raise ValueError(
+                f"Shared memory {memory.name!r} does not hold a shared library "
+                f"(of layout version {_LAYOUT_VERSION})."
+            )
+
+        self._views: List[memoryview] = []
+        (
+            self._string_offsets,
+            self._entry_keys,
+            self._entry_types,
+            self._field_starts,
+            self._field_keys,
+            self._values,
+            self._slots,
+            self._blob,
+        ) = (
+            self._view(start, end, typecode)
+            for start, end, typecode in _sections(num_entries, num_fields, num_strings, num_slots)
+        )
+        self._slot_mask = num_slots - 1
+        self._decoded: Dict[int, str] = {}
+
+    def _view(self, start: int, end: int, typecode: str) -> memoryview:
+        view = self._memory.buf[start:end].cast(typecode)
+        self._views.append(view)
+        return view
+
+    @classmethod
+    def create(
+        cls, library: Union[Library, Iterable[Entry]], name: Optional[str] = None
+    ) -> "SharedLibrary":
+        """Export the entries of a library into a new block of shared memory.
+
+        :param library: The library, or the entries to export. Field values must be strings,
+            i.e., middleware splitting values into lists (e.g. of names) must not be used.
+        :param name: Name of the shared memory; by default, a unique name is generated.
+        :return: The shared library. Its :py:attr:`name` allows other processes to attach.
+        :raises ValueError: If two entries have the same key.
+        :raises TypeError: If a field value is not a string."""
+        entries = library.entries if isinstance(library, Library) else library
+        memory = _export(entries, name)
+        _created_names.add(memory.name)
+        try:
+            return cls(memory)
+        except BaseException:
+            memory.close()
+            memory.unlink()
+            raise
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedLibrary":
+        """Attach to a shared library created (in any process) by :py:meth:`create`.
+
+        :param name: The :py:attr:`name` of the shared library.
+        :raises FileNotFoundError: If there is no shared memory with this name.
+        :raises ValueError: If the shared memory does not hold a shared library."""
+        memory = _attach(name)
+        try:
+            return cls(memory)
+        except BaseException:
+            memory.close()
+            raise
+
+    @property
+    def name(self) -> str:
+        """The name of the shared memory, used to :py:meth:`attach` to it."""
+        return self._memory.name
+
+    @property
+    def size(self) -> int:
+        """The size of the shared memory, in bytes."""
+        return self._memory.size
+
+    def close(self):
+        """Detach from the shared memory. Views of entries must not be used afterwards."""
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._memory.close()
+
+    def unlink(self):
+        """Free the shared memory (once all processes closed it). Call once, in any process."""
+        self._memory.unlink()
+        _created_names.discard(self._memory.name)
+
+    def __enter__(self) -> "SharedLibrary":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _string(self, string_id: int) -> str:
+        offsets = self._string_offsets
+        return str(self._blob[offsets[string_id] : offsets[string_id + 1]], "utf-8")
+
+    def _cached_string(self, string_id: int) -> str:
+        # For the few distinct entry types and field keys, decoded once per process.
+        try:
+            return self._decoded[string_id]
+        except KeyError:
+            return self._decoded.setdefault(string_id, self._string(string_id))
+
+    def _find(self, key: str) -> Optional[int]:
+        encoded = key.encode("utf-8")
+        offsets, blob, slots, entry_keys = (
+            self._string_offsets,
+            self._blob,
+            self._slots,
+            self._entry_keys,
+        )
+        slot = zlib.crc32(encoded) & self._slot_mask
+        while slots[slot]:
+            index = slots[slot] - 1
+            key_id = entry_keys[index]
+            if blob[offsets[key_id] : offsets[key_id + 1]] == encoded:
+                return index
+            slot = (slot + 1) & self._slot_mask
+        return None
+
+    def __len__(self) -> int:
+        return len(self._entry_keys)
+
+    def __iter__(self) -> Iterator[SharedEntry]:
+        """The entries, in the order of the exported library."""
+        return (SharedEntry(self, i) for i in range(len(self)))
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) is not None
+
+    def __getitem__(self, key: str) -> SharedEntry:
+        """The entry with the given key.
+
+        :raises KeyError: If there is no entry with this key."""
+        index = self._find(key)
+        if index is None:
+            raise KeyError(key)
+        return SharedEntry(self, index)
+
+    def get(self, key: str, default=None) -> Optional[SharedEntry]:
+        """The entry with the given key, or ``default`` if there is none.
+
+        :param key: The key of the entry.
+        :param default: The value to return if there is no entry with this key."""
+        index = self._find(key)
+        return default if index is None else SharedEntry(self, index)
+
+    def keys(self) -> Iterator[str]:
+        """The keys of the entries, in the order of the exported library."""
+        return (self._string(key_id) for key_id in self._entry_keys)
+
+
+def _sections(
+    num_entries: int, num_fields: int, num_strings: int, num_slots: int
+) -> List[Tuple[int, int, str]]:
+    """Start, end and array typecode of the sections following the header, in order."""
+    lengths = [
+        ("Q", num_strings + 1),  # Offsets of the strings in the blob
+        ("I", num_entries),  # String ids of the entry keys
+        ("I", num_entries),  # String ids of the entry types
+        ("I", num_entries + 1),  # Index of the first field of every entry
+        ("I", num_fields),  # String ids of the field keys
+        ("I", num_fields),  # String ids of the field values
+        ("I", num_slots),  # Hash table of the entry keys: entry index + 1, or 0 if empty
+    ]
+    sections = []
+    position = _HEADER.size
+    for typecode, length in lengths:
+        position += -position % _ALIGNMENT
+        end = position + length * array(typecode).itemsize
+        sections.append((position, end, typecode))
+        position = end
+    sections.append((position, None, "B"))  # The UTF-8 encoded strings
+    return sections
+
+
+def _export(entries: Iterable[Entry], name: Optional[str]) -> shared_memory.SharedMemory:
+    string_ids: Dict[str, int] = {}
+    encoded_strings: List[bytes] = []
+
+    def string_id(string: str) -> int:
+        try:
+            return string_ids[string]
+        except KeyError:
+            encoded_strings.append(string.encode("utf-8"))
+            return string_ids.setdefault(string, len(string_ids))
+
+    entry_keys, entry_types, field_starts = array("I"), array("I"), array("I", [0])
+    field_keys, values = array("I"), array("I")
+    for entry in entries:
+        entry_keys.append(string_id(entry.key))
+        entry_types.append(string_id(entry.entry_type))
+        for field in entry.fields:
+            if not isinstance(field.value, str):
+                raise TypeError(
+                    f"Only string values can be shared, but field {field.key!r} of entry "
+                    f"{entry.key!r} has a value of type {type(field.value).__name__}."
+                )
+            field_keys.append(string_id(field.key))
+            values.append(string_id(field.value))
+        field_starts.append(len(field_keys))
+
+    string_offsets = array("Q", [0])
+    for encoded in encoded_strings:
+        string_offsets.append(string_offsets[-1] + len(encoded))
+    blob = b"".join(encoded_strings)
+    slots = _hash_table(entry_keys, encoded_strings)
+
+    columns = [string_offsets, entry_keys, entry_types, field_starts, field_keys, values, slots]
+    sections = _sections(len(entry_keys), len(field_keys), len(encoded_strings), len(slots))
+    blob_start = sections[-1][0]
+    memory = shared_memory.SharedMemory(name=name, create=True, size=max(blob_start + len(blob), 1))
+    try:
+        buffer = memory.buf
+        _HEADER.pack_into(
+            buffer,
+            0,
+            _MAGIC,
+            _LAYOUT_VERSION,
+            len(entry_keys),
+            len(field_keys),
+            len(encoded_strings),
+            len(slots),
+        )
+        for column, (start, end, _) in zip(columns, sections):
+            buffer[start:end] = column.tobytes()
+        buffer[blob_start : blob_start + len(blob)] = blob
+        del buffer
+    except BaseException:
+        memory.close()
+        memory.unlink()
+        raise
+    return memory
+
+
+def _hash_table(entry_keys: array, encoded_strings: List[bytes]) -> array:
+    """Open addressing hash table (with linear probing) of the entry keys, at most half full.
+
+    Uses crc32 as hash function, which (unlike ``hash``) is the same in all processes."""
+    num_slots = 1
+    while num_slots < 2 * len(entry_keys):
+        num_slots *= 2
+    mask = num_slots - 1
+    slots = array("I", bytes(num_slots * array("I").itemsize))
+    for index, key_id in enumerate(entry_keys):
+        encoded = encoded_strings[key_id]
+        slot = zlib.crc32(encoded) & mask
+        while slots[slot]:
+            if entry_keys[slots[slot] - 1] == key_id:
+                raise ValueError(f"Duplicate entry key {encoded.decode('utf-8')!r}.")
+            slot = (slot + 1) & mask
+        slots[slot] = index + 1
+    return slots
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to existing shared memory, without unlinking it when this process exits.
+
+    Before Python 3.13, the resource tracker of every attaching process unlinks the
+    memory when the process exits, even though the process did not create it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13: no `track` argument
+        pass
+    memory = shared_memory.SharedMemory(name=name)
+    if os.name == "posix" and memory.name not in _created_names:
+        resource_tracker.unregister(memory._name, "shared_memory")
+    return memory
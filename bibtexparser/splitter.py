@@ -1,15 +1,15 @@
 import logging
 import re
+import sys
+from typing import Callable
 from typing import List
 from typing import Optional
 from typing import Set
 from typing import Tuple
-from typing import Union
 
 from .exceptions import BlockAbortedException
-from .exceptions import ParserStateException
-from .exceptions import RegexMismatchException
 from .library import Library
+from .model import Block
 from .model import DuplicateFieldKeyBlock
 from .model import Entry
 from .model import ExplicitComment
@@ -30,463 +30,393 @@ class Splitter:
     (e.g., enclosing such as `{...}` are not removed).
 
     This allows for maximum flexibility in the parsing process,
-    by subsequently applying middleware."""
+    by subsequently applying middleware.
 
-    def __init__(self, bibstr: str):
-        # Add a newline at the beginning to simplify parsing
-        #   (we only allow "@"-block starts after a newline)
-        self.bibstr = f"\n{bibstr}"
+    The string is split by :py:func:`_scan_events`, which also reports the parts
+    of the blocks to :py:func:`bibtexparser.parse_events`; the splitter builds
+    the blocks from these events.
 
-        self._markiter = None
-        self._unaccepted_mark = None
+    :param bibstr: The bibtex string to split.
+    :param start_line: The line number of the first line of `bibstr`,
+        used when `bibstr` is a part of a larger file."""
 
-        # Keep track of line we're currently looking at.
-        #   `-1` compensates for manually added `\n` above
-        self._current_line = -1
+    def __init__(self, bibstr: str, start_line: int = 0):
+        self.bibstr = bibstr
+        self._start_line = start_line
 
-        self._reset_block_status(current_char_index=0)
+    def split(self, library: Optional[Library] = None) -> Library:
+        """Split the bibtex-string into blocks and add them to the library.
 
-    def _reset_block_status(self, current_char_index: int) -> None:
-        self._open_brackets = 0
-        self._is_quote_open = False
-        self._expected_next: Optional[List[str]] = None
+        Args:
+            library: The library to add the blocks to. If None, a new library is created.
+        Returns:
+            The library with the added blocks.
+        """
+        if library is None:
+            library = Library()
+        else:
+            logger.info("Adding blocks to existing library.")
 
-        # By default, we assume that an implicit comment is started
-        #   at the beginning of the file and after each @{...} block.
-        #   We then ignore empty implicit comments.
-        self._implicit_comment_start_line = self._current_line
-        self._implicit_comment_start: Optional[int] = current_char_index
+        builder = _BlockBuilder(library)
+        _scan_events(self.bibstr, builder, start_line=self._start_line, on_raw=builder.on_raw)
+        return library
 
-    def _is_at_line_start(self, pos: int) -> bool:
-        """Check if position is at the start of a line (after optional whitespace).
 
-        This is used to determine whether an @ sign should be treated as a new
-        block start (for error recovery) or as content within a field value.
-        We only want to abort parsing and start a new block if the @ is at the
-        beginning of a line, to avoid false positives with @ signs in content.
-        """
-        # Scan backwards from pos to find either newline or non-whitespace
-        for i in range(pos - 1, -1, -1):
-            char = self.bibstr[i]
-            if char == "\n":
-                return True
-            elif not char.isspace():
-                return False
-        # Start of string counts as line start
-        return True
+class ValueSpan:
+    """A field value within the split text, which is only sliced out when requested.
 
-    def _end_implicit_comment(self, end_char_index) -> Optional[ImplicitComment]:
-        if self._implicit_comment_start is None:
-            return  # No implicit comment started
+    ``str(span)`` is the value as it would be stored in a
+    :py:class:`bibtexparser.model.Field` by the splitter, i.e., stripped but still enclosed.
 
-        comment = self.bibstr[self._implicit_comment_start : end_char_index]
+    :param text: The split text.
+    :param start: The index of the first character of the (not yet stripped) value.
+    :param end: The index after the last character of the (not yet stripped) value."""
 
-        # Clear leading and trailing empty lines,
-        #   and count how many lines were removed, to adapt start_line below
-        leading_empty_lines = 0
-        i = 0
-        for i, char in enumerate(comment):
-            if char == "\n":
-                leading_empty_lines += 1
-            elif not char.isspace():
-                break
+    __slots__ = ("_text", "_start", "_end")
 
-        comment = comment[i:].rstrip()
+    def __init__(self, text: str, start: int, end: int):
+        self._text = text
+        self._start = start
+        self._end = end
 
-        if len(comment) > 0:
-            return ImplicitComment(
-                start_line=self._implicit_comment_start_line + leading_empty_lines,
-                raw=comment,
-                comment=comment,
-            )
-        else:
-            return None
-
-    def _next_mark(self, accept_eof: bool) -> Optional[re.Match]:
-        # Check if there is a mark that was previously not consumed
-        #   and return it if so
-        if self._unaccepted_mark is not None:
-            m = self._unaccepted_mark
-            self._unaccepted_mark = None
-            self._current_char_index = m.start()
-            return m
-
-        # Get next mark from iterator
-        m = next(self._markiter, None)
-        if m is not None:
-            self._current_char_index = m.start()
-            if m.group(0) == "\n":
-                self._current_line += 1
-                return self._next_mark(accept_eof=accept_eof)
-        else:
-            # Reached end of file
-            self._current_char_index = len(self.bibstr)
-            if not accept_eof:
-                raise BlockAbortedException(
-                    abort_reason="Unexpectedly reached end of file.",
-                    end_index=self._current_char_index,
-                )
-        return m
+    def __str__(self) -> str:
+        return self._text[self._start : self._end].strip()
 
-    def _move_to_closed_bracket(self) -> int:
-        """Index of the curly bracket closing a just opened one."""
-        num_additional_brackets = 0
-        while True:
-            m = self._next_mark(accept_eof=False)
-            if m.group(0) == "{":
-                num_additional_brackets += 1
-            elif m.group(0) == "}":
-                if num_additional_brackets == 0:
-                    return m.start()
-                else:
-                    num_additional_brackets -= 1
-            elif m.group(0).startswith("@") and self._is_at_line_start(m.start()):
-                # Only abort if the @ is at the start of a line.
-                # This allows @ signs in field values (e.g., "LeQua @ {CLEF}")
-                # while still providing error recovery when a new block starts
-                # on a new line within an unclosed block.
-                self._unaccepted_mark = m
-                raise BlockAbortedException(
-                    abort_reason=f"Unexpected block start: `{m.group(0)}`. "
-                    f"Was still looking for closing bracket",
-                    end_index=m.start() - 1,
-                )
+    def __repr__(self) -> str:
+        return f"ValueSpan({str(self)!r})"
 
-    def _move_to_comma_or_closing_curly_bracket(
-        self, currently_quote_escaped: bool = False, num_open_curls: int = 0
-    ) -> int:
-        """Index of the end of the field, taking quote-escape into account."""
 
-        if num_open_curls > 0 and currently_quote_escaped:
-            raise ParserStateException(
-                message="Internal error in parser. "
-                "Found a field-value that is both quote-escaped and curly-escaped. "
-                "Please report this bug."
-            )
+# The marks relevant for the structure of a bibtex string. Line breaks are no marks:
+#   line numbers are only computed for the reported positions.
+_STRUCTURE_MARKS = re.compile(r"(?<!\\)[\{\}\",=]|@[\w]*[ \t]*(?={)")
 
-        def _is_escaped():
-            return currently_quote_escaped or num_open_curls > 0
+_END_OF_FILE = "Unexpectedly reached end of file."
 
-        # iterate over marks until we find end of field
-        while True:
-            next_mark = self._next_mark(accept_eof=False)
-
-            # Handle "escape" characters
-            if next_mark.group(0) == '"' and not num_open_curls > 0:
-                # Check for {"} escape sequence when inside quotes (issue #487).
-                # Per https://tug.ctan.org/info/bibtex/tamethebeast/ttb_en.pdf,
-                # {"} represents a literal quote in a quoted field.
-                # We verify this by checking:
-                # 1. We're inside quotes
-                # 2. The " is surrounded by { and }
-                # 3. There's more content after the } (i.e., pos+2 is in bounds)
-                #    This distinguishes {"} escapes from cases like @article{"}
-                #    where " closes the field and } closes the entry.
-                if currently_quote_escaped:
-                    pos = next_mark.start()
-                    if (
-                        pos > 0
-                        and pos + 2 < len(self.bibstr)
-                        and self.bibstr[pos - 1] == "{"
-                        and self.bibstr[pos + 1] == "}"
-                    ):
-                        continue
-                currently_quote_escaped = not currently_quote_escaped
-                continue
-            elif next_mark.group(0) == "{" and not currently_quote_escaped:
-                num_open_curls += 1
-                continue
-            elif next_mark.group(0) == "}" and not currently_quote_escaped and num_open_curls > 0:
-                num_open_curls -= 1
-                continue
-
-            # Check for end of field
-            elif next_mark.group(0) == "," and not _is_escaped():
-                self._unaccepted_mark = next_mark
-                return next_mark.start()
-            # Check for end of entry:
-            elif next_mark.group(0) == "}" and not _is_escaped():
-                self._unaccepted_mark = next_mark
-                return next_mark.start()
-
-            # Sanity-check: If new block is starting at line start, we abort.
-            # We only abort if the @ is at the start of a line to allow @ signs
-            # in field values (e.g., "LeQua @ {CLEF}") while still providing
-            # error recovery when a new block starts on a new line.
-            elif next_mark.group(0).startswith("@") and self._is_at_line_start(next_mark.start()):
-                self._unaccepted_mark = next_mark
-
-                if currently_quote_escaped:
-                    looking_for = '`"`'
-                elif num_open_curls > 0:
-                    looking_for = "`}`"
-                else:
-                    looking_for = "`,` or `}`"
-
-                raise BlockAbortedException(
-                    abort_reason=f"Unexpected block start: `{next_mark.group(0)}`. "
-                    f"Was still looking for field-value closing {looking_for} ",
-                    end_index=next_mark.start() - 1,
-                )
 
-    def _move_to_end_of_entry(self, first_key_start: int) -> Tuple[List[Field], int, Set[str]]:
-        """Move to the end of the entry and return the fields and the end index."""
-        result = []
-        keys = set()
-        duplicate_keys = set()
+class _Aborted(Exception):
+    """A block was aborted; `position` is the start of the last mark read."""
 
-        key_start = first_key_start
-        while True:
-            equals_mark = self._next_mark(accept_eof=False)
-            if equals_mark.group(0) == "}":
-                # End of entry
-                return result, equals_mark.end(), duplicate_keys
-
-            if equals_mark.group(0) != "=":
-                self._unaccepted_mark = equals_mark
-                raise BlockAbortedException(
-                    abort_reason="Expected a `=` after entry key, "
-                    f"but found `{equals_mark.group(0)}`.",
-                    end_index=equals_mark.start(),
-                )
+    def __init__(self, error: BlockAbortedException, position: int):
+        self.error = error
+        self.position = position
 
-            # We follow the convention that the field start line
-            #   is where the `=` between key and value is.
-            start_line = self._current_line
-            key_end = equals_mark.start()
-            value_start = equals_mark.end()
-            value_end = self._move_to_comma_or_closing_curly_bracket(
-                currently_quote_escaped=False, num_open_curls=0
-            )
 
-            key = self.bibstr[key_start:key_end].strip()
-            value = self.bibstr[value_start:value_end].strip()
+def _scan_events(
+    bibstr: str,
+    handler,
+    start_line: int = 0,
+    on_raw: Optional[Callable[[str], None]] = None,
+) -> None:
+    """Split a bibtex string, reporting the parts of its blocks to `handler` as they are read.
 
-            if key in keys:
-                duplicate_keys.add(key)
+    No blocks are created: for every block, the corresponding method of the handler
+    (see :py:class:`bibtexparser.events.ParseHandler`) is called instead.
+    Marks are scanned in a single loop, skipping line breaks;
+    line numbers are computed only where they are reported.
 
-            keys.add(key)
-            result.append(Field(start_line=start_line, key=key, value=value))
+    :param bibstr: The bibtex string to split.
+    :param handler: The handler receiving the events.
+    :param start_line: The line number of the first line of `bibstr`.
+    :param on_raw: If given, called with the text of every block which was read successfully
+        (except implicit comments, whose text is the comment), after the events of the block."""
+    bibstr = f"\n{bibstr}"
+    marks = _STRUCTURE_MARKS.finditer(bibstr)
+    # A mark which was read, but has to be processed again (e.g. the start of the next block)
+    pending = None
 
-            # If next mark is a comma, continue
-            after_field_mark = self._next_mark(accept_eof=False)
-            if after_field_mark.group(0) == ",":
-                key_start = after_field_mark.end()
-            elif after_field_mark.group(0) == "}":
-                # If next mark is a closing bracket, put it back (will return in next loop iteration)
-                self._unaccepted_mark = after_field_mark
-                continue
-            else:
-                self._unaccepted_mark = after_field_mark
-                raise BlockAbortedException(
-                    abort_reason="Expected either a `,` or `}` after a closed entry field value, "
-                    f"but found a {after_field_mark.group(0)} before.",
-                    end_index=after_field_mark.start(),
-                )
+    # Line breaks preceded by a backslash are not counted (as in previous versions of the splitter)
+    counted_position = 0
+    counted_line = start_line - 1
+    has_escaped_line_breaks = "\\\n" in bibstr
 
-    def split(self, library: Optional[Library] = None) -> Library:
-        """Split the bibtex-string into blocks and add them to the library.
+    def line_at(position: int) -> int:
+        nonlocal counted_position, counted_line
+        if position < counted_position:
+            counted_position, counted_line = 0, start_line - 1
+        counted_line += bibstr.count("\n", counted_position, position)
+        if has_escaped_line_breaks:
+            counted_line -= bibstr.count("\\\n", max(counted_position - 1, 0), position)
+        counted_position = position
+        return counted_line
 
-        Args:
-            library: The library to add the blocks to. If None, a new library is created.
-        Returns:
-            The library with the added blocks.
-        """
-        self._markiter = re.finditer(
-            r"(?<!\\)[\{\}\",=\n]|@[\w]*( |\t)*(?={)", self.bibstr, re.MULTILINE
-        )
+    def at_line_start(position: int) -> bool:
+        return not bibstr[bibstr.rfind("\n", 0, position) + 1 : position].strip()
 
-        if library is None:
-            library = Library()
-        else:
-            logger.info("Adding blocks to existing library.")
+    def next_mark() -> re.Match:
+        nonlocal pending
+        if pending is not None:
+            mark, pending = pending, None
+            return mark
+        mark = next(marks, None)
+        if mark is None:
+            raise _Aborted(BlockAbortedException(_END_OF_FILE, len(bibstr)), len(bibstr))
+        return mark
 
+    def move_to_closed_bracket() -> re.Match:
+        nonlocal pending
+        depth = 0
         while True:
-            m = self._next_mark(accept_eof=True)
-            if m is None:
-                break
-
-            m_val = m.group(0).lower()
-
-            if m_val.startswith("@"):
-                # Clean up previous block implicit_comment
-                implicit_comment = self._end_implicit_comment(m.start())
-                if implicit_comment is not None:
-                    library.add(implicit_comment)
-                self._implicit_comment_start = None
-
-                start_line = self._current_line
-                try:
-                    # Start new block parsing
-                    if m_val.startswith("@comment"):
-                        library.add(self._handle_explicit_comment())
-                    elif m_val.startswith("@preamble"):
-                        library.add(self._handle_preamble())
-                    elif m_val.startswith("@string"):
-                        library.add(self._handle_string(m))
-                    else:
-                        library.add(self._handle_entry(m, m_val))
-
-                except BlockAbortedException as e:
-                    logger.warning(
-                        f"Parsing of `{m_val}` block (line {start_line}) "
-                        f"aborted on line {self._current_line} "
-                        f"due to syntactical error in bibtex:\n {e.abort_reason}"
-                    )
-                    logger.info(
-                        "We will try to continue parsing, but this might lead to unexpected results. "
-                        "The failed block will be stored in the `failed_blocks` of the library."
-                    )
-                    library.add(
-                        ParsingFailedBlock(
-                            start_line=start_line,
-                            raw=self.bibstr[m.start() : e.end_index],
-                            error=e,
-                        )
-                    )
-
-                except ParserStateException as e:
-                    # This is a bug in the parser, not in the bibtex. We should not continue.
-                    logger.error(
-                        "python-bibtexparser detected an invalid state. Please report this bug."
-                    )
-                    logger.error(e.message)
-                    raise
-                except Exception:
-                    # For unknown exceptions, we want to fail hard and get the info in our issue tracker.
-                    logger.error(
-                        f"Unexpected exception while parsing `{m_val}` block (line {start_line}). "
-                        "Please report this bug."
-                    )
-                    raise
-
-                self._reset_block_status(current_char_index=self._current_char_index + 1)
-            else:
-                # Part of implicit comment
-                continue
-
-        # Check if there's an implicit comment at the EOF
-        if self._implicit_comment_start is not None:
-            comment = self._end_implicit_comment(len(self.bibstr))
-            if comment is not None:
-                library.add(comment)
+            mark = next_mark()
+            token = mark.group()
+            if token == "{":
+                depth += 1
+            elif token == "}":
+                if depth == 0:
+                    return mark
+                depth -= 1
+            elif token[0] == "@" and at_line_start(mark.start()):
+                pending = mark
+                raise _Aborted(
+                    BlockAbortedException(
+                        f"Unexpected block start: `{token}`. Was still looking for closing bracket",
+                        mark.start() - 1,
+                    ),
+                    mark.start(),
+                )
 
-        return library
+    def value_aborted(mark: re.Match, is_quoted: bool, depth: int) -> _Aborted:
+        nonlocal pending
+        looking_for = '`"`' if is_quoted else "`}`" if depth > 0 else "`,` or `}`"
+        pending = mark
+        return _Aborted(
+            BlockAbortedException(
+                f"Unexpected block start: `{mark.group()}`. "
+                f"Was still looking for field-value closing {looking_for} ",
+                mark.start() - 1,
+            ),
+            mark.start(),
+        )
 
-    def _handle_explicit_comment(self) -> ExplicitComment:
-        """Handle explicit comment block. Return end index"""
-        start_index = self._current_char_index
-        start_line = self._current_line
-        start_bracket_mark = self._next_mark(accept_eof=False)
-        if start_bracket_mark.group(0) != "{":
-            self._unaccepted_mark = start_bracket_mark
-            # Note: The following should never happen, as we check for the "{" in the regex
-            raise RegexMismatchException(
-                first_match="@comment{",
-                expected_match="{",
-                second_match=start_bracket_mark.group(0),
+    def scan_entry(mark: re.Match, block_type: str, line: int) -> int:
+        nonlocal pending
+        separator = next_mark()
+        token = separator.group()
+        if token != "," and token != "}":
+            pending = separator
+            raise _Aborted(
+                BlockAbortedException(
+                    f"Expected comma after entry key, but found {token}", separator.end()
+                ),
+                separator.start(),
             )
-        end_bracket_index = self._move_to_closed_bracket()
-        comment_str = self.bibstr[start_bracket_mark.end() : end_bracket_index].strip()
-        return ExplicitComment(
-            start_line=start_line,
-            comment=comment_str,
-            raw=self.bibstr[start_index : end_bracket_index + 1],
+        handler.on_entry_start(
+            block_type[1:].strip(), bibstr[mark.end() + 1 : separator.start()].strip(), line
         )
+        if token == "}":
+            # An entry without comma after the key, and without fields
+            handler.on_entry_end()
+            return separator.start()
+
+        on_field = handler.on_field
+        key_start = separator.end()
+        # No mark is pending within the entry: marks are read right from the iterator.
+        while True:
+            equals = next(marks, None)
+            if equals is None:
+                break
+            token = equals.group()
+            if token == "}":
+                handler.on_entry_end()
+                return equals.start()
+            if token != "=":
+                pending = equals
+                raise _Aborted(
+                    BlockAbortedException(
+                        f"Expected a `=` after entry key, but found `{token}`.",
+                        equals.start(),
+                    ),
+                    equals.start(),
+                )
+
+            # Move to the end of the value, i.e., to the next `,` or `}` which is not enclosed
+            is_quoted = False
+            depth = 0
+            for end in marks:
+                token = end.group()
+                if token == '"' and depth == 0:
+                    # `{"}` is a literal quote in a quoted value
+                    position = end.start()
+                    if (
+                        is_quoted
+                        and position + 2 < len(bibstr)
+                        and bibstr[position - 1] == "{"
+                        and bibstr[position + 1] == "}"
+                    ):
+                        continue
+                    is_quoted = not is_quoted
+                elif token[0] == "@":
+                    if at_line_start(end.start()):
+                        raise value_aborted(end, is_quoted, depth)
+                elif is_quoted:
+                    continue
+                elif token == "{":
+                    depth += 1
+                elif token == "}" and depth > 0:
+                    depth -= 1
+                elif depth == 0 and (token == "," or token == "}"):
+                    break
+            else:
+                break
 
-    def _handle_entry(self, m, m_val) -> Union[Entry, ParsingFailedBlock]:
-        """Handle entry block. Return end index"""
-        start_line = self._current_line
-        entry_type = m_val[1:].strip()
-        start_bracket_mark = self._next_mark(accept_eof=False)
-        if start_bracket_mark.group(0) != "{":
-            self._unaccepted_mark = start_bracket_mark
-            # Note: The following should never happen, as we check for the "{" in the regex
-            raise ParserStateException(
-                message="matched a regex that should end with `{`, "
-                "e.g. `@article{`, "
-                "but no closing bracket was found."
+            on_field(
+                bibstr[key_start : equals.start()].strip(),
+                ValueSpan(bibstr, equals.end(), end.start()),
+                line_at(equals.start()),
             )
-        comma_mark = self._next_mark(accept_eof=False)
-        if comma_mark.group(0) == "}":
-            # This is an entry without any comma after the key, and with no fields
-            #   Used e.g. by RefTeX (see issue #384)
-            key = self.bibstr[m.end() + 1 : comma_mark.start()].strip()
-            fields, end_index, duplicate_keys = [], comma_mark.end(), []
-        elif comma_mark.group(0) != ",":
-            self._unaccepted_mark = comma_mark
-            raise BlockAbortedException(
-                abort_reason=f"Expected comma after entry key, but found {comma_mark.group(0)}",
-                end_index=comma_mark.end(),
+            if token == "}":
+                handler.on_entry_end()
+                return end.start()
+            key_start = end.end()
+        raise _Aborted(BlockAbortedException(_END_OF_FILE, len(bibstr)), len(bibstr))
+
+    def scan_block(mark: re.Match, block_type: str, line: int) -> int:
+        """Scan a block, returning the start of its last mark."""
+        nonlocal pending
+        # The opening bracket, guaranteed by the regex
+        opening = next_mark()
+        if block_type.startswith("@comment"):
+            closing = move_to_closed_bracket()
+            comment = bibstr[opening.end() : closing.start()].strip()
+            handler.on_comment(comment, line, True)
+        elif block_type.startswith("@preamble"):
+            closing = move_to_closed_bracket()
+            handler.on_preamble(bibstr[opening.end() : closing.start()], line)
+        elif block_type.startswith("@string"):
+            equals = next_mark()
+            if equals.group() != "=":
+                pending = equals
+                raise _Aborted(
+                    BlockAbortedException(
+                        f"Expected equals sign after field key, but found {equals.group()}",
+                        equals.end(),
+                    ),
+                    equals.start(),
+                )
+            closing = move_to_closed_bracket()
+            handler.on_string(
+                bibstr[mark.end() + 1 : equals.start()].strip(),
+                bibstr[equals.end() : closing.start()].strip(),
+                line,
             )
         else:
-            self._open_brackets += 1
-            key = self.bibstr[m.end() + 1 : comma_mark.start()].strip()
-            fields, end_index, duplicate_keys = self._move_to_end_of_entry(comma_mark.end())
-
-        entry = Entry(
-            start_line=start_line,
-            entry_type=entry_type,
-            key=key,
-            fields=fields,
-            raw=self.bibstr[m.start() : end_index],
-        )
+            return scan_entry(mark, block_type, line)
+        return closing.start()
 
-        # If there were duplicate field keys, we return a DuplicateFieldKeyBlock wrapping
-        if len(duplicate_keys) > 0:
-            return DuplicateFieldKeyBlock(duplicate_keys=duplicate_keys, entry=entry)
+    def end_implicit_comment(start: Optional[int], line: int, end: int) -> None:
+        if start is None:
+            return
+        comment = bibstr[start:end]
+        leading_empty_lines = 0
+        i = 0
+        for i, char in enumerate(comment):
+            if char == "\n":
+                leading_empty_lines += 1
+            elif not char.isspace():
+                break
+        comment = comment[i:].rstrip()
+        if comment:
+            handler.on_comment(comment, line + leading_empty_lines, False)
+
+    comment_start: Optional[int] = 0
+    comment_line = start_line - 1
+    while True:
+        if pending is not None:
+            mark, pending = pending, None
         else:
+            mark = next(marks, None)
+            if mark is None:
+                break
+        token = mark.group()
+        if token[0] != "@":
+            # Part of an implicit comment
+            continue
+
+        end_implicit_comment(comment_start, comment_line, mark.start())
+        line = line_at(mark.start())
+        try:
+            last_position = scan_block(mark, token.lower(), line)
+            if on_raw is not None:
+                on_raw(bibstr[mark.start() : last_position + 1])
+        except _Aborted as aborted:
+            handler.on_error(aborted.error, line, bibstr[mark.start() : aborted.error.end_index])
+            last_position = aborted.position
+        comment_start = last_position + 1
+        comment_line = line_at(last_position)
+
+    end_implicit_comment(comment_start, comment_line, len(bibstr))
+
+
+class _BlockBuilder:
+    """Builds the blocks reported by :py:func:`_scan_events`, and adds them to a library."""
+
+    def __init__(self, library: Library):
+        self._library = library
+        # Creates the last block read from its raw text, which is reported after its events
+        self._build: Optional[Callable[[str], Block]] = None
+        self._entry: Optional[Tuple[str, str, int]] = None
+        self._fields: List[Field] = []
+
+    def on_entry_start(self, entry_type: str, key: str, line: int):
+        """Start an entry."""
+        self._entry = (sys.intern(entry_type), key, line)
+        self._fields = []
+
+    def on_field(self, key: str, value: ValueSpan, line: int):
+        """Add a field to the current entry."""
+        # Field keys repeat across entries: interning them saves memory (and pickle size)
+        self._fields.append(Field(start_line=line, key=sys.intern(key), value=str(value)))
+
+    def on_entry_end(self):
+        """End the current entry."""
+        entry_type, key, line = self._entry
+        fields = self._fields
+        keys: Set[str] = set()
+        duplicate_keys = set()
+        for field in fields:
+            if field.key in keys:
+                duplicate_keys.add(field.key)
+            keys.add(field.key)
+
+        def build(raw: str) -> Block:
+            entry = Entry(start_line=line, entry_type=entry_type, key=key, fields=fields, raw=raw)
+            # If there were duplicate field keys, we return a DuplicateFieldKeyBlock wrapping
+            if len(duplicate_keys) > 0:
+                return DuplicateFieldKeyBlock(duplicate_keys=duplicate_keys, entry=entry)
             return entry
 
-    def _handle_string(self, m) -> String:
-        """Handle string block. Return end index"""
-        # Get next mark, which should be an equals sign
-        start_i = self._current_char_index
-        start_line = self._current_line
-        start_bracket_mark = self._next_mark(accept_eof=False)
-        if start_bracket_mark.group(0) != "{":
-            self._unaccepted_mark = start_bracket_mark
-            # Note: The following should never happen, as we check for the "{" in the regex
-            raise ParserStateException(
-                message="matched a string def regex (`@string{`) that "
-                "should end with `{`, but no closing bracket was found."
-            )
-        equals_mark = self._next_mark(accept_eof=False)
-        if equals_mark.group(0) != "=":
-            self._unaccepted_mark = equals_mark
-            raise BlockAbortedException(
-                abort_reason="Expected equals sign after field key,"
-                f" but found {equals_mark.group(0)}",
-                end_index=equals_mark.end(),
-            )
-        key = self.bibstr[m.end() + 1 : equals_mark.start()].strip()
-        value_start = equals_mark.end()
-        end_i = self._move_to_closed_bracket()
-        value = self.bibstr[value_start:end_i].strip()
-        return String(
-            start_line=start_line,
-            key=key,
-            value=value,
-            raw=self.bibstr[start_i : end_i + 1],
-        )
+        self._build = build
 
-    def _handle_preamble(self) -> Preamble:
-        """Handle preamble block. Return end index"""
-        start_i = self._current_char_index
-        start_line = self._current_line
-        start_bracket_mark = self._next_mark(accept_eof=False)
-        if start_bracket_mark.group(0) != "{":
-            self._unaccepted_mark = start_bracket_mark
-            # Note: The following should never happen, as we check for the "{" in the regex
-            raise ParserStateException(
-                message="matched a preamble def regex (`@preamble{`) that "
-                "should end with `{`, but no closing bracket was found."
-            )
+    def on_string(self, key: str, value: str, line: int):
+        """Read a @string definition."""
+        self._build = lambda raw: String(start_line=line, key=key, value=value, raw=raw)
+
+    def on_preamble(self, value: str, line: int):
+        """Read a @preamble."""
+        self._build = lambda raw: Preamble(start_line=line, value=value, raw=raw)
 
-        end_bracket_index = self._move_to_closed_bracket()
-        preamble = self.bibstr[start_bracket_mark.end() : end_bracket_index]
-        return Preamble(
-            start_line=start_line,
-            value=preamble,
-            raw=self.bibstr[start_i : end_bracket_index + 1],
+    def on_comment(self, comment: str, line: int, explicit: bool):
+        """Read a comment; implicit comments are added right away."""
+        if explicit:
+            self._build = lambda raw: ExplicitComment(start_line=line, comment=comment, raw=raw)
+        else:
+            self._library.add(ImplicitComment(start_line=line, raw=comment, comment=comment))
+
+    def on_raw(self, raw: str):
+        """Add the block read last, with its raw text."""
+        self._library.add(self._build(raw))
+        self._build = None
+
+    def on_error(self, error: BlockAbortedException, line: int, raw: str):
+        """Add a failed block."""
+        block_type = raw.split("{", 1)[0].rstrip().lower()
+        end_line = line + raw.count("\n")
+        logger.warning(
+            f"Parsing of `{block_type}` block (line {line}) "
+            f"aborted on line {end_line} "
+            f"due to syntactical error in bibtex:\n {error.abort_reason}"
+        )
+        logger.info(
+            "We will try to continue parsing, but this might lead to unexpected results. "
+            "The failed block will be stored in the `failed_blocks` of the library."
         )
+        self._library.add(ParsingFailedBlock(start_line=line, raw=raw, error=error))
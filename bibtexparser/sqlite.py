@@ -0,0 +1,833 @@
+"""A library stored in a SQLite database, for collections larger than memory.
+
+:py:class:`SqliteLibrary` offers the interface of :py:class:`bibtexparser.Library`,
+but keeps its blocks in a SQLite file: blocks and fields are rows of two tables, indexed
+by entry key, entry type and field value. Blocks are only created (materialized) when
+they are accessed; the most recently used ones are kept in a cache.
+
+Example::
+
+    library = SqliteLibrary("library.sqlite")
+    library.add_bibtex("huge.bib")  # Parses the file in batches
+
+    library.entries_dict["Cesar2013"]["title"]
+    for entry in library.find_entries(entry_type="book", fields={"year": "2013"}):
+        ...
+
+    bibtexparser.write_file("sorted.bib", library, streaming=True)
+    library.close()
+"""
+
+import collections
+import contextlib
+import itertools
+import os
+import pickle
+import sqlite3
+from collections.abc import Mapping
+from collections.abc import Sequence
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+from typing import Union
+
+from .entrypoint import Parser
+from .export import _parse_in_batches
+from .library import Library
+from .middlewares.middleware import BlockMiddleware
+from .middlewares.middleware import Middleware
+from .model import Block
+from .model import Entry
+from .model import ExplicitComment
+from .model import Field
+from .model import ImplicitComment
+from .model import ParsingFailedBlock
+from .model import Preamble
+from .model import String
+from .streaming import iter_blocks
+
+DEFAULT_CACHE_SIZE = 10_000
+
+DEFAULT_BATCH_SIZE = 10_000
+
+# Increase whenever the schema changes.
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    id INTEGER PRIMARY KEY,
+    kind INTEGER NOT NULL,
+    key TEXT,
+    entry_type TEXT,
+    value,
+    start_line INTEGER,
+    raw TEXT,
+    metadata BLOB,
+    unmodified INTEGER,
+    data BLOB
+);
+CREATE TABLE IF NOT EXISTS fields (
+    block_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value,
+    start_line INTEGER,
+    PRIMARY KEY (block_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS blocks_by_key ON blocks (kind, key);
+CREATE INDEX IF NOT EXISTS entries_by_type ON blocks (entry_type) WHERE kind = 0;
+CREATE INDEX IF NOT EXISTS fields_by_value ON fields (key, value);
+"""
+
+_BLOCK_COLUMNS = "id, kind, key, entry_type, value, start_line, raw, metadata, unmodified, data"
+
+# Values of the `kind` column.
+_ENTRY, _STRING, _PREAMBLE, _EXPLICIT_COMMENT, _IMPLICIT_COMMENT, _FAILED, _OTHER = range(7)
+
+_KINDS = (
+    (ParsingFailedBlock, _FAILED),
+    (Entry, _ENTRY),
+    (String, _STRING),
+    (Preamble, _PREAMBLE),
+    (ExplicitComment, _EXPLICIT_COMMENT),
+    (ImplicitComment, _IMPLICIT_COMMENT),
+)
+
+# Number of attributes set by the constructors of the block types stored in columns;
+#   blocks of other types, or with additional attributes, are stored as pickles.
+#   (Whether a block is marked as unmodified is stored in a column of its own.)
+_COLUMN_TYPES = {Entry: 6, String: 5, Preamble: 4, ExplicitComment: 4, ImplicitComment: 4}
+
+# Maximum number of parameters per statement (the lowest limit of supported SQLite versions).
+_MAX_PARAMETERS = 999
+
+
+class SqliteLibrary(Library):
+    """A library keeping its blocks in a SQLite database file.
+
+    The database is created if it does not exist, and the blocks it contains are
+    part of the library. All changes are saved right away, as every call changing the
+    library (e.g. :py:meth:`add`) runs in a transaction of its own.
+
+    The blocks returned by the library are created from the database when accessed.
+    While they are in the cache of recently used blocks, the same instance is returned
+    again, and changes to it are saved when it leaves the cache, or on :py:meth:`flush`
+    (or :py:meth:`close`). Changes to blocks which already left the cache are lost:
+    save them with :py:meth:`replace`. Iterating caches the blocks as they are returned,
+    hence changes made in a loop over the blocks (e.g. ``for entry in library.entries``)
+    are saved even if the cache is smaller than the library. Blocks passed to
+    :py:meth:`add` are stored as copies, i.e., later changes to them are not saved either.
+
+    Where :py:class:`bibtexparser.Library` returns lists, this library returns
+    read-only sequences and mappings, which query the database when used.
+    For middleware, see :py:meth:`apply`; to write a library larger than memory,
+    pass ``streaming=True`` to :py:func:`bibtexparser.write_file`.
+
+    A library (and its blocks) must only be used by one thread at a time.
+    Forked processes (e.g. the workers of :py:class:`bibtexparser.Writer`)
+    open their own connection to the database.
+
+    :param path: Path of the database file.
+    :param blocks: Blocks to add to the library (see :py:meth:`add`).
+    :param cache_size: Maximum number of blocks kept in the cache. With 0, blocks are
+        not cached, hence every access creates a new instance, and changes to blocks
+        are only saved by :py:meth:`replace`.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        blocks: Union[Iterable[Block], Block, None] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        if cache_size < 0:
+            raise ValueError(f"cache_size must be >= 0, got {cache_size}")
+        self._path = os.fspath(path)
+        self._cache_size = cache_size
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        # Row id -> (block, pickle of the block when it was materialized), in order of use.
+        self._cache: "collections.OrderedDict[int, Tuple[Block, bytes]]" = collections.OrderedDict()
+        # id() of the cached blocks -> their row id.
+        self._row_ids: Dict[int, int] = {}
+        self._strings: Optional[Dict[str, String]] = None
+
+        db = self._db
+        version = db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, _SCHEMA_VERSION):
+            raise ValueError(
+                f"Unsupported schema version {version} of {self._path!r} "
+                f"(expected {_SCHEMA_VERSION})."
+            )
+        db.executescript(_SCHEMA)
+        db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        # Rows with ids in [_first_id, _end_id) are the blocks of the library.
+        first_id, last_id = db.execute("SELECT min(id), max(id) FROM blocks").fetchone()
+        self._first_id = first_id if first_id is not None else 0
+        self._end_id = last_id + 1 if last_id is not None else 0
+
+        if blocks is not None:
+            self.add(blocks)
+
+    @property
+    def path(self) -> str:
+        """The path of the database file."""
+        return self._path
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        # Connections must not be used across fork: forked processes open their own.
+        if self._pid != os.getpid():
+            self._connection = sqlite3.connect(self._path, isolation_level=None)
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._pid = os.getpid()
+        return self._connection
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        db = self._db
+        if db.in_transaction:
+            yield db
+            return
+        db.execute("BEGIN")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            self._clear_cache()
+            raise
+        db.execute("COMMIT")
+
+    def flush(self):
+        """Save the changes made to the cached blocks."""
+        with self._transaction():
+            for row_id, (block, snapshot) in self._cache.items():
+                self._save_if_changed(row_id, block, snapshot)
+
+    def close(self):
+        """Save the changes made to the cached blocks, and close the database."""
+        if self._connection is not None and self._pid == os.getpid():
+            self.flush()
+            self._connection.close()
+        self._connection = None
+        self._pid = None
+        self._clear_cache()
+
+    def __enter__(self) -> "SqliteLibrary":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __reduce_ex__(self, protocol):
+        raise TypeError(
+            "A SqliteLibrary can not be pickled or copied; "
+            "open its database file in the other process, or use Library(blocks=library.blocks)."
+        )
+
+    def __copy__(self):
+        return self.__reduce_ex__(None)
+
+    # ---------------------------------------------------------------------------------------
+    # Modifications
+
+    def add(
+        self,
+        blocks: Union[Iterable[Block], Block],
+        fail_on_duplicate_key: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        """Add blocks to library, as :py:meth:`bibtexparser.Library.add`.
+
+        The blocks are inserted in batches, in a single transaction; hence, any iterable of
+        blocks (e.g. :py:func:`bibtexparser.streaming.iter_blocks`) can be added with
+        bounded memory.
+
+        :param blocks: Block or iterable of blocks to add.
+        :param fail_on_duplicate_key:
+            If True, raises ValueError if a block was replaced with a DuplicateKeyBlock.
+        :param batch_size: Number of blocks inserted at once.
+        """
+        if isinstance(blocks, Block):
+            blocks = [blocks]
+        duplicate_keys: List[str] = []
+        with self._transaction():
+            end_id = self._end_id
+            for batch in _batches(blocks, batch_size):
+                end_id = self._insert(batch, self._first_id, end_id, duplicate_keys)
+            self._end_id = end_id
+
+        if fail_on_duplicate_key and len(duplicate_keys) > 0:
+            raise ValueError(
+                f"Duplicate keys found: {duplicate_keys}. "
+                f"Duplicate entries have been added to the library as DuplicateBlockKeyBlock."
+                f"Use `library.failed_blocks` to access them. "
+            )
+
+    def add_bibtex(
+        self,
+        source: Union[str, os.PathLike, TextIO],
+        parser: Optional[Parser] = None,
+        encoding: str = "UTF-8",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        """Parse a bibtex file and add its blocks, with bounded memory.
+
+        The file is split with :py:func:`bibtexparser.streaming.iter_blocks`, and the
+        parse stack is applied to batches of blocks (as in
+        :py:func:`bibtexparser.export.convert`), which are then added to the library.
+
+        :param source: Path of the file, or a file opened in text mode.
+        :param parser: The parser whose parse stack is applied.
+            By default, a parser with the default parse stack.
+        :param encoding: Encoding of the file (ignored if a file object is passed).
+        :param batch_size: Number of blocks parsed and inserted at once.
+        """
+        if parser is None:
+            parser = Parser()
+        blocks = iter_blocks(source, encoding=encoding)
+        self.add(_parse_in_batches(blocks, parser, batch_size), batch_size=batch_size)
+
+    def remove(self, blocks: Union[List[Block], Block]):
+        """Remove blocks from library.
+
+        :param blocks: Block or list of blocks to remove.
+        :raises ValueError: If block is not in library."""
+        if isinstance(blocks, Block):
+            blocks = [blocks]
+        with self._transaction() as db:
+            for block in blocks:
+                row_id = self._row_id(block)
+                if row_id is None:
+                    raise ValueError(f"{block!r} is not in library.")
+                db.execute("DELETE FROM blocks WHERE id = ?", (row_id,))
+                db.execute("DELETE FROM fields WHERE block_id = ?", (row_id,))
+                self._uncache(row_id)
+                if isinstance(block, String):
+                    self._strings = None
+
+    def replace(self, old_block: Block, new_block: Block, fail_on_duplicate_key: bool = True):
+        """Replace a block with another block, at the same position.
+
+        :param old_block: Block to replace.
+        :param new_block: Block to replace with.
+        :param fail_on_duplicate_key: If False, adds a DuplicateKeyBlock if
+                a block with new_block.key (other than old_block) already exists.
+        :raises ValueError: If old_block is not in library or if fail_on_duplicate_key is True
+                and a block with new_block.key (other than old_block) already exists."""
+        with self._transaction():
+            row_id = self._row_id(old_block)
+            if row_id is None:
+                raise ValueError("Block to replace is not in library.")
+            kind = _kind(new_block)
+            if kind in (_ENTRY, _STRING):
+                previous_id = self._find_key(kind, new_block.key, self._first_id)
+                if previous_id is not None and previous_id != row_id:
+                    if fail_on_duplicate_key:
+                        raise ValueError("Duplicate key found.")
+                    previous = self._materialize_ids([previous_id])[0]
+                    new_block = self._cast_to_duplicate(previous, new_block)
+            self._uncache(row_id)
+            self._save(row_id, new_block)
+            if isinstance(old_block, String) or isinstance(new_block, String):
+                self._strings = None
+
+    def apply(self, middleware: Iterable[Middleware], batch_size: int = DEFAULT_BATCH_SIZE):
+        """Apply middleware (e.g. a parse stack) to the library, in place.
+
+        Block middleware (which does not override `transform`) is applied block by block,
+        with bounded memory: the transformed blocks are written to the database as they
+        are created, and replace the library's blocks once all were transformed.
+        Other middleware (e.g. sorting the blocks) considers the whole library at once:
+        it is applied to an in-memory copy of the library, whose transformed blocks then
+        replace the library's blocks.
+
+        Blocks obtained from the library before should not be used afterwards.
+
+        :param middleware: The middleware to apply, in order.
+        :param batch_size: Number of blocks inserted at once.
+        """
+        for m in middleware:
+            self.flush()
+            if isinstance(m, BlockMiddleware) and type(m).transform is BlockMiddleware.transform:
+                blocks = (
+                    transformed
+                    for block in self._iter_blocks(cache=False)
+                    for transformed in m._transform_block_to_list(block, self)
+                )
+            else:
+                blocks = m.transform(Library(blocks=list(self._iter_blocks(cache=False)))).blocks
+            self._rewrite(blocks, batch_size)
+
+    def _rewrite(self, blocks: Iterable[Block], batch_size: int = DEFAULT_BATCH_SIZE):
+        """Replace all blocks of the library by the given ones (which may be read from it)."""
+        with self._transaction() as db:
+            # The new blocks are inserted after the current ones, which stay visible
+            #   (e.g. to middleware creating the new blocks) until all are inserted.
+            first_id = end_id = self._end_id
+            for batch in _batches(blocks, batch_size):
+                end_id = self._insert(batch, first_id, end_id, [])
+            db.execute("DELETE FROM blocks WHERE id < ?", (first_id,))
+            db.execute("DELETE FROM fields WHERE block_id < ?", (first_id,))
+            self._first_id, self._end_id = first_id, end_id
+            self._clear_cache()
+
+    def _insert(
+        self, blocks: List[Block], first_id: int, next_id: int, duplicate_keys: List[str]
+    ) -> int:
+        """Insert blocks with ids from next_id on, replacing blocks with keys of blocks
+        with ids from first_id on by DuplicateBlockKeyBlock. Returns the next free id."""
+        keys = {(_kind(block), block.key) for block in blocks if isinstance(block, (Entry, String))}
+        previous_ids: Dict[Tuple[int, str], int] = {}
+        for kind in (_ENTRY, _STRING):
+            kind_keys = [key for k, key in keys if k == kind]
+            for chunk in _chunks(kind_keys, _MAX_PARAMETERS - 2):
+                previous_ids.update(
+                    ((kind, key), row_id)
+                    for key, row_id in self._db.execute(
+                        f"SELECT key, id FROM blocks WHERE kind = ? AND id >= ? "
+                        f"AND key IN ({', '.join('?' * len(chunk))})",
+                        (kind, first_id, *chunk),
+                    )
+                )
+
+        block_rows, field_rows = [], []
+        added: Dict[Tuple[int, str], Block] = {}
+        for block in blocks:
+            kind = _kind(block)
+            if kind in (_ENTRY, _STRING):
+                if kind == _STRING:
+                    self._strings = None
+                if (kind, block.key) in added or (kind, block.key) in previous_ids:
+                    previous = added.get((kind, block.key))
+                    if previous is None:
+                        previous = self._materialize_ids([previous_ids[kind, block.key]])[0]
+                    block = self._cast_to_duplicate(previous, block)
+                    duplicate_keys.append(block.key)
+                else:
+                    added[kind, block.key] = block
+            block_row, block_field_rows = _rows(next_id, block)
+            block_rows.append(block_row)
+            field_rows.extend(block_field_rows)
+            next_id += 1
+
+        self._db.executemany(
+            f"INSERT INTO blocks ({_BLOCK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            block_rows,
+        )
+        self._db.executemany("INSERT INTO fields VALUES (?, ?, ?, ?, ?)", field_rows)
+        return next_id
+
+    def _save(self, row_id: int, block: Block):
+        block_row, field_rows = _rows(row_id, block)
+        with self._transaction() as db:
+            db.execute(
+                f"REPLACE INTO blocks ({_BLOCK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                block_row,
+            )
+            db.execute("DELETE FROM fields WHERE block_id = ?", (row_id,))
+            db.executemany("INSERT INTO fields VALUES (?, ?, ?, ?, ?)", field_rows)
+
+    def _save_if_changed(self, row_id: int, block: Block, snapshot: bytes):
+        if pickle.dumps(block, protocol=pickle.HIGHEST_PROTOCOL) == snapshot:
+            return
+        # Blocks removed meanwhile (e.g. while being iterated over) are not added again
+        if self._db.execute("SELECT 1 FROM blocks WHERE id = ?", (row_id,)).fetchone():
+            self._save(row_id, block)
+            if isinstance(block, String):
+                self._strings = None
+
+    # ---------------------------------------------------------------------------------------
+    # Cache
+
+    def _cache_block(self, row_id: int, block: Block):
+        self._cache[row_id] = (block, pickle.dumps(block, protocol=pickle.HIGHEST_PROTOCOL))
+        self._row_ids[id(block)] = row_id
+        while len(self._cache) > self._cache_size:
+            evicted_id, (evicted, snapshot) = self._cache.popitem(last=False)
+            del self._row_ids[id(evicted)]
+            self._save_if_changed(evicted_id, evicted, snapshot)
+
+    def _uncache(self, row_id: int):
+        cached = self._cache.pop(row_id, None)
+        if cached is not None:
+            del self._row_ids[id(cached[0])]
+
+    def _clear_cache(self):
+        self._cache.clear()
+        self._row_ids.clear()
+        self._strings = None
+
+    def _row_id(self, block: Block) -> Optional[int]:
+        """The row id of a block of the library, which is equal to the given one."""
+        row_id = self._row_ids.get(id(block))
+        if row_id is not None and self._cache[row_id][0] is block:
+            return row_id
+        # The block is not (or no longer) cached: search for an equal block
+        kind = _kind(block)
+        if kind in (_ENTRY, _STRING):
+            row_id = self._find_key(kind, block.key, self._first_id)
+            candidates = [row_id] if row_id is not None else []
+        else:
+            candidates = [
+                row_id
+                for (row_id,) in self._db.execute(
+                    "SELECT id FROM blocks WHERE kind = ? AND id >= ? AND id < ? ORDER BY id",
+                    (kind, self._first_id, self._end_id),
+                )
+            ]
+        for chunk in _chunks(candidates, DEFAULT_BATCH_SIZE):
+            for row_id, candidate in zip(chunk, self._materialize_ids(chunk)):
+                if candidate == block:
+                    return row_id
+        return None
+
+    def _find_key(self, kind: int, key: str, first_id: int) -> Optional[int]:
+        row = self._db.execute(
+            "SELECT id FROM blocks WHERE kind = ? AND key = ? AND id >= ? ORDER BY id LIMIT 1",
+            (kind, key, first_id),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    # ---------------------------------------------------------------------------------------
+    # Reading
+
+    def _materialize_rows(self, rows: List[tuple], cache: bool = True) -> Iterator[Block]:
+        """The blocks of the rows, cached one by one as they are yielded."""
+        # The cached instances are collected first, as caching the other blocks may evict them.
+        cached = {row[0]: self._cache[row[0]][0] for row in rows if row[0] in self._cache}
+        entry_ids = [row[0] for row in rows if row[1] == _ENTRY and row[0] not in cached]
+        fields: Dict[int, List[Field]] = collections.defaultdict(list)
+        for chunk in _chunks(entry_ids, _MAX_PARAMETERS):
+            for block_id, key, value, start_line in self._db.execute(
+                f"SELECT block_id, key, value, start_line FROM fields "
+                f"WHERE block_id IN ({', '.join('?' * len(chunk))}) ORDER BY block_id, position",
+                chunk,
+            ):
+                fields[block_id].append(Field(key, _load_value(value), start_line))
+
+        for row in rows:
+            row_id = row[0]
+            block = cached.get(row_id)
+            if block is not None and row_id in self._cache:
+                self._cache.move_to_end(row_id)
+            else:
+                if block is None:
+                    block = _block(row, fields.pop(row_id, []))
+                # (Blocks evicted since the start were saved, and are cached again.)
+                if cache and self._cache_size > 0:
+                    self._cache_block(row_id, block)
+            yield block
+
+    def _materialize_ids(self, row_ids: List[int]) -> List[Block]:
+        rows = {
+            row[0]: row
+            for row in self._db.execute(
+                f"SELECT {_BLOCK_COLUMNS} FROM blocks "
+                f"WHERE id IN ({', '.join('?' * len(row_ids))})",
+                row_ids,
+            )
+        }
+        return list(self._materialize_rows([rows[row_id] for row_id in row_ids]))
+
+    def _iter_blocks(
+        self, condition: str = "", parameters: tuple = (), cache: bool = True
+    ) -> Iterator[Block]:
+        """The blocks (matching the condition on the blocks table), in order."""
+        last_id = self._first_id - 1
+        while True:
+            # Checked every batch, as `_end_id` changes if blocks are added meanwhile
+            rows = self._db.execute(
+                f"SELECT {_BLOCK_COLUMNS} FROM blocks WHERE id > ? AND id < ? {condition} "
+                f"ORDER BY id LIMIT ?",
+                (last_id, self._end_id, *parameters, DEFAULT_BATCH_SIZE),
+            ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield from self._materialize_rows(rows, cache=cache)
+
+    def _count(self, condition: str = "", parameters: tuple = ()) -> int:
+        return self._db.execute(
+            f"SELECT count(*) FROM blocks WHERE id >= ? AND id < ? {condition}",
+            (self._first_id, self._end_id, *parameters),
+        ).fetchone()[0]
+
+    def _block_at(self, index: int, condition: str = "", parameters: tuple = ()) -> Block:
+        rows = self._db.execute(
+            f"SELECT {_BLOCK_COLUMNS} FROM blocks WHERE id >= ? AND id < ? {condition} "
+            f"ORDER BY id LIMIT 1 OFFSET ?",
+            (self._first_id, self._end_id, *parameters, index),
+        ).fetchall()
+        if not rows:
+            raise IndexError("block index out of range")
+        return next(self._materialize_rows(rows))
+
+    def find_entries(
+        self, entry_type: Optional[str] = None, fields: Optional[Dict[str, Optional[str]]] = None
+    ) -> Iterator[Entry]:
+        """The entries with the given type and field values, in order, using the indexes.
+
+        :param entry_type: If given, only entries of this type (e.g. ``"article"``).
+        :param fields: If given, only entries having all these fields, with the given
+            (string) values; a value of ``None`` matches any value.
+        """
+        condition, parameters = "AND kind = ?", [_ENTRY]
+        if entry_type is not None:
+            condition += " AND entry_type = ?"
+            parameters.append(entry_type)
+        for key, value in (fields or {}).items():
+            if value is None:
+                condition += " AND id IN (SELECT block_id FROM fields WHERE key = ?)"
+                parameters.append(key)
+            else:
+                condition += " AND id IN (SELECT block_id FROM fields WHERE key = ? AND value = ?)"
+                parameters.extend((key, value))
+        return self._iter_blocks(condition, tuple(parameters))
+
+    @property
+    def blocks(self) -> "_BlockSequence":
+        """All blocks in the library, preserving order of insertion."""
+        return _BlockSequence(self)
+
+    @property
+    def failed_blocks(self) -> "_BlockSequence":
+        """All blocks that could not be parsed, preserving order of insertion."""
+        return _BlockSequence(self, (_FAILED,))
+
+    @property
+    def strings(self) -> List[String]:
+        """All @string blocks in the library, preserving order of insertion."""
+        return list(self.strings_dict.values())
+
+    @property
+    def strings_dict(self) -> Dict[str, String]:
+        """Dict representation of all @string blocks in the library.
+
+        The strings are read once, and kept in memory until they are changed."""
+        if self._strings is None:
+            strings = self._iter_blocks("AND kind = ?", (_STRING,))
+            self._strings = {string.key: string for string in strings}
+        return self._strings
+
+    @property
+    def entries(self) -> "_BlockSequence":
+        """All entry (@article, ...) blocks in the library, preserving order of insertion."""
+        return _BlockSequence(self, (_ENTRY,))
+
+    @property
+    def entries_dict(self) -> "_EntryMapping":
+        """Mapping of the keys of the entries to the entries, using the key index."""
+        return _EntryMapping(self)
+
+    @property
+    def preambles(self) -> "_BlockSequence":
+        """All @preamble blocks in the library, preserving order of insertion."""
+        return _BlockSequence(self, (_PREAMBLE,))
+
+    @property
+    def comments(self) -> "_BlockSequence":
+        """All comment blocks in the library, preserving order of insertion."""
+        return _BlockSequence(self, (_EXPLICIT_COMMENT, _IMPLICIT_COMMENT))
+
+
+class _BlockSequence(Sequence):
+    """The blocks (of some kinds) of a :py:class:`SqliteLibrary`, read when accessed.
+
+    Iterating reads the blocks in batches; indexing skips the preceding blocks,
+    i.e., takes time linear in the index."""
+
+    def __init__(self, library: SqliteLibrary, kinds: Optional[Tuple[int, ...]] = None):
+        self._library = library
+        self._kinds = kinds
+        if kinds is None:
+            self._condition, self._parameters = "", ()
+        else:
+            self._condition = f"AND kind IN ({', '.join('?' * len(kinds))})"
+            self._parameters = kinds
+
+    def __len__(self) -> int:
+        return self._library._count(self._condition, self._parameters)
+
+    def __iter__(self) -> Iterator[Block]:
+        return self._library._iter_blocks(self._condition, self._parameters)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            if stop <= start:
+                return []
+            return list(itertools.islice(self._iter_from(start), stop - start))
+        if index < 0:
+            index += len(self)
+        if index < 0:
+            raise IndexError("block index out of range")
+        return self._library._block_at(index, self._condition, self._parameters)
+
+    def _iter_from(self, start: int) -> Iterator[Block]:
+        if start == 0:
+            return iter(self)
+        first = self[start]
+        row_id = self._library._row_ids.get(id(first))
+        if row_id is None:
+            # Not cached (cache_size=0): locate the block by its position again
+            row_id = self._library._db.execute(
+                f"SELECT id FROM blocks WHERE id >= ? AND id < ? {self._condition} "
+                f"ORDER BY id LIMIT 1 OFFSET ?",
+                (self._library._first_id, self._library._end_id, *self._parameters, start),
+            ).fetchone()[0]
+        rest = self._library._iter_blocks(
+            f"AND id > ? {self._condition}", (row_id,) + tuple(self._parameters)
+        )
+        return itertools.chain([first], rest)
+
+    def __setitem__(self, index, blocks: Iterable[Block]):
+        # Supports `library.blocks[:] = blocks` (as done by middleware reordering blocks)
+        if self._kinds is not None or index != slice(None):
+            raise TypeError("Only all blocks of a SqliteLibrary can be assigned at once.")
+        self._library._rewrite(list(blocks))
+
+    def __repr__(self) -> str:
+        return f"<{len(self)} blocks of {self._library.path!r}>"
+
+
+class _EntryMapping(Mapping):
+    """The entries of a :py:class:`SqliteLibrary` by key, looked up in the key index."""
+
+    def __init__(self, library: SqliteLibrary):
+        self._library = library
+
+    def __getitem__(self, key: str) -> Entry:
+        library = self._library
+        row_id = library._find_key(_ENTRY, key, library._first_id)
+        if row_id is None or row_id >= library._end_id:
+            raise KeyError(key)
+        return library._materialize_ids([row_id])[0]
+
+    def __contains__(self, key: object) -> bool:
+        library = self._library
+        row_id = library._find_key(_ENTRY, key, library._first_id)
+        return row_id is not None and row_id < library._end_id
+
+    def __iter__(self) -> Iterator[str]:
+        library = self._library
+        last_id = library._first_id - 1
+        while True:
+            rows = library._db.execute(
+                "SELECT id, key FROM blocks WHERE id > ? AND id < ? AND kind = ? "
+                "ORDER BY id LIMIT ?",
+                (last_id, library._end_id, _ENTRY, DEFAULT_BATCH_SIZE),
+            ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield from (key for _, key in rows)
+
+    def __len__(self) -> int:
+        return self._library._count("AND kind = ?", (_ENTRY,))
+
+
+def _kind(block: Block) -> int:
+    for block_type, kind in _KINDS:
+        if isinstance(block, block_type):
+            return kind
+    return _OTHER
+
+
+def _is_stored_in_columns(block: Block) -> bool:
+    num_attributes = len(block.__dict__)
+    if block._is_marked():
+        # Blocks modified since they were marked keep their recorded state in the pickle
+        if not block.is_unmodified():
+            return False
+        num_attributes -= 1
+    if _COLUMN_TYPES.get(type(block)) != num_attributes:
+        return False
+    if isinstance(block, Entry):
+        return type(block.fields) is list and all(
+            type(field) is Field and len(field.__dict__) == 3 for field in block.fields
+        )
+    return True
+
+
+def _dump_value(value: Any) -> Any:
+    """Strings are stored as text (and can be queried), other values as pickles."""
+    return value if type(value) is str else pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load_value(value: Any) -> Any:
+    return pickle.loads(value) if isinstance(value, bytes) else value
+
+
+def _rows(row_id: int, block: Block) -> Tuple[tuple, List[tuple]]:
+    """The row of the block in the blocks table, and its rows in the fields table."""
+    kind = _kind(block)
+    key = block.key if kind in (_ENTRY, _STRING) else None
+    entry_type = block.entry_type if kind == _ENTRY else None
+    field_rows = []
+    if kind == _ENTRY:
+        field_rows = [
+            (row_id, position, field.key, _dump_value(field.value), field.start_line)
+            for position, field in enumerate(block.fields)
+        ]
+
+    if not _is_stored_in_columns(block):
+        data = pickle.dumps(block, protocol=pickle.HIGHEST_PROTOCOL)
+        return (row_id, kind, key, entry_type, None, None, None, None, None, data), field_rows
+
+    if kind in (_STRING, _PREAMBLE):
+        value = _dump_value(block.value)
+    elif kind in (_EXPLICIT_COMMENT, _IMPLICIT_COMMENT):
+        value = block.comment
+    else:
+        value = None
+    metadata = block.parser_metadata
+    metadata = pickle.dumps(metadata, protocol=pickle.HIGHEST_PROTOCOL) if metadata else None
+    unmodified = 1 if block._is_marked() else None
+    row = (row_id, kind, key, entry_type, value, block.start_line, block.raw, metadata)
+    return (*row, unmodified, None), field_rows
+
+
+def _block(row: tuple, fields: List[Field]) -> Block:
+    """Create the block stored in a row of the blocks table (and its fields)."""
+    _, kind, key, entry_type, value, start_line, raw, metadata, unmodified, data = row
+    if data is not None:
+        return pickle.loads(data)
+    if kind == _ENTRY:
+        block = Entry(entry_type, key, fields, start_line, raw)
+    elif kind == _STRING:
+        block = String(key, _load_value(value), start_line, raw)
+    elif kind == _PREAMBLE:
+        block = Preamble(_load_value(value), start_line, raw)
+    elif kind == _EXPLICIT_COMMENT:
+        block = ExplicitComment(value, start_line, raw)
+    else:
+        block = ImplicitComment(value, start_line, raw)
+    if metadata is not None:
+        block.parser_metadata.update(pickle.loads(metadata))
+    if unmodified:
+        block.mark_unmodified()
+    return block
+
+
+def _batches(blocks: Iterable[Block], batch_size: int) -> Iterator[List[Block]]:
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive.")
+    blocks = iter(blocks)
+    while True:
+        batch = list(itertools.islice(blocks, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
@@ -0,0 +1,316 @@
+"""Processing of bibtex files which are too large to be held in memory at once."""
+
+import contextlib
+import heapq
+import os
+import pickle
+import re
+import tempfile
+from typing import IO
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Literal
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from .middlewares.sorting_blocks import DEFAULT_BLOCK_TYPE_ORDER
+from .middlewares.sorting_blocks import SortBlocksByTypeAndKeyMiddleware
+from .middlewares.sorting_blocks import _iter_block_junks
+from .model import Block
+from .model import DuplicateBlockKeyBlock
+from .model import Entry
+from .model import String
+from .splitter import Splitter
+
+# Number of characters read from a file at once.
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Number of blocks held in memory by `sort_blocks` before they are spilled to a temporary file.
+DEFAULT_MAX_BLOCKS_IN_MEMORY = 100_000
+
+# A line starting with a block (e.g. `@article{`). The splitter never continues a block
+#   past such a line, hence the text can safely be cut right before it.
+_LINE_START_BLOCK = re.compile(r"\n(?=[ \t]*@[\w]*[ \t]*\{)")
+
+
+def _iter_chunks(file: TextIO, chunk_size: int) -> Iterator[Tuple[str, int]]:
+    """Read a file in chunks which end right before a block starting on a new line.
+
+    :returns: Pairs of chunk and the line number of its first line."""
+    buffer = ""
+    start_line = 0
+    while True:
+        data = file.read(chunk_size)
+        if not data:
+            if buffer:
+                yield buffer, start_line
+            return
+
+        buffer += data
+        last_boundary = None
+        # A cut at position 0 would not make any progress.
+        for last_boundary in _LINE_START_BLOCK.finditer(buffer, 1):
+            pass
+        if last_boundary is None:
+            # No block started yet: the current block is larger than a chunk.
+            continue
+
+        chunk, buffer = buffer[: last_boundary.start()], buffer[last_boundary.start() :]
+        yield chunk, start_line
+        start_line += chunk.count("\n")
+
+
+def iter_blocks(
+    source: Union[str, os.PathLike, TextIO],
+    encoding: str = "UTF-8",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Block]:
+    """Split a bibtex file into blocks, without reading the whole file into memory.
+
+    The file is read in chunks of about `chunk_size` characters, which are split
+    independently (a chunk only grows beyond `chunk_size` if a single block is larger).
+    The blocks are the same as the ones of :py:func:`bibtexparser.parse_file`
+    with an empty parse stack, with the following exceptions:
+
+    - Duplicate keys are only detected within a chunk, not across chunks.
+    - A block which is not closed before a line starting with a new block
+      fails (as :py:class:`bibtexparser.model.ParsingFailedBlock`) with
+      "end of file" as abort reason.
+
+    No middleware is applied; use a :py:class:`bibtexparser.Parser`
+    on smaller libraries of these blocks if needed.
+
+    :param source: Path of the file, or a file opened in text mode.
+    :param encoding: Encoding of the file (ignored if a file object is passed).
+    :param chunk_size: Number of characters read at once.
+    :returns: The blocks, in the order of the file."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive.")
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding=encoding) as file:
+            yield from iter_blocks(file, chunk_size=chunk_size)
+        return
+
+    for chunk, start_line in _iter_chunks(source, chunk_size):
+        yield from Splitter(chunk, start_line=start_line).split().blocks
+
+
+# A sortable record of a block junk: sort key (type rank, key),
+#   sequence number (unique, to keep the sort stable and never compare blocks), and the blocks.
+_Record = Tuple[int, Any, int, list]
+
+
+def _spill(records: list, temp_dir: Optional[str], stack: contextlib.ExitStack) -> IO[bytes]:
+    """Write sorted records to a temporary file, which is deleted once `stack` is closed."""
+    file = stack.enter_context(tempfile.TemporaryFile(dir=temp_dir))
+    for record in records:
+        # One pickle per record, such that the file can be read back one record at a time.
+        pickle.dump(record, file, protocol=pickle.HIGHEST_PROTOCOL)
+    file.seek(0)
+    return file
+
+
+def _read_run(file: IO[bytes]) -> Iterator[_Record]:
+    """Read back the records of a temporary file written by :py:func:`_spill`."""
+    while True:
+        try:
+            yield pickle.load(file)
+        except EOFError:
+            return
+
+
+def sort_blocks(
+    blocks: Iterable[Block],
+    block_type_order: Tuple[Type[Block], ...] = DEFAULT_BLOCK_TYPE_ORDER,
+    preserve_comments_on_top: bool = True,
+    key: Optional[Callable[[Block], Any]] = None,
+    max_blocks_in_memory: int = DEFAULT_MAX_BLOCKS_IN_MEMORY,
+    temp_dir: Optional[str] = None,
+) -> Iterator[Block]:
+    """Sort a stream of blocks with bounded memory (external merge sort).
+
+    The order is the same as the one of
+    :py:class:`bibtexparser.middlewares.SortBlocksByTypeAndKeyMiddleware`
+    with the same arguments. Blocks are collected in runs of about `max_blocks_in_memory`
+    blocks, which are sorted and spilled to temporary files. The runs are then merged.
+    Hence, only about `max_blocks_in_memory` blocks are held in memory at any time
+    (plus one block per run during the merge).
+
+    Typically used with :py:func:`iter_blocks`, e.g.::
+
+        for block in sort_blocks(iter_blocks("huge.bib")):
+            ...
+
+    :param blocks: The blocks to sort.
+    :param block_type_order: See `SortBlocksByTypeAndKeyMiddleware`.
+    :param preserve_comments_on_top: See `SortBlocksByTypeAndKeyMiddleware`.
+    :param key: See `SortBlocksByTypeAndKeyMiddleware`. Keys must be picklable.
+    :param max_blocks_in_memory: Maximum number of blocks in a run.
+    :param temp_dir: Directory for the temporary files (default: system temp directory).
+    :returns: The sorted blocks.
+    """
+    if max_blocks_in_memory < 1:
+        raise ValueError("max_blocks_in_memory must be positive.")
+    sorter = SortBlocksByTypeAndKeyMiddleware(
+        block_type_order=block_type_order,
+        preserve_comments_on_top=preserve_comments_on_top,
+        key=key,
+    )
+    if preserve_comments_on_top:
+        junks = _iter_block_junks(blocks)
+    else:
+        junks = ([block] for block in blocks)
+
+    with contextlib.ExitStack() as stack:
+        runs = []
+        records = []
+        blocks_in_memory = 0
+        for sequence_number, junk in enumerate(junks):
+            records.append((*sorter._sort_key(junk[-1]), sequence_number, junk))
+            blocks_in_memory += len(junk)
+            if blocks_in_memory >= max_blocks_in_memory:
+                records.sort()
+                runs.append(_read_run(_spill(records, temp_dir, stack)))
+                records = []
+                blocks_in_memory = 0
+
+        records.sort()
+        # The last run does not need to be spilled.
+        runs.append(iter(records))
+        for record in heapq.merge(*runs) if len(runs) > 1 else records:
+            yield from record[3]
+
+
+def _sorted_records(
+    source_index: int,
+    blocks: Iterable[Block],
+    sorter: SortBlocksByTypeAndKeyMiddleware,
+    preserve_comments_on_top: bool,
+) -> Iterator[tuple]:
+    """Records (sort key, source index, sequence number, junk) of a sorted source.
+
+    :raises ValueError: If the source is not sorted."""
+    junks = _iter_block_junks(blocks) if preserve_comments_on_top else ([b] for b in blocks)
+    previous_sort_key = None
+    for sequence_number, junk in enumerate(junks):
+        sort_key = sorter._sort_key(junk[-1])
+        if previous_sort_key is not None and sort_key < previous_sort_key:
+            raise ValueError(
+                f"Input {source_index} is not sorted: block `{getattr(junk[-1], 'key', '')}` "
+                f"(line {junk[-1].start_line}) is out of order."
+            )
+        previous_sort_key = sort_key
+        yield (*sort_key, source_index, sequence_number, junk)
+
+
+def _duplicate_key(block: Block) -> Optional[Tuple[bool, str]]:
+    """The key under which a block may be a duplicate of another (entries and strings only)."""
+    if isinstance(block, Entry):
+        return True, block.key
+    if isinstance(block, String):
+        return False, block.key
+    return None
+
+
+def _resolve_duplicates(junks: list, on_duplicate: str) -> Iterator[Block]:
+    """Apply the duplicate policy to junks whose main blocks have the same key."""
+    if on_duplicate == "first":
+        yield from junks[0]
+    elif on_duplicate == "last":
+        yield from junks[-1]
+    else:
+        yield from junks[0]
+        previous = junks[0][-1]
+        for junk in junks[1:]:
+            duplicate = junk[-1]
+            yield from junk[:-1]
+            yield DuplicateBlockKeyBlock(
+                start_line=duplicate.start_line,
+                raw=duplicate.raw,
+                key=duplicate.key,
+                previous_block=previous,
+                duplicate_block=duplicate,
+            )
+
+
+def merge_sorted(
+    sources: Iterable[Union[str, os.PathLike, Iterable[Block]]],
+    block_type_order: Tuple[Type[Block], ...] = DEFAULT_BLOCK_TYPE_ORDER,
+    preserve_comments_on_top: bool = True,
+    key: Optional[Callable[[Block], Any]] = None,
+    on_duplicate: Literal["first", "last", "fail"] = "fail",
+    encoding: str = "UTF-8",
+) -> Iterator[Block]:
+    """Merge already sorted bibtex files (or streams of blocks) into one sorted stream.
+
+    The sources must be sorted as by
+    :py:class:`bibtexparser.middlewares.SortBlocksByTypeAndKeyMiddleware`
+    (or :py:func:`sort_blocks`) with the same arguments. They are merged in a single
+    streaming pass, holding only one block (with the comments above it) per source
+    in memory. If sort keys are equal, blocks of earlier sources come first.
+
+    Entries (and strings) with the same key are duplicates. They are adjacent
+    in the merged stream as long as the sort key of the blocks is their key
+    (the default), or blocks with the same key have the same custom sort key.
+    Duplicates are resolved according to `on_duplicate`:
+
+    - ``"first"``: keep the block of the earliest source, drop the others.
+    - ``"last"``: keep the block of the latest source, drop the others.
+    - ``"fail"``: keep all blocks, but replace all except the first by a
+      :py:class:`bibtexparser.model.DuplicateBlockKeyBlock`, as a Library would.
+
+    Dropped blocks are dropped together with the comments above them.
+
+    :param sources: Paths of sorted bibtex files, or sorted iterables of blocks
+        (e.g. from :py:func:`iter_blocks`).
+    :param block_type_order: See `SortBlocksByTypeAndKeyMiddleware`.
+    :param preserve_comments_on_top: See `SortBlocksByTypeAndKeyMiddleware`.
+    :param key: See `SortBlocksByTypeAndKeyMiddleware`.
+    :param on_duplicate: The policy for duplicate keys.
+    :param encoding: Encoding of the files passed as paths.
+    :returns: The merged blocks.
+    :raises ValueError: If a source turns out not to be sorted.
+    """
+    if on_duplicate not in ("first", "last", "fail"):
+        raise ValueError(f"on_duplicate must be 'first', 'last' or 'fail', not '{on_duplicate}'.")
+    sorter = SortBlocksByTypeAndKeyMiddleware(
+        block_type_order=block_type_order,
+        preserve_comments_on_top=preserve_comments_on_top,
+        key=key,
+    )
+    record_streams = [
+        _sorted_records(
+            source_index,
+            (
+                iter_blocks(source, encoding=encoding)
+                if isinstance(source, (str, os.PathLike))
+                else source
+            ),
+            sorter,
+            preserve_comments_on_top,
+        )
+        for source_index, source in enumerate(sources)
+    ]
+
+    # Junks whose main blocks have the same (duplicate) key.
+    group = []
+    group_key = None
+    for record in heapq.merge(*record_streams):
+        junk = record[-1]
+        duplicate_key = _duplicate_key(junk[-1])
+        if group and duplicate_key is not None and duplicate_key == group_key:
+            group.append(junk)
+            continue
+
+        if group:
+            yield from _resolve_duplicates(group, on_duplicate)
+        group = [junk]
+        group_key = duplicate_key
+
+    if group:
+        yield from _resolve_duplicates(group, on_duplicate)
@@ -1,12 +1,21 @@
-from copy import deepcopy
+import multiprocessing
+import threading
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Tuple
 from typing import Union
 
 from .library import Library
+from .middlewares.enclosing import AddEnclosingMiddleware
+from .model import Block
 from .model import Entry
 from .model import ExplicitComment
-from .model import Field
 from .model import ImplicitComment
 from .model import ParsingFailedBlock
 from .model import Preamble
@@ -16,112 +25,283 @@ VAL_SEP = " = "
 PARSING_FAILED_COMMENT = "% WARNING Parsing failed for the following {n} lines."
 
 
-def _treat_entry(block: Entry, bibtex_format) -> List[str]:
-    res = ["@", block.entry_type, "{", block.key, ",\n"]
-    field: Field
-    for i, field in enumerate(block.fields):
-        res.append(bibtex_format.indent)
-        res.append(field.key)
-        res.append(_val_intent_string(bibtex_format, field.key))
-        res.append(VAL_SEP)
-        res.append(field.value)
-        if bibtex_format.trailing_comma or i < len(block.fields) - 1:
-            res.append(",")
-        res.append("\n")
-    res.append("}\n")
-    return res
-
-
-def _val_intent_string(bibtex_format: "BibtexFormat", key: str) -> str:
-    """The spaces which have to be added after the ` = `."""
-    length = bibtex_format.value_column - len(key) - len(VAL_SEP)
-    return "" if length <= 0 else " " * length
-
-
-def _treat_string(block: String, bibtex_format) -> List[str]:
-    return [
-        "@string{",
-        block.key,
-        VAL_SEP,
-        block.value,
-        "}\n",
-    ]
-
-
-def _treat_preamble(block: Preamble, bibtex_format: "BibtexFormat") -> List[str]:
-    return [f"@preamble{{{block.value}}}\n"]
-
-
-def _treat_impl_comment(block: ImplicitComment, bibtex_format: "BibtexFormat") -> List[str]:
-    # Note: No explicit escaping is done here - that should be done in middleware
-    return [block.comment, "\n"]
-
-
-def _treat_expl_comment(block: ExplicitComment, bibtex_format: "BibtexFormat") -> List[str]:
-    return ["@comment{", block.comment, "}\n"]
-
-
-def _treat_failed_block(block: ParsingFailedBlock, bibtex_format: "BibtexFormat") -> List[str]:
-    lines = len(block.raw.splitlines())
-    parsing_failed_comment = PARSING_FAILED_COMMENT.format(n=lines)
-    return [parsing_failed_comment, "\n", block.raw, "\n"]
-
+class _Renderer:
+    """Renders blocks according to a :py:class:`BibtexFormat`.
+
+    Everything which does not depend on the rendered block is computed once,
+    when the renderer is created: the separators and, lazily for every field key,
+    the text preceding its values (indent, key, alignment padding and ` = `).
+
+    :param bibtex_format: The format to render the blocks in.
+    :param value_column: The value column to use, which (in contrast to the
+        format's one) cannot be "auto".
+    :param enclosing: If given, the enclosing of this middleware is added to the values of
+        entries and strings while they are rendered."""
+
+    def __init__(
+        self,
+        bibtex_format: "BibtexFormat",
+        value_column: int,
+        enclosing: Optional[AddEnclosingMiddleware] = None,
+    ):
+        self.block_separator = bibtex_format.block_separator
+        self._indent = bibtex_format.indent
+        self._value_column = value_column
+        self._entry_end = ",\n}\n" if bibtex_format.trailing_comma else "\n}\n"
+        self._enclosing = enclosing
+        self._field_prefixes: Dict[str, str] = dict()
+        self._renderers_by_type: Dict[type, Callable[[Any], str]] = {
+            Entry: self._render_entry,
+            String: self._render_string,
+            Preamble: self._render_preamble,
+            ExplicitComment: self._render_expl_comment,
+            ImplicitComment: self._render_impl_comment,
+        }
+
+    def render(self, block: Block) -> str:
+        """Render a block, returning its string representation."""
+        render = self._renderers_by_type.get(type(block))
+        if render is not None:
+            return render(block)
+        # Subclasses of the block types, and failed blocks
+        for block_type, render in self._renderers_by_type.items():
+            if isinstance(block, block_type):
+                self._renderers_by_type[type(block)] = render
+                return render(block)
+        if isinstance(block, ParsingFailedBlock):
+            return self._render_failed_block(block)
+        raise ValueError(f"Unknown block type: {type(block)}")
 
-def _calculate_auto_value_align(library: Library) -> int:
+    def _field_prefix(self, key: str) -> str:
+        """The text preceding the value of a field with the given key."""
+        # The spaces which have to be added before the ` = `
+        padding = " " * (self._value_column - len(key) - len(VAL_SEP))
+        prefix = self._field_prefixes[key] = self._indent + key + padding + VAL_SEP
+        return prefix
+
+    def _render_entry(self, block: Entry) -> str:
+        fields = block.fields
+        if not fields:
+            return f"@{block.entry_type}{{{block.key},\n}}\n"
+        if self._enclosing is not None:
+            values = self._enclosing.enclosed_field_values(block)
+        else:
+            values = [field.value for field in fields]
+        prefixes = self._field_prefixes
+        body = ",\n".join(
+            [
+                (prefixes.get(field.key) or self._field_prefix(field.key)) + value
+                for field, value in zip(fields, values)
+            ]
+        )
+        return f"@{block.entry_type}{{{block.key},\n{body}{self._entry_end}"
+
+    def _render_string(self, block: String) -> str:
+        if self._enclosing is None:
+            value = block.value
+        else:
+            value = self._enclosing.enclosed_string_value(block)
+        return "@string{" + block.key + VAL_SEP + value + "}\n"
+
+    def _render_preamble(self, block: Preamble) -> str:
+        return f"@preamble{{{block.value}}}\n"
+
+    def _render_impl_comment(self, block: ImplicitComment) -> str:
+        # Note: No explicit escaping is done here - that should be done in middleware
+        return block.comment + "\n"
+
+    def _render_expl_comment(self, block: ExplicitComment) -> str:
+        return "@comment{" + block.comment + "}\n"
+
+    def _render_failed_block(self, block: ParsingFailedBlock) -> str:
+        lines = len(block.raw.splitlines())
+        parsing_failed_comment = PARSING_FAILED_COMMENT.format(n=lines)
+        return parsing_failed_comment + "\n" + block.raw + "\n"
+
+
+def _calculate_auto_value_align(blocks: Iterable[Block]) -> int:
     max_key_len = 0
-    for entry in library.entries:
-        for key in entry.fields_dict:
-            max_key_len = max(max_key_len, len(key))
+    for block in blocks:
+        if isinstance(block, Entry) and block.fields:
+            max_key_len = max(max_key_len, max([len(field.key) for field in block.fields]))
     return max_key_len + len(VAL_SEP)
 
 
-def write(library: Library, bibtex_format: Optional["BibtexFormat"] = None) -> str:
+def write(
+    library: Library,
+    bibtex_format: Optional["BibtexFormat"] = None,
+    workers: int = 1,
+    enclosing: Optional[AddEnclosingMiddleware] = None,
+) -> str:
     """Serialize a BibTeX database to a string.
 
     Note: This is not the exposed writing entrypoint.
     The exposed entrypoint is `bibtexparser.write_string` (in entrypoint.py).
 
     :param library: BibTeX database to serialize.
-    :param bibtex_format: Customized BibTeX format to use (optional)."""
+    :param bibtex_format: Customized BibTeX format to use (optional).
+    :param workers: Number of processes formatting the blocks (see :py:func:`write_iter`).
+    :param enclosing: Enclosing to add to values while rendering (see :py:func:`write_iter`)."""
+    return "".join(
+        write_iter(library, bibtex_format=bibtex_format, workers=workers, enclosing=enclosing)
+    )
+
+
+def write_iter(
+    blocks: Union[Library, Iterable[Block]],
+    bibtex_format: Optional["BibtexFormat"] = None,
+    raw_passthrough: bool = False,
+    workers: int = 1,
+    enclosing: Optional[AddEnclosingMiddleware] = None,
+) -> Iterator[str]:
+    """Serialize BibTeX blocks incrementally, one block at a time.
+
+    Concatenating the returned strings gives the output of :py:func:`write`,
+    but they are only created when requested (e.g. to be written to a file,
+    or sent in a streaming response), such that the memory used is bounded by
+    the largest block instead of the whole library.
+
+    Note: This is not the exposed writing entrypoint (which would also apply the
+    unparse stack). The exposed entrypoint is `bibtexparser.Writer.write_iter`.
+
+    :param blocks: BibTeX database (or any iterable of blocks) to serialize.
+    :param bibtex_format: Customized BibTeX format to use (optional).
+        A `value_column` of "auto" requires all blocks to be known before the first
+        one is written; hence, blocks which are not passed as library or sequence
+        are then collected in a list first.
+    :param raw_passthrough: If true, the `raw` string of blocks which were not modified
+        since they were parsed (see :py:meth:`bibtexparser.model.Block.is_unmodified`)
+        is written as is, instead of rendering the block according to `bibtex_format`.
+    :param workers: If larger than one, contiguous chunks of blocks are formatted
+        in this many worker processes, and the strings returned are the chunks (in order).
+        The processes are forked, such that the blocks are not copied to the workers;
+        where forking is not available (e.g. on Windows), blocks are formatted in
+        the current process. As starting the processes takes time, this only pays off
+        for large libraries.
+    :param enclosing: If given, the enclosing of this middleware is added to the values of
+        entries and strings while they are rendered, giving the same output as applying
+        the middleware first, but without modifying (or copying) the blocks.
+    :returns: The string representations of the blocks, each preceded by the block
+        separator (except for the first one)."""
+    return _write_iter(blocks, bibtex_format, raw_passthrough, workers, enclosing=enclosing)
+
+
+def _write_iter(
+    blocks: Union[Library, Iterable[Block]],
+    bibtex_format: Optional["BibtexFormat"],
+    raw_passthrough: bool,
+    workers: int,
+    transform: Optional[Callable[[Block], List[Block]]] = None,
+    enclosing: Optional[AddEnclosingMiddleware] = None,
+) -> Iterator[str]:
+    """See :py:func:`write_iter`.
+
+    :param transform: If given, applied to every block (in the worker processes)
+        right before it is formatted; the alignment of "auto" `value_column` is computed
+        on the blocks before they are transformed."""
     if bibtex_format is None:
         bibtex_format = BibtexFormat()
 
-    if bibtex_format.value_column == "auto":
-        auto_val: int = _calculate_auto_value_align(library)
-        # Copy the format instance to avoid modifying the original
-        # (which would be bad if the format is used for multiple libraries)
-        bibtex_format = deepcopy(bibtex_format)
-        bibtex_format.value_column = auto_val
-
-    string_pieces = []
-
-    for i, block in enumerate(library.blocks):
-        # Get string representation (as list of strings) of block
-        string_block_pieces = _treat_block(bibtex_format, block)
-        string_pieces.extend(string_block_pieces)
-        # Separate Blocks
-        if i < len(library.blocks) - 1:
-            string_pieces.append(bibtex_format.block_separator)
-
-    return "".join(string_pieces)
-
-
-def _treat_block(bibtex_format, block) -> List[str]:
-    if isinstance(block, Entry):
-        string_block_pieces = _treat_entry(block, bibtex_format)
-    elif isinstance(block, String):
-        string_block_pieces = _treat_string(block, bibtex_format)
-    elif isinstance(block, Preamble):
-        string_block_pieces = _treat_preamble(block, bibtex_format)
-    elif isinstance(block, ExplicitComment):
-        string_block_pieces = _treat_expl_comment(block, bibtex_format)
-    elif isinstance(block, ImplicitComment):
-        string_block_pieces = _treat_impl_comment(block, bibtex_format)
-    elif isinstance(block, ParsingFailedBlock):
-        string_block_pieces = _treat_failed_block(block, bibtex_format)
-    else:
-        raise ValueError(f"Unknown block type: {type(block)}")
-    return string_block_pieces
+    if isinstance(blocks, Library):
+        blocks = blocks.blocks
+
+    if workers > 1 and not isinstance(blocks, Sequence):
+        blocks = list(blocks)
+
+    value_column = bibtex_format.value_column
+    if value_column == "auto":
+        if not isinstance(blocks, Sequence):
+            blocks = list(blocks)
+        value_column = max(
+            _map_chunks(_calculate_auto_value_align, blocks, workers), default=len(VAL_SEP)
+        )
+    renderer = _Renderer(bibtex_format, value_column, enclosing)
+
+    if workers > 1:
+        return _write_chunks(blocks, renderer, raw_passthrough, workers, transform)
+    if transform is not None:
+        blocks = (transformed for block in blocks for transformed in transform(block))
+    return _write_blocks(blocks, renderer, raw_passthrough)
+
+
+def _write_blocks(
+    blocks: Iterable[Block], renderer: _Renderer, raw_passthrough: bool
+) -> Iterator[str]:
+    separator = ""
+    for block in blocks:
+        if raw_passthrough and block.is_unmodified():
+            # Rendered blocks end with a line break, too
+            yield separator + block.raw + "\n"
+        else:
+            yield separator + renderer.render(block)
+        separator = renderer.block_separator
+
+
+def _write_chunks(
+    blocks: Sequence[Block],
+    renderer: _Renderer,
+    raw_passthrough: bool,
+    workers: int,
+    transform: Optional[Callable[[Block], List[Block]]],
+) -> Iterator[str]:
+    """Format contiguous chunks of blocks in worker processes."""
+
+    def write_chunk(chunk: Sequence[Block]) -> str:
+        if transform is not None:
+            chunk = [transformed for block in chunk for transformed in transform(block)]
+        return "".join(_write_blocks(chunk, renderer, raw_passthrough))
+
+    separator = ""
+    for written_chunk in _map_chunks(write_chunk, blocks, workers):
+        # Chunks may be empty if the transformation removed all their blocks
+        if written_chunk:
+            yield separator + written_chunk
+            separator = renderer.block_separator
+
+
+# The function and blocks of the running `_map_chunks` call, inherited by forked processes.
+_forked_state: Optional[Tuple[Callable[[Sequence[Block]], Any], Sequence[Block]]] = None
+_forked_state_lock = threading.Lock()
+
+# Maximum number of blocks processed by a worker process at once.
+_MAX_CHUNK_SIZE = 10_000
+
+
+def _apply_to_chunk(bounds: Tuple[int, int]) -> Any:
+    """Run in a forked process: apply the function to a chunk of the blocks."""
+    function, blocks = _forked_state
+    return function(blocks[bounds[0] : bounds[1]])
+
+
+def _map_chunks(
+    function: Callable[[Sequence[Block]], Any], blocks: Sequence[Block], workers: int
+) -> Iterator[Any]:
+    """Apply a function to contiguous chunks of the blocks, in forked worker processes.
+
+    Neither the function nor the blocks are pickled, only the results are.
+    If fork is not available (or for a single worker), the chunks are processed
+    in the current process.
+
+    :returns: The results, in the order of the chunks."""
+    chunk_size = max(1, min(_MAX_CHUNK_SIZE, -(-len(blocks) // (workers * 4))))
+    bounds = [
+        (start, min(start + chunk_size, len(blocks))) for start in range(0, len(blocks), chunk_size)
+    ]
+    if workers <= 1 or len(bounds) <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        for start, end in bounds:
+            yield function(blocks[start:end])
+        return
+
+    global _forked_state
+    with _forked_state_lock:
+        _forked_state = (function, blocks)
+        try:
+            # The pool forks all its processes right away
+            pool = multiprocessing.get_context("fork").Pool(min(workers, len(bounds)))
+        finally:
+            _forked_state = None
+    with pool:
+        yield from pool.imap(_apply_to_chunk, bounds)
 
 
 class BibtexFormat:
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""Benchmark the native latex decoding backend against the pure pylatexenc backend.
+
+Usage (from the repository root): ``python dev-utilities/benchmarks/latex_decoding.py``
+
+Caching is disabled for both backends, such that every value is actually decoded.
+"""
+
+import random
+import time
+
+from bibtexparser.middlewares import LatexDecodingMiddleware
+
+# Typical field values of real-world bibliographies
+VALUES = [
+    r"M{\"u}ller, J{\"o}rg and Schr{\"o}dinger, Erwin",
+    r"Ren{\'e}e Fran\c{c}ois and \'Eric Stra{\ss}er",
+    r"{Proceedings of the {IEEE} Conference on Computer Vision}",
+    r"Smith \& Sons",
+    r"12--23",
+    r"D.~E. Knuth",
+    r"An {\AA}ngstr{\"o}m-scale study of {NaCl} crystals",
+    r"Some \textbf{bold} text",  # not covered by the native backend
+    r"Einstein $ e=mc^2 $",  # not covered by the native backend
+]
+
+
+def _time_decoding(middleware: LatexDecodingMiddleware, values) -> float:
+    start = time.perf_counter()
+    for value in values:
+        middleware._transform_python_value_string(value)
+    return time.perf_counter() - start
+
+
+def main(num_values: int = 20_000, seed: int = 0):
+    """Decode ``num_values`` values with both backends and print the timings."""
+    rng = random.Random(seed)
+    values = [rng.choice(VALUES) for _ in range(num_values)]
+
+    pylatexenc = LatexDecodingMiddleware(cache_size=0)
+    native = LatexDecodingMiddleware(cache_size=0, backend="native")
+
+    # Sanity check: both backends must agree
+    for value in VALUES:
+        assert pylatexenc._transform_python_value_string(value) == (
+            native._transform_python_value_string(value)
+        )
+
+    pylatexenc_time = _time_decoding(pylatexenc, values)
+    native_time = _time_decoding(native, values)
+
+    print(f"Decoded {num_values} values")
+    print(f"  pylatexenc backend: {pylatexenc_time:.3f}s")
+    print(f"  native backend:     {native_time:.3f}s ({pylatexenc_time / native_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
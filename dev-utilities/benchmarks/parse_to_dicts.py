@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""Benchmark the dict-only fast parse mode against ``parse_string`` + ``Entry.items()``.
+
+Usage (from the repository root): ``python dev-utilities/benchmarks/parse_to_dicts.py``
+"""
+
+import random
+import time
+
+import bibtexparser
+
+# Typical fields of real-world entries
+FIELDS = [
+    ("author", "{Donald E. Knuth and Leslie Lamport}"),
+    ("title", "{The {TeX}book}"),
+    ("journal", "jmlr"),
+    ("year", "1984"),
+    ("pages", "{12--23}"),
+    ("publisher", '"Addison-Wesley"'),
+    ("doi", "{10.1000/182}"),
+]
+
+
+def _bibtex(num_entries: int, rng: random.Random) -> str:
+    blocks = ["@string{jmlr = {Journal of Machine Learning Research}}\n"]
+    for i in range(num_entries):
+        fields = rng.sample(FIELDS, rng.randint(3, len(FIELDS)))
+        body = ",\n".join(f"  {key} = {value}" for key, value in fields)
+        blocks.append(f"@article{{entry{i},\n{body}\n}}\n")
+    return "\n".join(blocks)
+
+
+def _best_time(function, repetitions: int) -> float:
+    timings = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(num_entries: int = 20_000, repetitions: int = 3, seed: int = 0):
+    """Parse ``num_entries`` entries into dicts both ways and print the best timings."""
+    bibtex_str = _bibtex(num_entries, random.Random(seed))
+
+    def via_library():
+        return [dict(entry.items()) for entry in bibtexparser.parse_string(bibtex_str).entries]
+
+    def via_fast_path():
+        return bibtexparser.parse_to_dicts(bibtex_str)
+
+    # Sanity check: both must agree
+    assert via_library() == via_fast_path()
+
+    library_time = _best_time(via_library, repetitions)
+    fast_time = _best_time(via_fast_path, repetitions)
+
+    print(f"Parsed {num_entries} entries into dicts (best of {repetitions})")
+    print(f"  parse_string + Entry.items(): {library_time:.3f}s")
+    print(
+        f"  parse_to_dicts:               {fast_time:.3f}s ({library_time / fast_time:.1f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
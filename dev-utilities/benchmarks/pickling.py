@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""Benchmark pickling a parsed library, e.g. to send it to worker processes or cache it.
+
+Usage (from the repository root): ``python dev-utilities/benchmarks/pickling.py``
+
+The library is parsed with ``track_modifications``, such that the (larger) state used
+for raw passthrough is pickled as well.
+"""
+
+import pickle
+import random
+import time
+
+import bibtexparser
+
+# Typical fields of real-world entries
+FIELDS = [
+    ("author", "{Donald E. Knuth and Leslie Lamport}"),
+    ("title", "{The {TeX}book}"),
+    ("journal", "jmlr"),
+    ("year", "1984"),
+    ("pages", "{12--23}"),
+    ("publisher", '"Addison-Wesley"'),
+    ("doi", "{10.1000/182}"),
+]
+
+
+def _bibtex(num_entries: int, rng: random.Random) -> str:
+    blocks = ["@string{jmlr = {Journal of Machine Learning Research}}\n"]
+    for i in range(num_entries):
+        fields = rng.sample(FIELDS, rng.randint(3, len(FIELDS)))
+        body = ",\n".join(f"  {key} = {value}" for key, value in fields)
+        blocks.append(f"@article{{entry{i},\n{body}\n}}\n")
+    return "\n".join(blocks)
+
+
+def _best_time(function, repetitions: int) -> float:
+    timings = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(num_entries: int = 50_000, repetitions: int = 3, seed: int = 0):
+    """Pickle and unpickle a library of ``num_entries`` entries and print size and timings."""
+    bibtex_str = _bibtex(num_entries, random.Random(seed))
+    library = bibtexparser.parse_string(bibtex_str, track_modifications=True)
+
+    protocol = pickle.HIGHEST_PROTOCOL
+    data = pickle.dumps(library, protocol=protocol)
+    # Sanity check: the round trip must not change the library
+    unpickled = pickle.loads(data)
+    assert bibtexparser.write_string(unpickled, raw_passthrough=True) == bibtexparser.write_string(
+        library, raw_passthrough=True
+    )
+    assert unpickled.entries_dict.keys() == library.entries_dict.keys()
+
+    dump_time = _best_time(lambda: pickle.dumps(library, protocol=protocol), repetitions)
+    load_time = _best_time(lambda: pickle.loads(data), repetitions)
+
+    print(f"Pickled {num_entries} entries (protocol {protocol}, best of {repetitions})")
+    print(f"  size:  {len(data) / 1024**2:.1f} MiB")
+    print(f"  dump:  {dump_time:.3f}s")
+    print(f"  load:  {load_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
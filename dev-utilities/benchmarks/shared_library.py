@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Benchmark exporting a library to shared memory, attaching to it and looking up entries.
+
+Usage (from the repository root): ``python dev-utilities/benchmarks/shared_library.py``
+
+Attaching is compared to unpickling the library, the cheapest way for a process
+to get its own copy of a library.
+"""
+
+import pickle
+import random
+import time
+
+from bibtexparser import Library
+from bibtexparser.model import Entry
+from bibtexparser.model import Field
+from bibtexparser.shared import SharedLibrary
+
+# Typical fields of real-world entries
+FIELDS = [
+    ("author", "Donald E. Knuth and Leslie Lamport"),
+    ("title", "The {TeX}book"),
+    ("journal", "Journal of Machine Learning Research"),
+    ("year", "1984"),
+    ("pages", "12--23"),
+    ("publisher", "Addison-Wesley"),
+    ("doi", "10.1000/182"),
+]
+
+
+def _library(num_entries: int, rng: random.Random) -> Library:
+    library = Library()
+    for i in range(num_entries):
+        fields = [Field(key, value) for key, value in rng.sample(FIELDS, rng.randint(3, 7))]
+        library.add(Entry("article", f"entry{i}", fields))
+    return library
+
+
+def main(num_entries: int = 200_000, num_lookups: int = 100_000, seed: int = 0):
+    """Share a library of ``num_entries`` entries and print timings and sizes."""
+    rng = random.Random(seed)
+    library = _library(num_entries, rng)
+    keys = [f"entry{rng.randrange(num_entries)}" for _ in range(num_lookups)]
+
+    start = time.perf_counter()
+    shared = SharedLibrary.create(library)
+    create_time = time.perf_counter() - start
+    try:
+        start = time.perf_counter()
+        attached = SharedLibrary.attach(shared.name)
+        attach_time = time.perf_counter() - start
+
+        pickled = pickle.dumps(library, protocol=pickle.HIGHEST_PROTOCOL)
+        start = time.perf_counter()
+        pickle.loads(pickled)
+        unpickle_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for key in keys:
+            attached[key].get("title")
+        lookup_time = time.perf_counter() - start
+        attached.close()
+    finally:
+        shared.close()
+        shared.unlink()
+
+    print(f"Shared {num_entries} entries")
+    print(f"  create:   {create_time:.3f}s ({shared.size / 1024**2:.1f} MiB)")
+    print(f"  attach:   {attach_time * 1000:.3f}ms")
+    print(f"  unpickle: {unpickle_time:.3f}s ({len(pickled) / 1024**2:.1f} MiB)")
+    print(f"  {num_lookups} lookups: {lookup_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Benchmark loading, querying and writing a library stored in a SQLite database.
+
+Usage (from the repository root): ``python dev-utilities/benchmarks/sqlite_library.py``
+
+The peak memory of the process is printed as well: it does not grow with the
+number of entries, as only one batch of blocks (and the cache) is held in memory.
+"""
+
+import os
+import random
+import resource
+import tempfile
+import time
+
+import bibtexparser
+from bibtexparser.sqlite import SqliteLibrary
+
+# Typical fields of real-world entries
+FIELDS = [
+    ("author", "Donald E. Knuth and Leslie Lamport"),
+    ("title", "The {TeX}book"),
+    ("journal", "Journal of Machine Learning Research"),
+    ("pages", "12--23"),
+    ("publisher", "Addison-Wesley"),
+    ("doi", "10.1000/182"),
+]
+
+
+def _write_bibtex(path: str, num_entries: int, rng: random.Random):
+    with open(path, "w", encoding="UTF-8") as file:
+        for i in range(num_entries):
+            fields = rng.sample(FIELDS, rng.randint(2, 6)) + [
+                ("year", str(rng.randint(1950, 2024)))
+            ]
+            body = ",\n".join(f"  {key} = {{{value}}}" for key, value in fields)
+            file.write(f"@{rng.choice(['article', 'book'])}{{entry{i},\n{body}\n}}\n\n")
+
+
+def main(num_entries: int = 200_000, num_lookups: int = 10_000, seed: int = 0):
+    """Load a file of ``num_entries`` entries into a SQLite library and print timings."""
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        bibtex_path = os.path.join(directory, "library.bib")
+        _write_bibtex(bibtex_path, num_entries, rng)
+
+        with SqliteLibrary(os.path.join(directory, "library.sqlite")) as library:
+            start = time.perf_counter()
+            library.add_bibtex(bibtex_path)
+            load_time = time.perf_counter() - start
+
+            keys = [f"entry{rng.randrange(num_entries)}" for _ in range(num_lookups)]
+            start = time.perf_counter()
+            for key in keys:
+                library.entries_dict[key].get("year")
+            lookup_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            num_found = sum(1 for _ in library.find_entries("book", {"year": "1984"}))
+            query_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            bibtexparser.write_file(os.path.join(directory, "out.bib"), library, streaming=True)
+            write_time = time.perf_counter() - start
+            size = os.path.getsize(library.path)
+
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"SQLite library of {num_entries} entries ({size / 1024**2:.1f} MiB)")
+    print(f"  add_bibtex:       {load_time:.3f}s")
+    print(f"  {num_lookups} lookups:  {lookup_time:.3f}s")
+    print(f"  find_entries:     {query_time * 1000:.1f}ms ({num_found} entries)")
+    print(f"  write (streamed): {write_time:.3f}s")
+    print(f"  peak memory:      {peak_memory:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""Benchmark rendering a library with different formats.
+
+Usage (from the repository root): ``python dev-utilities/benchmarks/writer.py``
+
+The library is rendered with an empty unparse stack (values are already enclosed),
+such that only the rendering of the blocks is measured.
+"""
+
+import random
+import time
+
+from bibtexparser import Library
+from bibtexparser.model import Entry
+from bibtexparser.model import Field
+from bibtexparser.model import String
+from bibtexparser.writer import BibtexFormat
+from bibtexparser.writer import write
+
+# Typical fields of real-world entries
+FIELDS = [
+    ("author", "{Donald E. Knuth and Leslie Lamport}"),
+    ("title", "{The {TeX}book}"),
+    ("journal", "jmlr"),
+    ("year", "1984"),
+    ("pages", "{12--23}"),
+    ("publisher", "{Addison-Wesley}"),
+    ("doi", "{10.1000/182}"),
+    ("howpublished", r"{\url{https://example.org}}"),
+]
+
+
+def _library(num_entries: int, rng: random.Random) -> Library:
+    library = Library([String("jmlr", "{Journal of Machine Learning Research}")])
+    for i in range(num_entries):
+        fields = [Field(key, value) for key, value in rng.sample(FIELDS, rng.randint(3, 8))]
+        library.add(Entry("article", f"entry{i}", fields))
+    return library
+
+
+def _format(value_column, trailing_comma: bool) -> BibtexFormat:
+    bibtex_format = BibtexFormat()
+    bibtex_format.value_column = value_column
+    bibtex_format.trailing_comma = trailing_comma
+    return bibtex_format
+
+
+def main(num_entries: int = 100_000, repetitions: int = 3, seed: int = 0):
+    """Render ``num_entries`` entries with several formats and print the best timings."""
+    library = _library(num_entries, random.Random(seed))
+
+    print(f"Rendered {num_entries} entries (best of {repetitions})")
+    for value_column, trailing_comma in [(0, False), (20, False), ("auto", False), ("auto", True)]:
+        bibtex_format = _format(value_column, trailing_comma)
+        timings = []
+        for _ in range(repetitions):
+            start = time.perf_counter()
+            write(library, bibtex_format)
+            timings.append(time.perf_counter() - start)
+        label = f"value_column={value_column!r}, trailing_comma={trailing_comma}"
+        print(f"  {label + ':':<42} {min(timings):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -278,3 +278,38 @@ def test_no_addition_block_types(
 
 
 # TODO round-trip tests (removal -> addition -> removal)
+
+
+@pytest.mark.parametrize("reuse_previous_enclosing", [True, False], ids=["reuse", "no_reuse"])
+@pytest.mark.parametrize("enclose_ints", [True, False], ids=["enclose_ints", "no_enclose_ints"])
+def test_enclosed_values_match_transformation(reuse_previous_enclosing, enclose_ints):
+    entry = Entry(
+        entry_type="article",
+        key="someKey",
+        fields=[
+            Field(key="title", value="Title"),
+            Field(key="year", value="1990"),
+            Field(key="pages", value="12"),
+            Field(key="note", value="12"),
+        ],
+    )
+    entry.parser_metadata["removed_enclosing"] = {"title": '"', "year": "no-enclosing"}
+    string = String(key="me", value="Me")
+    string.parser_metadata["removed_enclosing"] = '"'
+    middleware = AddEnclosingMiddleware(
+        allow_inplace_modification=False,
+        default_enclosing="{",
+        reuse_previous_enclosing=reuse_previous_enclosing,
+        enclose_integers=enclose_ints,
+    )
+    original_entry, original_string = deepcopy(entry), deepcopy(string)
+
+    transformed = middleware.transform(Library([entry, string]))
+
+    assert middleware.enclosed_field_values(entry) == [
+        f.value for f in transformed.entries[0].fields
+    ]
+    assert middleware.enclosed_string_value(string) == transformed.strings[0].value
+    # The blocks are not modified
+    assert entry == original_entry
+    assert string == original_string
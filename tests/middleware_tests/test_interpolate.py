@@ -1,6 +1,11 @@
 import pytest
 
+import bibtexparser
+from bibtexparser.middlewares.enclosing import AddEnclosingMiddleware
 from bibtexparser.middlewares.enclosing import RemoveEnclosingMiddleware
+from bibtexparser.middlewares.interpolate import ReplaceWithStringReferencesMiddleware
+from bibtexparser.middlewares.interpolate import ResolveCrossrefMiddleware
+from bibtexparser.middlewares.interpolate import ResolveStringExpressionsMiddleware
 from bibtexparser.middlewares.interpolate import ResolveStringReferencesMiddleware
 from bibtexparser.splitter import Splitter
 
@@ -46,3 +51,237 @@ def test_warning_is_raised_if_enclosings_are_removed():
 
     assert len(record) == 1
     assert "RemoveEnclosing" in record[0].message.args[0]
+
+
+expressions_bibtex_string = """
+@string{conf = "Proc. of the " # name # " Conference"}
+@string{name = {Test {Driven}}}
+@string{jan = "January"}
+@string{year = 2022}
+@string{cycle_a = "a" # cycle_b}
+@string{cycle_b = cycle_a # "b"}
+
+@inproceedings{test_inproceedings,
+  booktitle = conf # " " # year,
+  month     = jan # "~1st",
+  year      = year,
+  note      = jan,
+  title     = {Not # a # concatenation},
+  pages     = 12,
+  cyclic    = cycle_a,
+  undefined = undefined_string # "x",
+  malformed = jan # # "x"
+}
+"""
+
+
+def test_string_expressions_are_resolved():
+    library = Splitter(expressions_bibtex_string).split()
+
+    m = ResolveStringExpressionsMiddleware(allow_inplace_modification=False)
+    resolved_library = m.transform(library)
+
+    fields = resolved_library.entries_dict["test_inproceedings"].fields_dict
+    assert fields["booktitle"].value == "{Proc. of the Test {Driven} Conference 2022}"
+    assert fields["month"].value == "{January~1st}"
+    assert fields["year"].value == "2022"
+    assert fields["note"].value == '"January"'
+    # Values which cannot be resolved are left unchanged
+    assert fields["title"].value == "{Not # a # concatenation}"
+    assert fields["pages"].value == "12"
+    assert fields["cyclic"].value == "cycle_a"
+    assert fields["undefined"].value == 'undefined_string # "x"'
+    assert fields["malformed"].value == 'jan # # "x"'
+
+    assert resolved_library.entries[0].parser_metadata[m.metadata_key()] == [
+        "booktitle",
+        "month",
+        "year",
+        "note",
+    ]
+    # String definitions and the original library are not modified
+    assert resolved_library.strings_dict["conf"].value == '"Proc. of the " # name # " Conference"'
+    assert library.entries[0].fields_dict["month"].value == 'jan # "~1st"'
+
+
+def test_string_expressions_cycles_are_logged(caplog):
+    library = Splitter(expressions_bibtex_string).split()
+    ResolveStringExpressionsMiddleware().transform(library)
+    assert "cycle_a -> cycle_b -> cycle_a" in caplog.text
+
+
+def test_string_expressions_predefined_strings():
+    library = Splitter(expressions_bibtex_string).split()
+    m = ResolveStringExpressionsMiddleware(
+        predefined_strings={"undefined_string": "Defined", "jan": "Ignored"}
+    )
+    fields = m.transform(library).entries[0].fields_dict
+    assert fields["undefined"].value == "{Definedx}"
+    assert fields["note"].value == '"January"'
+
+
+def test_string_expressions_long_chain():
+    """Long chains of @string definitions must not exceed the recursion limit."""
+    bibtex = '@string{s0 = "x"}\n'
+    bibtex += "\n".join(f'@string{{s{i} = s{i - 1} # "x"}}' for i in range(1, 3000))
+    bibtex += "\n@misc{key, note = s2999}"
+    library = ResolveStringExpressionsMiddleware().transform(Splitter(bibtex).split())
+    assert library.entries[0]["note"] == "{" + "x" * 3000 + "}"
+
+
+references_bibtex_string = """
+@string{jmlr = {Journal of Machine Learning Research}}
+
+@article{a, journal = {Journal of Machine Learning Research}, title = {Journal of Machine Learning Research}}
+@article{b, journal = {Nature}, note = "Journal of Machine Learning Research"}
+@article{c, journal = {Nature}, booktitle = {Proc. of the Intl. Conf. on {ML}}}
+@article{d, journal = {Nature}, booktitle = {Proc. of the Intl. Conf. on {ML}}}
+@article{e, journal = {Data}, booktitle = {Proc. of the Intl. Conf. on {ML}}}
+@article{f, journal = {Data}}
+@string{late = {Data}}
+@article{g, journal = {Data}}
+"""
+
+
+def _unparse_stack(**kwargs):
+    return [
+        AddEnclosingMiddleware(
+            reuse_previous_enclosing=False,
+            enclose_integers=True,
+            default_enclosing="{",
+            allow_inplace_modification=False,
+        ),
+        ReplaceWithStringReferencesMiddleware(**kwargs),
+    ]
+
+
+def test_values_are_replaced_with_string_references():
+    library = bibtexparser.parse_string(references_bibtex_string)
+    written = bibtexparser.write_string(library, unparse_stack=_unparse_stack())
+    reparsed = bibtexparser.parse_string(written).entries_dict
+
+    assert reparsed["a"]["journal"] == "Journal of Machine Learning Research"
+    assert "journal = jmlr," in written
+    assert "title = jmlr" in written
+    assert "note = jmlr" in written
+    # Only @strings defined before the entry are referenced
+    assert written.count("journal = late") == 1
+    assert reparsed["g"]["journal"] == "Data"
+    # The original library is not modified
+    assert library.entries_dict["a"]["journal"] == "Journal of Machine Learning Research"
+
+
+def test_string_references_auto_generated_strings():
+    library = bibtexparser.parse_string(references_bibtex_string)
+    written = bibtexparser.write_string(
+        library, unparse_stack=_unparse_stack(auto_string_min_occurrences=2)
+    )
+    reparsed = bibtexparser.parse_string(written)
+
+    # Generated @strings are defined before the first entry
+    assert [s.key for s in reparsed.strings] == ["jmlr", "nature", "picm", "late"]
+    assert reparsed.blocks.index(reparsed.strings[2]) < reparsed.blocks.index(reparsed.entries[0])
+    assert "booktitle = picm" in written
+    assert written.count("journal = nature") == 3
+    # Values occurring too rarely or already defined by a @string are not generated
+    assert "data" not in reparsed.strings_dict
+    for key in "abcdefg":
+        assert reparsed.entries_dict[key]["journal"] == library.entries_dict[key]["journal"]
+
+
+def test_string_references_generated_keys_do_not_clash():
+    taken = {"jan", "jmlr"}
+    key_for = ReplaceWithStringReferencesMiddleware._string_key_for
+    assert key_for("Journal of Machine Learning Research", taken) == "jmlr2"
+    assert key_for("Journal of Machine Learning Research", taken) == "jmlr3"
+    assert key_for("January", {"jan", "january"}) == "january2"
+    assert key_for(r"{\"U}ber", set()) == "uber"
+    assert key_for("2022", set()) == "str"
+
+
+def test_string_references_warns_if_run_before_add_enclosing():
+    library = bibtexparser.parse_string(references_bibtex_string)
+    with pytest.warns(UserWarning, match="AddEnclosingMiddleware"):
+        ReplaceWithStringReferencesMiddleware(allow_inplace_modification=False).transform(library)
+
+
+crossref_bibtex_string = """
+@proceedings{conf2020,
+  title     = {Proceedings of the Conference},
+  booktitle = {Proceedings of the Conference},
+  year      = 2020,
+  crossref  = {series}
+}
+@misc{series, publisher = "Publisher", series = {Conference Series}}
+@xdata{common, address = {Berlin}, publisher = {Other Publisher}}
+@inproceedings{paper1, title = {Paper One}, crossref = {conf2020}, xdata = {common}}
+@inproceedings{paper2, title = {Paper Two}, crossref = {Conf2020}}
+@inproceedings{lonely, title = {Lonely}, crossref = {single}}
+@proceedings{single, booktitle = {Single Proceedings}}
+@misc{unknown, crossref = {does-not-exist}}
+@misc{cycle_a, crossref = {cycle_b}, note = {A}}
+@misc{cycle_b, crossref = {cycle_a}, title = {B}}
+"""
+
+
+def test_crossref_and_xdata_are_resolved(caplog):
+    library = bibtexparser.parse_string(
+        crossref_bibtex_string,
+        append_middleware=[ResolveCrossrefMiddleware(allow_inplace_modification=False)],
+    )
+    entries = library.entries_dict
+
+    # Chains are resolved, own fields take precedence, xdata takes precedence over crossref
+    assert entries["paper1"]["title"] == "Paper One"
+    assert entries["paper1"]["booktitle"] == "Proceedings of the Conference"
+    assert entries["paper1"]["series"] == "Conference Series"
+    assert entries["paper1"]["publisher"] == "Other Publisher"
+    assert entries["paper1"]["address"] == "Berlin"
+    assert entries["paper1"]["crossref"] == "conf2020"
+    assert entries["paper1"].parser_metadata["ResolveCrossref"] == [
+        "address",
+        "publisher",
+        "booktitle",
+        "year",
+        "series",
+    ]
+    # Case-insensitive lookup of the parent
+    assert entries["paper2"]["publisher"] == "Publisher"
+    assert entries["lonely"]["booktitle"] == "Single Proceedings"
+    assert "single" in entries
+
+    # Unknown references and cycles are logged
+    assert "does-not-exist" in caplog.text
+    assert "cycle_a -> cycle_b -> cycle_a" in caplog.text
+
+
+def test_crossref_inherited_fields_keep_enclosing():
+    library = bibtexparser.parse_string(
+        crossref_bibtex_string, append_middleware=[ResolveCrossrefMiddleware()]
+    )
+    written = bibtexparser.write_string(
+        library,
+        unparse_stack=[
+            AddEnclosingMiddleware(
+                reuse_previous_enclosing=True, enclose_integers=False, default_enclosing="{"
+            )
+        ],
+    )
+    assert 'publisher = "Publisher"' in written.split("@inproceedings{paper2")[1]
+
+
+def test_crossref_min_crossrefs():
+    library = bibtexparser.parse_string(
+        crossref_bibtex_string, append_middleware=[ResolveCrossrefMiddleware(min_crossrefs=2)]
+    )
+    entries = library.entries_dict
+
+    # Referenced once: merged into the child and removed
+    assert "single" not in entries
+    assert "series" not in entries
+    assert entries["lonely"]["booktitle"] == "Single Proceedings"
+    assert "crossref" not in entries["lonely"].fields_dict
+    assert "crossref" not in entries["conf2020"].fields_dict
+    assert entries["conf2020"]["series"] == "Conference Series"
+    # Referenced twice: kept
+    assert entries["paper1"]["crossref"] == "conf2020"
@@ -3,6 +3,7 @@
 Note: All encoding/decoding is done using the pylatexenc library.
 Thus, we merely test that the middleware is correctly configured."""
 
+import random
 from copy import deepcopy
 
 import pytest
@@ -128,6 +129,207 @@ def test_inplace(inplace: bool, middleware_class):
     assert_inplace_is_respected(inplace, input_entry, transformed_library.entries[0])
 
 
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2013",
+        "10.1000/xyz123",
+        "A Plain ASCII Title",
+        "Gödel, Escher, Bach",
+        "a -- b",
+        "``quoted''",
+        r"H\o{}gsbro",
+        "I payed $10",
+        "50% off",
+        "A & B",
+        "D.~E. Knuth",
+    ],
+)
+def test_decoding_fast_path_and_cache_do_not_change_output(value):
+    """Fast path and caching must yield exactly what pylatexenc yields."""
+    middleware = LatexDecodingMiddleware()
+    uncached = LatexDecodingMiddleware(cache_size=0)
+    expected = middleware._decoder.latex_to_text(value)
+
+    assert middleware._transform_python_value_string(value) == (expected, "")
+    assert middleware._transform_python_value_string(value) == (expected, "")
+    assert uncached._transform_python_value_string(value) == (expected, "")
+
+
+def test_decoding_cache_info():
+    middleware = LatexDecodingMiddleware(cache_size=2)
+    library = Library(
+        [
+            Entry(
+                entry_type="article",
+                key=f"key{i}",
+                fields=[
+                    Field(key="year", value="2013"),
+                    Field(key="journal", value=r"J. Stat. M\'ecanique"),
+                ],
+            )
+            for i in range(5)
+        ]
+    )
+
+    middleware.transform(library)
+
+    info = middleware.cache_info()
+    assert info.fast_path == 5
+    assert info.misses == 1
+    assert info.hits == 4
+    assert info.maxsize == 2
+    assert info.currsize == 1
+    assert info.time_saved >= 0
+
+    middleware.cache_clear()
+    assert middleware.cache_info() == (0, 0, 0, 2, 0, 0.0)
+
+
+def test_decoding_no_fast_path_for_custom_decoder():
+    decoder = LatexDecodingMiddleware()._decoder
+    middleware = LatexDecodingMiddleware(decoder=decoder)
+    middleware._transform_python_value_string("plain")
+    assert middleware.cache_info().fast_path == 0
+    assert middleware.cache_info().misses == 1
+
+
+def test_decoding_negative_cache_size():
+    with pytest.raises(ValueError):
+        LatexDecodingMiddleware(cache_size=-1)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2013",
+        "A Plain ASCII Title",
+        "Gödel, Escher, Bach",
+        "A & B",
+        "snake_case",
+        "See https://mweiss.ch",
+        "See www.mweiss.ch",
+        "Einstein $ e=mc^2 $",
+        "a -- b",
+    ],
+)
+def test_encoding_fast_path_and_cache_do_not_change_output(value):
+    """Fast path and caching must yield exactly what pylatexenc yields."""
+    middleware = LatexEncodingMiddleware()
+    uncached = LatexEncodingMiddleware(cache_size=0)
+    expected = middleware._encoder.unicode_to_latex(value)
+
+    assert middleware._transform_python_value_string(value) == (expected, "")
+    assert middleware._transform_python_value_string(value) == (expected, "")
+    assert uncached._transform_python_value_string(value) == (expected, "")
+
+
+def test_encoding_cache_info():
+    middleware = LatexEncodingMiddleware()
+    for value in ["2013", "Plain", "Gödel", "Gödel", "Gödel"]:
+        middleware._transform_python_value_string(value)
+
+    info = middleware.cache_info()
+    assert info.fast_path == 2
+    assert info.misses == 1
+    assert info.hits == 2
+
+
+def test_default_encoder_is_shared():
+    assert LatexEncodingMiddleware()._encoder is LatexEncodingMiddleware()._encoder
+    assert (
+        LatexEncodingMiddleware(keep_math=False)._encoder
+        is not LatexEncodingMiddleware(keep_math=True)._encoder
+    )
+
+
+def test_encoding_no_fast_path_for_custom_encoder():
+    encoder = LatexEncodingMiddleware()._encoder
+    middleware = LatexEncodingMiddleware(encoder=encoder)
+    middleware._transform_python_value_string("plain")
+    assert middleware.cache_info().fast_path == 0
+    assert middleware.cache_info().misses == 1
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        r"M{\"u}ller",
+        r"M\"uller",
+        r"M\"{u}ller",
+        r"Ren{\'e}e and \'Eric",
+        r"Stra{\ss}e",
+        r"Stra\ss e",
+        r"\L{}ukasz",
+        r"Fran\c{c}ois and Fran\c cois",
+        r"\v{S}koda",
+        r"{NASA} and {IEEE}",
+        r"Smith \& Sons",
+        r"pages 12--23 --- or not",
+        r"D.~E. Knuth",
+        r"\AA ngstr\"om",
+        r"{\o}",
+    ],
+)
+def test_native_decoding_matches_pylatexenc(value):
+    native = LatexDecodingMiddleware(backend="native", cache_size=0)
+    pylatexenc = LatexDecodingMiddleware(cache_size=0)
+
+    assert native._native_decoder.decode(value) is not None
+    assert native._transform_python_value_string(value) == (
+        pylatexenc._transform_python_value_string(value)
+    )
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        r"some \textbf{bold} text",
+        r"Einstein $ e=m_c^2 $",
+        r"``quoted''",
+        r"unbalanced {brace",
+        r"unbalanced } brace",
+        "Stra\\ss\ne",
+        r"Thr{\'\i}ce",
+    ],
+)
+def test_native_decoding_falls_back_to_pylatexenc(value):
+    native = LatexDecodingMiddleware(backend="native", cache_size=0)
+    pylatexenc = LatexDecodingMiddleware(cache_size=0)
+
+    assert native._native_decoder.decode(value) is None
+    assert native._transform_python_value_string(value) == (
+        pylatexenc._transform_python_value_string(value)
+    )
+
+
+def test_native_decoding_matches_pylatexenc_on_random_values():
+    rng = random.Random(42)
+    pieces = ["a", "Z", "é", " ", "\t", "\n", "-", "--", "~", "{", "}", "{}", '\\"', "\\'"]
+    pieces += ["\\c", "\\v", "\\ss", "\\o", "\\oe", "\\AA", "\\i", "\\&", "\\_", "$", "`"]
+    native = LatexDecodingMiddleware(backend="native", cache_size=0)
+    pylatexenc = LatexDecodingMiddleware(cache_size=0)
+
+    for _ in range(500):
+        value = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 8)))
+        assert native._transform_python_value_string(value) == (
+            pylatexenc._transform_python_value_string(value)
+        ), value
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"backend": "unknown"},
+        {"backend": "native", "keep_braced_groups": True},
+        {"backend": "native", "decoder": LatexDecodingMiddleware()._decoder},
+    ],
+)
+def test_native_decoding_invalid_configuration(kwargs):
+    with pytest.raises(ValueError):
+        LatexDecodingMiddleware(**kwargs)
+
+
 def _entry_with_latex_string(latex_string):
     return Entry(
         start_line=1,
@@ -11,6 +11,7 @@ from bibtexparser.middlewares.names import MergeNameParts
 from bibtexparser.middlewares.names import NameParts
 from bibtexparser.middlewares.names import SeparateCoAuthors
 from bibtexparser.middlewares.names import SplitNameParts
+from bibtexparser.middlewares.names import clear_name_cache
 from bibtexparser.middlewares.names import parse_single_name_into_parts
 from bibtexparser.middlewares.names import split_multiple_persons_names
 from bibtexparser.model import Entry
@@ -91,6 +92,20 @@ def test_split_coauthors_consistent_with_bibtex(field_value: str, expected: List
     assert split_multiple_persons_names(field_value) == expected
 
 
+@pytest.mark.parametrize(
+    "field_value, expected",
+    [
+        (r"Emile Zola and \'Eric Rohmer", ["Emile Zola", r"\'Eric Rohmer"]),
+        (r"Donald E. Knuth \' and Leslie Lamport", [r"Donald E. Knuth \'", "Leslie Lamport"]),
+        (r"Donald E. Knuth \and Leslie Lamport", [r"Donald E. Knuth \and Leslie Lamport"]),
+        ("Donald E. Knuth and \\", ["Donald E. Knuth", "\\"]),
+    ],
+)
+def test_split_coauthors_keeps_escapes(field_value: str, expected: List[str]):
+    """Escaped characters next to an ' and ' separator must not be dropped."""
+    assert split_multiple_persons_names(field_value) == expected
+
+
 @pytest.mark.parametrize(
     "name",
     [
@@ -1109,3 +1124,44 @@ def test_split_name_parts_exception(name: str, reason: str):
     # Using same test as in test_name_splitting_strict_mode
     with pytest.raises(InvalidNameError, match=f".*{name}.*{reason}.*"):
         raise transformed_library.failed_blocks[0].error
+
+
+@pytest.mark.parametrize("strict", (True, False), ids=("strict", "non-strict"))
+def test_name_splitting_trailing_backslash(strict: bool):
+    """A trailing backslash is kept as-is (and not duplicated)."""
+    result = parse_single_name_into_parts("Donald E. Knuth\\", strict=strict)
+    assert result == NameParts(first=["Donald", "E."], last=["Knuth\\"])
+
+
+def test_name_middlewares_share_cache():
+    clear_name_cache()
+    entries = [
+        Entry(
+            entry_type="article",
+            key=f"key{i}",
+            fields=[Field(key="author", value="Donald E. Knuth and Leslie Lamport")],
+        )
+        for i in range(3)
+    ]
+    library = Library(entries)
+    library = SeparateCoAuthors().transform(library)
+    library = SplitNameParts().transform(library)
+
+    for entry in library.entries:
+        assert entry["author"] == [
+            NameParts(first=["Donald", "E."], last=["Knuth"]),
+            NameParts(first=["Leslie"], last=["Lamport"]),
+        ]
+
+    # Results are copied out of the cache: modifying them must not affect other entries.
+    library.entries[0]["author"][0].last.append("Jr")
+    library.entries[0]["author"].pop()
+    assert library.entries[1]["author"][0].last == ["Knuth"]
+    assert len(library.entries[1]["author"]) == 2
+
+    other = SplitNameParts().transform(
+        SeparateCoAuthors().transform(
+            Library([Entry("article", "k", [Field("author", "Donald E. Knuth")])])
+        )
+    )
+    assert other.entries[0]["author"] == [NameParts(first=["Donald", "E."], last=["Knuth"])]
@@ -2,6 +2,7 @@ from bibtexparser import Library
 from bibtexparser.middlewares.sorting_blocks import SortBlocksByTypeAndKeyMiddleware
 from bibtexparser.model import Entry
 from bibtexparser.model import ExplicitComment
+from bibtexparser.model import Field
 from bibtexparser.model import ImplicitComment
 from bibtexparser.model import Preamble
 from bibtexparser.model import String
@@ -102,3 +103,53 @@ def test_sorting_blocks_no_comment_preserving_with_custom_order():
     assert ordered_blocks[11] == ExplicitComment("explicit_comment_b")
 
     assert len(ordered_blocks) == len(BLOCKS)
+
+
+def test_sorting_blocks_inplace():
+    library = Library(blocks=BLOCKS)
+    original_blocks = list(library.blocks)
+    middleware = SortBlocksByTypeAndKeyMiddleware(allow_inplace_modification=True)
+    sorted_library = middleware.transform(library)
+
+    assert sorted_library is library
+    expected = SortBlocksByTypeAndKeyMiddleware().transform(Library(blocks=BLOCKS)).blocks
+    assert sorted_library.blocks == expected
+    # The very same block instances are reordered, not copied
+    assert {id(b) for b in sorted_library.blocks} == {id(b) for b in original_blocks}
+    assert sorted_library.entries_dict["entry_a"] is original_blocks[5]
+
+
+def test_sorting_blocks_not_inplace_does_not_modify_input():
+    library = Library(blocks=BLOCKS)
+    original_blocks = list(library.blocks)
+    sorted_library = SortBlocksByTypeAndKeyMiddleware().transform(library)
+
+    assert sorted_library is not library
+    assert library.blocks == original_blocks
+    assert all(a is b for a, b in zip(library.blocks, original_blocks))
+
+
+def test_sorting_blocks_custom_key():
+    def year_and_first_author(block):
+        if not isinstance(block, Entry):
+            return "", ""
+        return block["year"], block["author"].split(" and ")[0].split()[-1]
+
+    blocks = [
+        Entry("article", "c", fields=[Field("year", "2021"), Field("author", "A Zed")]),
+        ImplicitComment("% comment above b"),
+        Entry("article", "b", fields=[Field("year", "2020"), Field("author", "A Young and B Ax")]),
+        Entry("article", "a", fields=[Field("year", "2020"), Field("author", "B Xavier")]),
+        String("string_a", "value_a"),
+    ]
+    library = SortBlocksByTypeAndKeyMiddleware(key=year_and_first_author).transform(
+        Library(blocks=blocks)
+    )
+
+    assert [getattr(b, "key", None) for b in library.blocks] == [
+        "string_a",
+        "a",
+        None,
+        "b",
+        "c",
+    ]
@@ -0,0 +1,151 @@
+"""Tests of the event-driven splitting (`parse_events`) against `Splitter`."""
+
+import io
+import random
+
+import pytest
+
+from bibtexparser.events import ParseHandler
+from bibtexparser.events import parse_events
+from bibtexparser.model import DuplicateBlockKeyBlock
+from bibtexparser.model import DuplicateFieldKeyBlock
+from bibtexparser.model import Entry
+from bibtexparser.model import ExplicitComment
+from bibtexparser.model import ImplicitComment
+from bibtexparser.model import ParsingFailedBlock
+from bibtexparser.model import Preamble
+from bibtexparser.model import String
+from bibtexparser.splitter import Splitter
+from bibtexparser.splitter import _scan_events
+from bibtexparser.streaming import iter_blocks
+
+from .test_splitter_basic import blocks_not_starting_on_new_lines
+from .test_splitter_basic import duplicate_bibtex_entry_keys
+from .test_splitter_basic import duplicate_bibtex_string_keys
+from .test_splitter_basic import example_bibstr
+
+VALID_BIBTEX = r"""% A comment with @ sign and {braces}
+@String{jmlr = {Journal of Machine Learning Research}}
+@string{ nips = "NeurIPS" }
+@preamble{"\newcommand{\noop}[1]{}"}
+@comment{ @article{ignored, title = {Ignored}} }
+
+@Article{first,
+  author = {M{\"u}ller, J. and Doe, John},
+  title = "A {"}quoted{"} title, with {nested {braces}} and @ {ICML}",
+  journal = jmlr,
+  booktitle = nips,
+  year = 2020,
+  note = unknownstring,
+  escaped = {50\% and \{ and \"},
+}
+@misc{noFields}
+@misc {spaced, title = {Space before bracket}}@book{sameLine,title={Same line}}
+@article{dupFields, title = {A}, title = {B}}
+@article{first, title = {Duplicate key}}
+@string{nips = "Duplicate string"}
+@inproceedings{last, title = "T" # nips, year = {2021}}
+"""
+
+
+IRREGULAR_BIBTEX = [
+    example_bibstr,
+    blocks_not_starting_on_new_lines,
+    duplicate_bibtex_entry_keys,
+    duplicate_bibtex_string_keys,
+    "@article{a, title = {Not closed\n@article{b, title = {B}}",
+    "@article{a title = {No comma}}\n@article{b, title = {B}}",
+    '@article{a, title = "Not closed}\n@article{b, title = {B}}',
+    "@article{a, title {No equals}}\n@article{b, title = {B}}",
+    "@string{noequals}\n@article{b, title = {B}}",
+    "@comment{Not closed\n  @preamble{Not closed",
+    "@article{a, title = {A}",
+    "Line ends with a backslash \\\n@article{a, title = {A \\\n B}}\n% Comment",
+    "",
+]
+
+
+class _Recorder(ParseHandler):
+    """Records the events, in the form of `_block_summary`."""
+
+    def __init__(self):
+        self.events = []
+        self._entry = None
+
+    def on_entry_start(self, entry_type, key, line):
+        self._entry = ("entry", entry_type, key, line, [])
+
+    def on_field(self, key, value, line):
+        self._entry[4].append((key, str(value), line))
+
+    def on_entry_end(self):
+        self.events.append(self._entry)
+
+    def on_string(self, key, value, line):
+        self.events.append(("string", key, value, line))
+
+    def on_preamble(self, value, line):
+        self.events.append(("preamble", value, line))
+
+    def on_comment(self, comment, line, explicit):
+        self.events.append(("comment", comment, line, explicit))
+
+    def on_error(self, error, line, raw):
+        self.events.append(("error", error.abort_reason, line, raw))
+
+
+def _block_summary(block):
+    if isinstance(block, (DuplicateBlockKeyBlock, DuplicateFieldKeyBlock)):
+        block = block.ignore_error_block
+    if isinstance(block, Entry):
+        fields = [(f.key, f.value, f.start_line) for f in block.fields]
+        return ("entry", block.entry_type, block.key, block.start_line, fields)
+    if isinstance(block, String):
+        return ("string", block.key, block.value, block.start_line)
+    if isinstance(block, Preamble):
+        return ("preamble", block.value, block.start_line)
+    if isinstance(block, (ExplicitComment, ImplicitComment)):
+        return ("comment", block.comment, block.start_line, isinstance(block, ExplicitComment))
+    assert isinstance(block, ParsingFailedBlock)
+    return ("error", block.error.abort_reason, block.start_line, block.raw)
+
+
+def _events(bibtex_str, start_line=0):
+    recorder = _Recorder()
+    _scan_events(bibtex_str, recorder, start_line=start_line)
+    return recorder.events
+
+
+@pytest.mark.parametrize("bibtex_str", [VALID_BIBTEX] + IRREGULAR_BIBTEX)
+def test_events_match_splitter(bibtex_str):
+    blocks = Splitter(bibtex_str, start_line=3).split().blocks
+    assert _events(bibtex_str, start_line=3) == [_block_summary(b) for b in blocks]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 64, 10_000])
+def test_parse_events_of_file(tmp_path, chunk_size):
+    path = tmp_path / "library.bib"
+    path.write_text(VALID_BIBTEX, encoding="UTF-8")
+    recorder = _Recorder()
+    parse_events(path, recorder, chunk_size=chunk_size)
+
+    blocks = iter_blocks(io.StringIO(VALID_BIBTEX), chunk_size=chunk_size)
+    assert recorder.events == [_block_summary(b) for b in blocks]
+    with pytest.raises(ValueError):
+        parse_events(io.StringIO(VALID_BIBTEX), recorder, chunk_size=0)
+
+
+def test_default_handler_ignores_events():
+    parse_events(io.StringIO(VALID_BIBTEX + IRREGULAR_BIBTEX[0]), ParseHandler())
+
+
+def test_events_of_mutated_bibtex():
+    """Deleting or inserting characters must never make events and splitter disagree."""
+    rng = random.Random(0)
+    for _ in range(300):
+        position = rng.randrange(len(VALID_BIBTEX))
+        if rng.random() < 0.5:
+            mutated = VALID_BIBTEX[:position] + VALID_BIBTEX[position + 1 :]
+        else:
+            mutated = VALID_BIBTEX[:position] + rng.choice('{}",=@\n') + VALID_BIBTEX[position:]
+        assert _events(mutated) == [_block_summary(b) for b in Splitter(mutated).split().blocks]
@@ -0,0 +1,86 @@
+"""Tests of the dict-only fast path (`parse_to_dicts`) against `parse_string`."""
+
+import random
+
+import pytest
+
+import bibtexparser
+
+from .test_splitter_basic import blocks_not_starting_on_new_lines
+from .test_splitter_basic import duplicate_bibtex_entry_keys
+from .test_splitter_basic import duplicate_bibtex_string_keys
+from .test_splitter_basic import example_bibstr
+
+VALID_BIBTEX = r"""% A comment with @ sign and {braces}
+@String{jmlr = {Journal of Machine Learning Research}}
+@string{ nips = "NeurIPS" }
+@preamble{"\newcommand{\noop}[1]{}"}
+@comment{ @article{ignored, title = {Ignored}} }
+
+@Article{first,
+  author = {M{\"u}ller, J. and Doe, John},
+  title = "A {"}quoted{"} title, with {nested {braces}} and @ {ICML}",
+  journal = jmlr,
+  booktitle = nips,
+  year = 2020,
+  note = unknownstring,
+  escaped = {50\% and \{ and \"},
+}
+@misc{noFields}
+@misc {spaced, title = {Space before bracket}}@book{sameLine,title={Same line}}
+@article{dupFields, title = {A}, title = {B}}
+@article{first, title = {Duplicate key}}
+@string{nips = "Duplicate string"}
+@inproceedings{last, title = "T" # nips, year = {2021}}
+"""
+
+
+def _expected(bibtex_str, **kwargs):
+    parse_stack = []
+    if kwargs.get("resolve_strings", True):
+        parse_stack.append(bibtexparser.middlewares.ResolveStringReferencesMiddleware())
+    if kwargs.get("remove_enclosing", True):
+        parse_stack.append(bibtexparser.middlewares.RemoveEnclosingMiddleware())
+    library = bibtexparser.parse_string(bibtex_str, parse_stack=parse_stack)
+    return [dict(entry.items()) for entry in library.entries]
+
+
+@pytest.mark.parametrize("resolve_strings", [True, False])
+@pytest.mark.parametrize("remove_enclosing", [True, False])
+def test_parse_to_dicts_matches_parse_string(resolve_strings, remove_enclosing):
+    kwargs = dict(resolve_strings=resolve_strings, remove_enclosing=remove_enclosing)
+    assert bibtexparser.parse_to_dicts(VALID_BIBTEX, **kwargs) == _expected(VALID_BIBTEX, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "bibtex_str",
+    [
+        example_bibstr,
+        blocks_not_starting_on_new_lines,
+        duplicate_bibtex_entry_keys,
+        duplicate_bibtex_string_keys,
+        "@article{a, title = {Not closed\n@article{b, title = {B}}",
+        "@article{a title = {No comma}}\n@article{b, title = {B}}",
+        '@article{a, title = "Not closed}\n@article{b, title = {B}}',
+        "@article{a, title {No equals}}\n@article{b, title = {B}}",
+        "@string{noequals}\n@article{b, title = {B}}",
+        "@comment{Not closed\n  @preamble{Not closed",
+        "@article{a, title = {A}",
+        "Line ends with a backslash \\\n@article{a, title = {A \\\n B}}\n% Comment",
+        "",
+    ],
+)
+def test_parse_to_dicts_of_irregular_bibtex(bibtex_str):
+    assert bibtexparser.parse_to_dicts(bibtex_str) == _expected(bibtex_str)
+
+
+def test_parse_to_dicts_of_mutated_bibtex():
+    """Deleting or inserting characters must never make both parse modes disagree."""
+    rng = random.Random(0)
+    for _ in range(300):
+        position = rng.randrange(len(VALID_BIBTEX))
+        if rng.random() < 0.5:
+            mutated = VALID_BIBTEX[:position] + VALID_BIBTEX[position + 1 :]
+        else:
+            mutated = VALID_BIBTEX[:position] + rng.choice('{}",=@\n') + VALID_BIBTEX[position:]
+        assert bibtexparser.parse_to_dicts(mutated) == _expected(mutated), mutated
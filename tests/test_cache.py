@@ -0,0 +1,227 @@
+import os
+import pickle
+import re
+
+import pytest
+
+from bibtexparser import Parser
+from bibtexparser import cache
+from bibtexparser import parse_file
+from bibtexparser import write_string
+from bibtexparser.cache import cache_key
+from bibtexparser.cache import evict
+from bibtexparser.cache import load
+from bibtexparser.cache import store
+from bibtexparser.middlewares import LatexDecodingMiddleware
+from bibtexparser.middlewares import LatexEncodingMiddleware
+from bibtexparser.middlewares import SortBlocksByTypeAndKeyMiddleware
+from bibtexparser.middlewares.middleware import BlockMiddleware
+from bibtexparser.middlewares.parsestack import default_parse_stack
+from bibtexparser.model import Entry
+from bibtexparser.model import Field
+
+BIBTEX = r"""@string{jmlr = {Journal of Machine Learning Research}}
+
+@article{smith2020,
+  author = {Sm{\"i}th, John},
+  title = {A Title},
+  journal = jmlr,
+  year = 2020
+}
+
+@article{smith2020,
+  title = {Duplicate}
+}
+"""
+
+
+@pytest.fixture
+def bib_file(tmp_path):
+    path = tmp_path / "library.bib"
+    path.write_text(BIBTEX, encoding="UTF-8")
+    return path
+
+
+def _cache_files(cache_dir):
+    return sorted(p for p in cache_dir.iterdir() if p.suffix == ".bibcache")
+
+
+def test_cached_library_equals_parsed_library(bib_file, tmp_path):
+    cache_dir = tmp_path / "cache"
+    uncached = parse_file(bib_file, track_modifications=True)
+    first = parse_file(bib_file, track_modifications=True, cache_dir=cache_dir)
+    assert len(_cache_files(cache_dir)) == 1
+
+    # A hit leaves the cache file unchanged
+    with open(_cache_files(cache_dir)[0], "rb") as file:
+        snapshot = file.read()
+    second = parse_file(bib_file, track_modifications=True, cache_dir=cache_dir)
+    assert second is not first
+
+    for library in (first, second):
+        assert write_string(library) == write_string(uncached)
+        assert write_string(library, raw_passthrough=True) == write_string(
+            uncached, raw_passthrough=True
+        )
+        assert len(library.failed_blocks) == 1
+        assert library.failed_blocks[0].previous_block is library.entries[0]
+    with open(_cache_files(cache_dir)[0], "rb") as file:
+        assert file.read() == snapshot
+
+
+def test_cache_key_changes_with_file_and_configuration(bib_file):
+    def key(parse_stack=None, encoding="UTF-8", track_modifications=False):
+        if parse_stack is None:
+            parse_stack = default_parse_stack()
+        return cache_key(bib_file, parse_stack, encoding, track_modifications)
+
+    reference = key()
+    assert key() == reference
+    assert key(encoding="utf-8") == reference
+    assert key(encoding="latin-1") != reference
+    assert key(track_modifications=True) != reference
+    assert key(parse_stack=[]) != reference
+    assert key(parse_stack=default_parse_stack(allow_inplace_modification=False)) != reference
+    assert key(parse_stack=[SortBlocksByTypeAndKeyMiddleware()]) != key(
+        parse_stack=[SortBlocksByTypeAndKeyMiddleware(key=lambda block: block.start_line)]
+    )
+    assert key(parse_stack=[LatexDecodingMiddleware()]) != key(
+        parse_stack=[LatexDecodingMiddleware(keep_braced_groups=True)]
+    )
+    assert key(parse_stack=[LatexDecodingMiddleware()]) != key(
+        parse_stack=[LatexDecodingMiddleware(backend="native")]
+    )
+    assert key(parse_stack=[LatexEncodingMiddleware()]) != key(
+        parse_stack=[LatexEncodingMiddleware(keep_math=False)]
+    )
+    assert key(parse_stack=[LatexEncodingMiddleware()]) is not None
+
+    bib_file.write_text(BIBTEX + "\n", encoding="UTF-8")
+    assert key() != reference
+
+
+def test_cache_key_ignores_runtime_state(bib_file):
+    decoder = LatexDecodingMiddleware()
+    before = cache_key(bib_file, [decoder], "UTF-8", False)
+    Parser(parse_stack=[decoder]).parse_file(bib_file)
+    assert decoder._fast_path_count > 0
+    assert cache_key(bib_file, [decoder], "UTF-8", False) == before
+
+
+class _AddMissingFields(BlockMiddleware):
+    def __init__(self, template: Entry):
+        super().__init__()
+        self.template = template
+
+    def transform_entry(self, entry, library):
+        for field in self.template.fields:
+            if field.key not in entry:
+                entry[field.key] = field.value
+        return entry
+
+
+def test_cache_key_ignores_modification_tracking(bib_file):
+    template = Entry("misc", "template", [Field("note", "n")], raw="@misc{template, ...}")
+    before = cache_key(bib_file, [_AddMissingFields(template)], "UTF-8", False)
+    template.mark_unmodified()
+    assert cache_key(bib_file, [_AddMissingFields(template)], "UTF-8", False) == before
+
+
+class _StripCharacters(BlockMiddleware):
+    def __init__(self, characters: str):
+        super().__init__()
+        self.pattern = re.compile(f"[{characters}]")
+
+    def transform_entry(self, entry, library):
+        entry["title"] = self.pattern.sub("", entry["title"])
+        return entry
+
+
+class _Slotted:
+    __slots__ = ("characters",)
+
+    def __init__(self, characters: str):
+        self.characters = characters
+
+
+def test_configurations_differing_in_regex_or_unknown_objects(bib_file, tmp_path):
+    cache_dir = tmp_path / "cache"
+    for characters, title in (("A", " Title"), ("T", "A itle")):
+        parser = Parser(append_middleware=[_StripCharacters(characters)])
+        assert parser.parse_file(bib_file, cache_dir=cache_dir).entries[0]["title"] == title
+    assert len(_cache_files(cache_dir)) == 2
+
+    # Configurations which can not be described are not cached
+    for configuration in (_Slotted("A"), [[[[[[[[["A"]]]]]]]]]):
+        middleware = _AddMissingFields(Entry("misc", "template", []))
+        middleware.configuration = configuration
+        assert cache_key(bib_file, [middleware], "UTF-8", False) is None
+        Parser(append_middleware=[middleware]).parse_file(bib_file, cache_dir=cache_dir)
+    assert len(_cache_files(cache_dir)) == 2
+
+
+def test_file_changed_while_parsing(bib_file, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    original_cache_key = cache.cache_key
+
+    def cache_key_then_change_file(*args):
+        key = original_cache_key(*args)
+        bib_file.write_text(BIBTEX.replace("A Title", "New Title"), encoding="UTF-8")
+        return key
+
+    # The library is parsed from the content which was hashed, not from the changed file
+    monkeypatch.setattr(cache, "cache_key", cache_key_then_change_file)
+    assert parse_file(bib_file, cache_dir=cache_dir).entries[0]["title"] == "A Title"
+    monkeypatch.undo()
+    assert parse_file(bib_file, cache_dir=cache_dir).entries[0]["title"] == "New Title"
+    assert len(_cache_files(cache_dir)) == 2
+
+
+def test_line_endings_are_normalized(tmp_path):
+    path = tmp_path / "crlf.bib"
+    path.write_bytes(BIBTEX.replace("\n", "\r\n").encode("UTF-8"))
+    uncached = parse_file(path, track_modifications=True)
+    cached = parse_file(path, track_modifications=True, cache_dir=tmp_path / "cache")
+    assert write_string(cached, raw_passthrough=True) == write_string(
+        uncached, raw_passthrough=True
+    )
+
+
+def test_invalid_cache_files_are_replaced(bib_file, tmp_path):
+    cache_dir = tmp_path / "cache"
+    parser = Parser()
+    parser.parse_file(bib_file, cache_dir=cache_dir)
+    cache_file = _cache_files(cache_dir)[0]
+
+    for content in (b"", b"not a cache file", cache_file.read_bytes()[:40]):
+        cache_file.write_bytes(content)
+        library = parser.parse_file(bib_file, cache_dir=cache_dir)
+        assert [entry.key for entry in library.entries] == ["smith2020"]
+    # Files of another version of the format
+    cache_file.write_bytes(b"bibtexparser-cache\x00\x00\x00\x00\x00" + pickle.dumps(library))
+    assert parser.parse_file(bib_file, cache_dir=cache_dir).entries[0]["title"] == "A Title"
+    assert not cache_file.read_bytes().startswith(b"bibtexparser-cache\x00\x00\x00\x00\x00")
+    assert load(cache_dir, cache_file.stem).entries[0]["title"] == "A Title"
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    cache_dir = tmp_path / "cache"
+    library = Parser().parse_string(BIBTEX)
+    for i, key in enumerate(["a", "b", "c"]):
+        store(cache_dir, key, library)
+        os.utime(cache_dir / f"{key}.bibcache", (i, i))
+    size = (cache_dir / "a.bibcache").stat().st_size
+
+    assert load(cache_dir, "a") is not None  # "a" is now the most recently used
+    store(cache_dir, "d", library, max_size=3 * size)
+    assert [p.stem for p in _cache_files(cache_dir)] == ["a", "c", "d"]
+
+    # Libraries larger than the cache are not stored
+    store(cache_dir, "e", library, max_size=size - 1)
+    assert load(cache_dir, "e") is None
+    assert len(_cache_files(cache_dir)) == 3
+
+    (cache_dir / "unrelated.txt").write_text("kept")
+    evict(cache_dir, 0)
+    assert _cache_files(cache_dir) == []
+    assert (cache_dir / "unrelated.txt").exists()
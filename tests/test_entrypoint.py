@@ -1,17 +1,28 @@
 """Testing the parse_file and write_file functions."""
 
+import copy
 import os
 import tempfile
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
+from bibtexparser import Parser
+from bibtexparser import Writer
 from bibtexparser import parse_file
+from bibtexparser import parse_string
 from bibtexparser import write_file
 from bibtexparser import write_string
 from bibtexparser.library import Library
+from bibtexparser.middlewares import MergeCoAuthors
+from bibtexparser.middlewares import SeparateCoAuthors
+from bibtexparser.middlewares import SortBlocksByTypeAndKeyMiddleware
+from bibtexparser.middlewares.parsestack import default_unparse_stack
 from bibtexparser.model import Entry
 from bibtexparser.model import Field
+from bibtexparser.writer import BibtexFormat
+from bibtexparser.writer import write
 
 
 def test_gbk():
@@ -241,3 +252,214 @@ def test_write_string_unexpected_keyword_argument_raises_error():
         write_string(library, unknown_param="value")
     assert "unexpected keyword arguments" in str(excinfo.value)
     assert "unknown_param" in str(excinfo.value)
+
+
+def test_parser_is_reusable():
+    """A single Parser instance can be used for many inputs, with the same stack."""
+    parser = Parser()
+    stack = parser.parse_stack
+
+    first = parser.parse_string("@article{a, title = {First}}")
+    second = parser.parse_string('@article{b, title = "Second"}')
+
+    assert parser.parse_stack is stack
+    assert first.entries[0]["title"] == "First"
+    assert second.entries[0]["title"] == "Second"
+    assert len(first.entries) == 1
+    assert len(second.entries) == 1
+
+
+def test_parser_parse_file_matches_function():
+    parser = Parser()
+    library = parser.parse_file("tests/resources/gbk_test.bib", encoding="gbk")
+    expected = parse_file("tests/resources/gbk_test.bib", encoding="gbk")
+    assert library.entries[0].fields == expected.entries[0].fields
+
+
+def test_parser_unknown_encoding():
+    with pytest.raises(LookupError):
+        Parser().parse_file("tests/resources/gbk_test.bib", encoding="not-an-encoding")
+
+
+def test_parser_rejects_parse_stack_and_append_middleware():
+    with pytest.raises(ValueError):
+        Parser(parse_stack=[], append_middleware=[])
+
+
+def test_writer_is_reusable():
+    """A single Writer instance can be used for many libraries, without mutating them."""
+    writer = Writer()
+    library = parse_string("@article{a, title = {First}}")
+
+    assert writer.write_string(library) == write_string(library)
+    assert writer.write_string(library) == write_string(library)
+    assert library.entries[0]["title"] == "First"
+
+
+def test_writer_write_file(tmp_path):
+    library = parse_string("@article{a, title = {First}}")
+    path = str(tmp_path / "out.bib")
+    Writer().write_file(path, library)
+    with open(path, encoding="UTF-8") as f:
+        assert f.read() == write_string(library)
+
+
+_STREAMING_BIBTEX = """% A comment
+@string{me = "Me"}
+@article{b, author = {B. One and B. Two}, year = 2020}
+@article{a, title = {First}, journal = me}
+"""
+
+
+def _auto_format():
+    bibtex_format = BibtexFormat()
+    bibtex_format.value_column = "auto"
+    return bibtex_format
+
+
+@pytest.mark.parametrize(
+    "writer_kwargs",
+    [
+        {},
+        {"prepend_middleware": [MergeCoAuthors(allow_inplace_modification=False)]},
+        {"prepend_middleware": [SortBlocksByTypeAndKeyMiddleware()]},
+        {
+            "unparse_stack": [
+                MergeCoAuthors(allow_inplace_modification=False),
+                SortBlocksByTypeAndKeyMiddleware(),
+            ]
+        },
+        {"bibtex_format": _auto_format()},
+    ],
+    ids=[
+        "default",
+        "block middleware",
+        "library middleware",
+        "library middleware last",
+        "auto align",
+    ],
+)
+def test_writer_write_iter_matches_write_string(writer_kwargs):
+    library = parse_string(_STREAMING_BIBTEX, append_middleware=[SeparateCoAuthors()])
+    writer = Writer(**writer_kwargs)
+    expected = writer.write_string(library)
+
+    pieces = list(writer.write_iter(library))
+    assert len(pieces) == len(library.blocks)
+    assert "".join(pieces) == expected
+    # The library is not modified
+    assert library.entries[0]["author"] == ["B. One", "B. Two"]
+    assert library.entries[1]["title"] == "First"
+
+
+@pytest.mark.parametrize(
+    "parse_middleware",
+    [[], [SeparateCoAuthors(), MergeCoAuthors()]],
+    ids=["default", "with name middleware"],
+)
+def test_writer_adds_enclosing_while_rendering(parse_middleware):
+    """The default unparse stack is applied while rendering, without copying the library."""
+    library = parse_string(
+        '@string{me = "Me"}\n@article{a, title = "First", year = 2020, journal = me,'
+        " pages = {1--2}, author = {A and B}}\n@preamble{p}\n",
+        append_middleware=parse_middleware,
+    )
+    unparse_stack = default_unparse_stack(allow_inplace_modification=False)
+    transformed = library
+    for middleware in unparse_stack:
+        transformed = middleware.transform(transformed)
+    expected = write(transformed)
+
+    original_blocks = copy.deepcopy(library.blocks)
+    assert write_string(library) == expected
+    assert Writer(prepend_middleware=[MergeCoAuthors()]).write_string(library) == expected
+    assert "".join(Writer().write_iter(library)) == expected
+    assert library.blocks == original_blocks
+
+
+@pytest.mark.parametrize("raw_passthrough", [False, True])
+def test_writer_with_workers(raw_passthrough):
+    bibtex_str = "\n\n".join(
+        f"@article{{key{i}, author = {{A{i} and B{i}}}, year = {i}}}" for i in range(40)
+    )
+    library = parse_string(
+        bibtex_str, append_middleware=[SeparateCoAuthors()], track_modifications=raw_passthrough
+    )
+    library.entries[3]["year"] = "changed"
+    writer_kwargs = {
+        "prepend_middleware": [MergeCoAuthors(allow_inplace_modification=False)],
+        "raw_passthrough": raw_passthrough,
+    }
+
+    expected = Writer(**writer_kwargs).write_string(library)
+    assert Writer(workers=3, **writer_kwargs).write_string(library) == expected
+    assert library.entries[0]["author"] == ["A0", "B0"]
+
+
+def test_writer_rejects_invalid_workers():
+    with pytest.raises(ValueError):
+        Writer(workers=0)
+
+
+def test_writer_write_file_streaming(tmp_path):
+    library = parse_string(_STREAMING_BIBTEX)
+    path = str(tmp_path / "out.bib")
+    write_file(path, library, streaming=True)
+    with open(path, encoding="UTF-8") as f:
+        assert f.read() == write_string(library)
+
+
+_RAW_BIBTEX = """@string{me = "Me"}
+
+@ARTICLE{a,
+    title = "First",  journal=me
+}
+
+% A comment
+
+@article{b, author = {B. One and B. Two},year = 2020}
+"""
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_write_raw_passthrough(tmp_path, streaming):
+    library = parse_string(_RAW_BIBTEX, track_modifications=True)
+    bibtex_format = BibtexFormat()
+    bibtex_format.block_separator = "\n"
+
+    # Unmodified libraries are written as they were read
+    path = str(tmp_path / "out.bib")
+    write_file(
+        path, library, bibtex_format=bibtex_format, raw_passthrough=True, streaming=streaming
+    )
+    with open(path, encoding="UTF-8") as f:
+        assert f.read() == _RAW_BIBTEX
+
+    # Only modified blocks are re-rendered
+    library.entries_dict["b"]["year"] = "2021"
+    library.add(Entry("misc", "c", [Field("title", "New")]))
+    written = write_string(library, bibtex_format=bibtex_format, raw_passthrough=True)
+    assert written.startswith(_RAW_BIBTEX.split("@article{b")[0])
+    assert written.endswith(
+        "@article{b,\n\tauthor = {B. One and B. Two},\n\tyear = {2021}\n}\n"
+        "\n@misc{c,\n\ttitle = {New}\n}\n"
+    )
+
+    # Without tracking or passthrough, all blocks are rendered
+    untracked = parse_string(_RAW_BIBTEX)
+    assert write_string(untracked, raw_passthrough=True) == write_string(untracked)
+    assert "@ARTICLE{a" not in write_string(library)
+
+
+def test_parser_and_writer_are_threadsafe():
+    parser = Parser()
+    writer = Writer()
+    inputs = [f"@article{{key{i}, title = {{Title {i}}}}}" for i in range(50)]
+
+    def roundtrip(bibtex_str):
+        return writer.write_string(parser.parse_string(bibtex_str))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(roundtrip, inputs))
+
+    assert results == [roundtrip(s) for s in inputs]
@@ -0,0 +1,199 @@
+import csv
+import io
+import json
+
+import pytest
+
+from bibtexparser import Parser
+from bibtexparser import parse_string
+from bibtexparser.export import _parse_in_batches
+from bibtexparser.export import convert
+from bibtexparser.export import csl_item
+from bibtexparser.export import write_csl_json
+from bibtexparser.export import write_csv
+from bibtexparser.export import write_jsonl
+from bibtexparser.middlewares import NormalizeFieldKeys
+from bibtexparser.middlewares import RemoveEnclosingMiddleware
+from bibtexparser.middlewares import ResolveStringExpressionsMiddleware
+from bibtexparser.middlewares import SeparateCoAuthors
+from bibtexparser.middlewares import SplitNameParts
+from bibtexparser.middlewares.middleware import LibraryMiddleware
+from bibtexparser.model import Entry
+from bibtexparser.model import Field
+from bibtexparser.streaming import iter_blocks
+
+BIBTEX = r"""@string{jmlr = {Journal of Machine Learning Research}}
+
+@article{smith2020,
+  author = {Smith, John and van der Berg, Jr., Jane},
+  title = {A Title, with "Quotes"},
+  journal = jmlr,
+  year = 2020,
+  month = mar,
+  pages = {12--23}
+}
+
+@comment{Not exported}
+
+@phdthesis{doe2019,
+  author = "Doe, J.",
+  title = {Thesis},
+  school = {Some University},
+  year = {2019},
+  note = {Ünïcode}
+}
+"""
+
+
+def test_write_jsonl():
+    out = io.StringIO()
+    assert write_jsonl(parse_string(BIBTEX), out) == 2
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 2
+    first = json.loads(lines[0])
+    assert first == dict(parse_string(BIBTEX).entries[0].items())
+    assert first["journal"] == "Journal of Machine Learning Research"
+    assert "Ünïcode" in lines[1]
+
+
+def test_write_jsonl_with_name_parts():
+    library = parse_string(BIBTEX, append_middleware=[SeparateCoAuthors(), SplitNameParts()])
+    out = io.StringIO()
+    write_jsonl(library, out)
+    authors = json.loads(out.getvalue().splitlines()[0])["author"]
+    assert authors[1] == {"first": ["Jane"], "von": ["van", "der"], "last": ["Berg"], "jr": ["Jr."]}
+
+
+def test_write_csv():
+    out = io.StringIO(newline="")
+    assert write_csv(parse_string(BIBTEX), out, fields=["ID", "title", "school"]) == 2
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows == [
+        ["ID", "title", "school"],
+        ["smith2020", 'A Title, with "Quotes"', ""],
+        ["doe2019", "Thesis", "Some University"],
+    ]
+
+
+def test_write_csv_default_fields_and_options():
+    library = parse_string(BIBTEX, append_middleware=[SeparateCoAuthors()])
+    out = io.StringIO(newline="")
+    write_csv(library, out, delimiter=";")
+    rows = list(csv.DictReader(io.StringIO(out.getvalue()), delimiter=";"))
+    assert rows[0]["ENTRYTYPE"] == "article"
+    assert rows[0]["author"] == "Smith, John and van der Berg, Jr., Jane"
+    assert rows[1]["year"] == "2019"
+
+
+def test_csl_item():
+    library = parse_string(BIBTEX)
+    assert csl_item(library.entries[0]) == {
+        "id": "smith2020",
+        "type": "article-journal",
+        "author": [
+            {"family": "Smith", "given": "John"},
+            {
+                "family": "Berg",
+                "given": "Jane",
+                "non-dropping-particle": "van der",
+                "suffix": "Jr.",
+            },
+        ],
+        "title": 'A Title, with "Quotes"',
+        "container-title": "Journal of Machine Learning Research",
+        "page": "12-23",
+        "issued": {"date-parts": [[2020, 3]]},
+    }
+    thesis = csl_item(library.entries[1])
+    assert thesis["type"] == "thesis"
+    assert thesis["genre"] == "PhD thesis"
+    assert thesis["publisher"] == "Some University"
+    assert thesis["issued"] == {"date-parts": [[2019]]}
+
+    unusual = csl_item(Entry("customtype", "x", [Field("year", "to appear")]))
+    assert unusual == {"id": "x", "type": "document", "issued": {"literal": "to appear"}}
+
+
+@pytest.mark.parametrize("num_entries", [0, 1, 2])
+def test_write_csl_json(num_entries):
+    entries = parse_string(BIBTEX).entries[:num_entries]
+    out = io.StringIO()
+    assert write_csl_json(entries, out) == num_entries
+    assert [item["id"] for item in json.loads(out.getvalue())] == [e.key for e in entries]
+
+
+def test_exporters_accept_block_streams():
+    out = io.StringIO()
+    # Without parse stack, values are still enclosed and references unresolved
+    write_jsonl(iter_blocks(io.StringIO(BIBTEX)), out)
+    assert json.loads(out.getvalue().splitlines()[0])["journal"] == "jmlr"
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 100])
+def test_convert(tmp_path, batch_size):
+    source = tmp_path / "library.bib"
+    source.write_text(BIBTEX, encoding="UTF-8")
+    destination = tmp_path / "library.jsonl"
+
+    assert convert(source, destination, to="jsonl", batch_size=batch_size) == 2
+    expected = io.StringIO()
+    write_jsonl(parse_string(BIBTEX), expected)
+    assert destination.read_text(encoding="UTF-8") == expected.getvalue()
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 100])
+def test_parse_in_batches_yields_every_block_once(batch_size):
+    blocks = list(_parse_in_batches(iter_blocks(io.StringIO(BIBTEX)), Parser(), batch_size))
+    expected = parse_string(BIBTEX).blocks
+    # The @string definitions of previous batches (used to resolve references) are not yielded
+    assert [type(block) for block in blocks] == [type(block) for block in expected]
+    assert [block.raw for block in blocks] == [block.raw for block in expected]
+
+
+class _RecordStrings(LibraryMiddleware):
+    def __init__(self):
+        super().__init__()
+        self.recorded = []
+
+    def transform(self, library):
+        self.recorded.append(dict(library.strings_dict))
+        return library
+
+
+def test_parse_in_batches_shares_strings_of_previous_batches():
+    bibtex = (
+        "@string{a = {A}}\n\n@string{b = {B}}\n\n@string{a = {Redefined}}\n\n"
+        "@article{x, title = a # b}\n"
+    )
+    recorder = _RecordStrings()
+    # Block middleware returns a new library, before the strings are resolved
+    parse_stack = [
+        NormalizeFieldKeys(),
+        recorder,
+        ResolveStringExpressionsMiddleware(),
+        RemoveEnclosingMiddleware(),
+    ]
+    parser = Parser(parse_stack=parse_stack)
+    blocks = list(_parse_in_batches(iter_blocks(io.StringIO(bibtex)), parser, 1))
+    # The unparsed @string blocks are copied once, and shared by all later batches
+    assert len(recorder.recorded) == 4
+    assert recorder.recorded[3]["a"] is recorder.recorded[1]["a"]
+    assert recorder.recorded[3]["a"].value == "{A}"
+
+    expected = parser.parse_string(bibtex).blocks
+    assert [type(block) for block in blocks] == [type(block) for block in expected]
+    assert blocks[-1]["title"] == "AB"
+
+
+def test_convert_with_options(tmp_path):
+    destination = tmp_path / "library.csv"
+    parser = Parser(append_middleware=[SeparateCoAuthors()])
+    convert(io.StringIO(BIBTEX), destination, to="csv", parser=parser, fields=["ID", "author"])
+    with open(destination, encoding="UTF-8", newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[2] == ["doe2019", "Doe, J."]
+
+    with pytest.raises(ValueError, match="Unknown export format"):
+        convert(io.StringIO(BIBTEX), io.StringIO(), to="yaml")
+    with pytest.raises(ValueError):
+        convert(io.StringIO(BIBTEX), io.StringIO(), to="jsonl", batch_size=0)
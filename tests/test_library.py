@@ -1,8 +1,11 @@
+import pickle
+
 import pytest
 
 from bibtexparser import Library
 from bibtexparser.model import Entry
 from bibtexparser.model import Field
+from bibtexparser.model import String
 
 
 def get_dummy_entry():
@@ -66,3 +69,38 @@ def test_fail_on_duplicate_add():
         library.add(get_dummy_entry(), fail_on_duplicate_key=True)
     assert len(library.blocks) == 2
     assert len(library.failed_blocks) == 1
+
+
+def _index_summary(library):
+    return (
+        [(key, library.blocks.index(block)) for key, block in library.entries_dict.items()],
+        [(key, library.blocks.index(block)) for key, block in library.strings_dict.items()],
+    )
+
+
+@pytest.mark.parametrize("replace", [False, True])
+def test_pickle_round_trip(replace):
+    library = Library(
+        [
+            String("s1", "{One}"),
+            get_dummy_entry(),
+            String("s2", "{Two}"),
+            Entry("book", "other", [Field("title", "Other")]),
+            get_dummy_entry(),
+        ]
+    )
+    if replace:
+        # The order of the key indexes then differs from the order of the blocks
+        library.replace(library.blocks[0], String("s3", "{Three}"))
+
+    unpickled = pickle.loads(pickle.dumps(library))
+    # Failed blocks hold exceptions, which never compare equal
+    assert unpickled.blocks[:4] == library.blocks[:4]
+    assert unpickled.blocks[4].ignore_error_block == library.blocks[4].ignore_error_block
+    assert _index_summary(unpickled) == _index_summary(library)
+    assert [s.key for s in unpickled.strings] == [s.key for s in library.strings]
+    assert unpickled.failed_blocks[0].previous_block is unpickled.entries[0]
+
+    unpickled.add(Entry("article", "new", []))
+    assert "new" in unpickled.entries_dict
+    assert "new" not in library.entries_dict
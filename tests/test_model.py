@@ -1,9 +1,11 @@
+import pickle
 from copy import copy
 from copy import deepcopy
 from textwrap import dedent
 
 import pytest
 
+from bibtexparser.model import DuplicateBlockKeyBlock
 from bibtexparser.model import Entry
 from bibtexparser.model import ExplicitComment
 from bibtexparser.model import Field
@@ -340,3 +342,101 @@ def test_entry_fields_shorthand():
     assert len([f for f in entry.fields if f.key == "myNewField"]) == 0
     with pytest.raises(KeyError):
         entry["myNewField"]
+
+
+@pytest.mark.parametrize(
+    "block, modify",
+    [
+        (
+            Entry("article", "key", [Field("author", ["A", "B"])], raw="@article{key, ...}"),
+            lambda block: block["author"].append("C"),
+        ),
+        (
+            Entry("article", "key", [Field("title", "T")], raw="@article{key, ...}"),
+            lambda block: setattr(block, "key", "other"),
+        ),
+        (String("me", "Me", raw='@string{me = "Me"}'), lambda block: setattr(block, "value", "I")),
+        (Preamble("p", raw="@preamble{p}"), lambda block: setattr(block, "value", "q")),
+        (ExplicitComment("c", raw="@comment{c}"), lambda block: setattr(block, "comment", "d")),
+        (ImplicitComment("c", raw="c"), lambda block: setattr(block, "comment", "d")),
+    ],
+)
+def test_block_is_unmodified(block, modify):
+    assert not block.is_unmodified()
+    unmarked = deepcopy(block)
+    block.mark_unmodified()
+    assert block.is_unmodified()
+    assert deepcopy(block).is_unmodified()
+    # Marking a block changes neither its metadata nor its equality to unmarked blocks
+    assert block.parser_metadata == {}
+    assert block == unmarked and unmarked == block
+
+    modify(block)
+    assert not block.is_unmodified()
+
+
+def test_block_without_raw_is_never_unmodified():
+    entry = Entry("article", "key", [Field("title", "T")])
+    entry.mark_unmodified()
+    assert not entry.is_unmodified()
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+@pytest.mark.parametrize(
+    "block",
+    [
+        Entry(
+            "article",
+            "key",
+            [Field("author", ["A", "B"], 12), Field("title", "T", 13), Field("note", 1, None)],
+            start_line=11,
+            raw="@article{key, ...}",
+        ),
+        Entry("misc", "empty", []),
+        Entry("misc", "tuple_fields", (Field("title", "T"),)),
+        String("me", "Me", 3, raw='@string{me = "Me"}'),
+        Preamble("p", raw="@preamble{p}"),
+        ExplicitComment("c", 0),
+        ImplicitComment("c"),
+        Field("title", "T", 2),
+    ],
+)
+def test_pickle_round_trip(block, protocol):
+    if isinstance(block, Entry):
+        block.mark_unmodified()
+    unpickled = pickle.loads(pickle.dumps(block, protocol=protocol))
+    assert type(unpickled) is type(block)
+    assert unpickled == block
+    if isinstance(block, Entry):
+        assert list(unpickled.fields) == list(block.fields)
+        assert unpickled.is_unmodified() == block.is_unmodified()
+
+
+def test_pickle_entry_shares_field_keys():
+    entries = [Entry("article", f"e{i}", [Field("title" + "", f"T{i}", i)]) for i in range(2)]
+    entries[1].fields[0].key = "".join(["ti", "tle"])
+    assert entries[0].fields[0].key is not entries[1].fields[0].key
+
+    unpickled = pickle.loads(pickle.dumps(entries))
+    assert unpickled == entries
+    assert unpickled[0].fields[0].key is unpickled[1].fields[0].key
+
+
+class _AnnotatedField(Field):
+    pass
+
+
+def test_pickle_subclasses_and_additional_state():
+    entry = Entry("article", "key", [_AnnotatedField("title", "T", 1), Field("year", "2000")], 1)
+    entry.fields[1].comment = "a field with an additional attribute"
+    entry.note = "an entry with an additional attribute"
+    duplicate = DuplicateBlockKeyBlock("key", entry, Entry("article", "key", []), 5, "raw")
+
+    unpickled_entry, unpickled_duplicate = pickle.loads(pickle.dumps([entry, duplicate]))
+    assert unpickled_entry == entry
+    assert type(unpickled_entry.fields[0]) is _AnnotatedField
+    assert unpickled_entry.fields[1].comment == entry.fields[1].comment
+    assert unpickled_entry.note == entry.note
+    assert unpickled_duplicate.previous_block is unpickled_entry
+    assert unpickled_duplicate.ignore_error_block == duplicate.ignore_error_block
+    assert str(unpickled_duplicate.error) == str(duplicate.error)
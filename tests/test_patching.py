@@ -0,0 +1,133 @@
+import os
+
+import pytest
+
+from bibtexparser import Library
+from bibtexparser import parse_file
+from bibtexparser import patch_file
+from bibtexparser import write_string
+from bibtexparser.model import Entry
+from bibtexparser.model import Field
+
+BIBTEX = """% Leading comment
+@string{me = "Me"}
+
+@ARTICLE{a,
+    title = "First",  journal=me
+}
+
+@article{b, title = {Second}}
+
+@article{c,
+  title = {Third}
+}
+"""
+
+
+@pytest.fixture
+def bib_path(tmp_path):
+    path = str(tmp_path / "library.bib")
+    with open(path, "w", encoding="UTF-8", newline="") as f:
+        f.write(BIBTEX)
+    return path
+
+
+def _read(path, newline=None):
+    with open(path, encoding="UTF-8", newline=newline) as f:
+        return f.read()
+
+
+def test_patch_changed_blocks(bib_path):
+    library = parse_file(bib_path, track_modifications=True)
+    library.entries_dict["b"]["title"] = "Changed"
+
+    patch_file(bib_path, library)
+    assert _read(bib_path) == BIBTEX.replace(
+        "@article{b, title = {Second}}", "@article{b,\n\ttitle = {Changed}\n}"
+    )
+    assert len(os.listdir(os.path.dirname(bib_path))) == 1
+
+    # The positions of the blocks are updated, such that the file can be patched again
+    assert library.entries_dict["c"].start_line == 11
+    library.entries_dict["c"]["title"] = "Changed again"
+    library.entries_dict["a"].key = "renamed"
+    patch_file(bib_path, library)
+    reparsed = parse_file(bib_path)
+    assert [e.key for e in reparsed.entries] == ["renamed", "b", "c"]
+    assert reparsed.entries_dict["c"]["title"] == "Changed again"
+    assert reparsed.entries_dict["renamed"]["journal"] == "Me"
+    assert _read(bib_path).startswith('% Leading comment\n@string{me = "Me"}\n\n@article{renamed')
+
+
+def test_patch_keeps_failed_blocks(bib_path):
+    bibtex = BIBTEX + "\n@article{b, title = {Duplicate}}\n\n@misc{broken, title = {Missing\n"
+    with open(bib_path, "w", encoding="UTF-8", newline="") as f:
+        f.write(bibtex)
+    library = parse_file(bib_path, track_modifications=True)
+    assert len(library.failed_blocks) == 2
+
+    for title in ("Changed", "Changed again"):
+        library.entries_dict["a"]["title"] = title
+        patch_file(bib_path, library)
+        patched = _read(bib_path)
+        assert "WARNING" not in patched
+        assert patched.endswith(
+            "\n\n@article{b, title = {Duplicate}}\n\n@misc{broken, title = {Missing\n"
+        )
+    assert parse_file(bib_path).entries_dict["a"]["title"] == "Changed again"
+
+
+def test_patch_added_and_removed_blocks(bib_path):
+    library = parse_file(bib_path, track_modifications=True)
+    removed = library.entries_dict["b"]
+    library.remove(removed)
+    library.add(Entry("misc", "new", [Field("title", "New")]))
+
+    patch_file(bib_path, library, removed_blocks=[removed])
+    patched = _read(bib_path)
+    assert "@article{b" not in patched
+    assert "}\n\n@article{c" in patched
+    assert patched.endswith("}\n\n@misc{new,\n\ttitle = {New}\n}\n")
+
+    library.entries_dict["new"]["title"] = "Newer"
+    patch_file(bib_path, library)
+    assert parse_file(bib_path).entries_dict["new"]["title"] == "Newer"
+    assert write_string(parse_file(bib_path)) == write_string(library)
+
+
+def test_patch_explicit_changed_blocks_keeps_line_endings(bib_path):
+    with open(bib_path, "w", encoding="UTF-8", newline="\r\n") as f:
+        f.write(BIBTEX)
+    library = parse_file(bib_path)
+    library.entries_dict["a"]["title"] = "Changed"
+
+    patch_file(bib_path, library, changed_blocks=[library.entries_dict["a"]])
+    patched = _read(bib_path, newline="")
+    assert "\n" not in patched.replace("\r\n", "")
+    assert patched.replace("\r\n", "\n") == BIBTEX.replace(
+        '@ARTICLE{a,\n    title = "First",  journal=me\n}',
+        "@article{a,\n\ttitle = {Changed},\n\tjournal = {Me}\n}",
+    )
+
+
+def test_patch_file_changed_since_parsing(bib_path):
+    library = parse_file(bib_path, track_modifications=True)
+    library.entries_dict["c"]["title"] = "Changed"
+    with open(bib_path, "w", encoding="UTF-8") as f:
+        f.write(BIBTEX.replace("Third", "Edited elsewhere"))
+
+    with pytest.raises(ValueError, match="not found"):
+        patch_file(bib_path, library)
+    # The file is left untouched
+    assert "Edited elsewhere" in _read(bib_path)
+    assert len(os.listdir(os.path.dirname(bib_path))) == 1
+
+
+def test_patch_empty_file(tmp_path):
+    path = str(tmp_path / "empty.bib")
+    open(path, "w").close()
+    library = parse_file(path, track_modifications=True)
+    library.add(Entry("misc", "new", [Field("title", "New")]))
+
+    patch_file(path, library)
+    assert _read(path) == write_string(Library([library.entries[0]]))
@@ -0,0 +1,124 @@
+import pytest
+
+from bibtexparser import Library
+from bibtexparser import PersonIndex
+from bibtexparser import parse_string
+from bibtexparser.middlewares import SeparateCoAuthors
+from bibtexparser.middlewares import SplitNameParts
+from bibtexparser.model import Entry
+from bibtexparser.model import Field
+from bibtexparser.person_index import PersonKey
+from bibtexparser.person_index import PersonOccurrence
+from bibtexparser.person_index import person_key
+
+BIBTEX = r"""
+@article{knuth1984,
+    author = {Donald E. Knuth},
+    title = {Literate Programming}
+}
+@book{lamport1994,
+    author = {Leslie Lamport},
+    editor = {Knuth, D. E. and Ludwig van Beethoven}
+}
+@inproceedings{both,
+    author = {D. E. Knuth and Lamport, Leslie and {\"O}zt{\"u}rk, Ay{\c{s}}e}
+}
+"""
+
+KNUTH = PersonKey(last="knuth", first_initials="de", von="")
+LAMPORT = PersonKey(last="lamport", first_initials="l", von="")
+OZTURK = PersonKey(last="ozturk", first_initials="a", von="")
+BEETHOVEN = PersonKey(last="beethoven", first_initials="l", von="van")
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Donald E. Knuth", KNUTH),
+        ("Knuth, Donald Ervin", KNUTH),
+        ("KNUTH, D.E.", KNUTH),
+        ("Ludwig van Beethoven", BEETHOVEN),
+        (r"{\"O}zt{\"u}rk, Ay{\c{s}}e", OZTURK),
+        ("Öztürk, A.", OZTURK),
+        ("Jean-Paul Sartre", PersonKey(last="sartre", first_initials="jp", von="")),
+        (r"Stra{\ss}er, Karl", PersonKey(last="strasser", first_initials="k", von="")),
+        ("   ", None),
+    ],
+)
+def test_person_key(name, expected):
+    assert person_key(name) == expected
+
+
+@pytest.mark.parametrize(
+    "middlewares",
+    [[], [SeparateCoAuthors()], [SeparateCoAuthors(), SplitNameParts()]],
+    ids=["raw strings", "separated co-authors", "split name parts"],
+)
+def test_index_lookups(middlewares):
+    library = parse_string(BIBTEX, append_middleware=middlewares)
+    index = PersonIndex(library)
+
+    assert set(index.persons) == {KNUTH, LAMPORT, OZTURK, BEETHOVEN}
+    assert index.entries_for("Knuth, Donald E.") == ["knuth1984", "lamport1994", "both"]
+    assert index.entries_for(KNUTH, fields=["author"]) == ["knuth1984", "both"]
+    assert index.occurrences(LAMPORT) == [
+        PersonOccurrence("lamport1994", "author", 0),
+        PersonOccurrence("both", "author", 1),
+    ]
+    assert index.coauthors(KNUTH) == {LAMPORT: 1, OZTURK: 1}
+    assert index.coauthors(KNUTH, field="editor") == {BEETHOVEN: 1}
+    assert index.entries_for("Unknown Person") == []
+    assert "Leslie Lamport" in index
+
+
+def test_incremental_updates():
+    library = parse_string(BIBTEX)
+    index = PersonIndex(library)
+
+    # Added entries
+    new_entry = Entry("misc", "new", [Field("author", "Ayşe Öztürk and Leslie Lamport")])
+    library.add(new_entry)
+    index.sync()
+    assert index.entries_for(OZTURK) == ["both", "new"]
+
+    # Changed name fields
+    new_entry["author"] = "Ayşe Öztürk"
+    index.sync()
+    assert index.entries_for(LAMPORT) == ["lamport1994", "both"]
+
+    # Removed entries
+    library.remove(library.entries_dict["knuth1984"])
+    index.sync()
+    assert index.entries_for(KNUTH) == ["lamport1994", "both"]
+
+    # Changed keys
+    new_entry.key = "renamed"
+    index.sync()
+    assert index.entries_for(OZTURK) == ["both", "renamed"]
+
+    # Removing the last occurrence removes the person
+    index.remove_entry("renamed")
+    index.remove_entry(library.entries_dict["both"])
+    assert OZTURK not in index
+    assert len(index) == 3
+
+
+def test_manual_index():
+    index = PersonIndex()
+    entry = Entry("misc", "a", [Field("author", "Leslie Lamport")])
+    index.add_entry(entry)
+    with pytest.raises(ValueError):
+        index.add_entry(entry)
+
+    entry["author"] = "Donald Knuth"
+    index.update_entry(entry)
+    assert index.persons == [PersonKey(last="knuth", first_initials="d", von="")]
+
+    with pytest.raises(ValueError):
+        index.sync()
+
+
+def test_index_of_empty_library():
+    index = PersonIndex(Library())
+    assert len(index) == 0
+    assert index.coauthors("Anyone") == {}
@@ -0,0 +1,117 @@
+import multiprocessing
+
+import pytest
+
+from bibtexparser import parse_string
+from bibtexparser.model import Entry
+from bibtexparser.model import Field
+from bibtexparser.shared import SharedLibrary
+
+BIBTEX = r"""@string{jmlr = {Journal of Machine Learning Research}}
+
+@article{smith2020,
+  author = {Smith, John},
+  title = {Ünïcode Title},
+  journal = jmlr,
+  year = 2020
+}
+
+@comment{Not shared}
+
+@book{doe2019,
+  title = {A Book},
+  year = 2020
+}
+
+@misc{empty}
+"""
+
+
+@pytest.fixture
+def library():
+    return parse_string(BIBTEX)
+
+
+@pytest.fixture
+def shared(library):
+    shared = SharedLibrary.create(library)
+    yield shared
+    shared.close()
+    shared.unlink()
+
+
+def test_entries_match_library(library, shared):
+    assert len(shared) == len(library.entries)
+    assert list(shared.keys()) == [entry.key for entry in library.entries]
+    for view, entry in zip(shared, library.entries):
+        assert view.entry_type == entry.entry_type
+        assert view.key == entry.key
+        assert view.items() == entry.items()
+        assert view.fields == [Field(f.key, f.value) for f in entry.fields]
+        assert view.to_entry() == Entry(entry.entry_type, entry.key, view.fields)
+
+
+def test_lookup(shared):
+    entry = shared["smith2020"]
+    assert entry["title"] == "Ünïcode Title"
+    assert entry["journal"] == "Journal of Machine Learning Research"
+    assert entry["ENTRYTYPE"] == "article"
+    assert entry["ID"] == "smith2020"
+    assert "year" in entry and "volume" not in entry
+    assert entry.get("year") == Field("year", "2020")
+    assert entry.get("volume", "default") == "default"
+    assert entry.fields_dict["author"].value == "Smith, John"
+    with pytest.raises(KeyError):
+        entry["volume"]
+
+    assert "doe2019" in shared and "Doe2019" not in shared
+    assert shared.get("doe2019").fields[0].value == "A Book"
+    assert shared.get("missing") is None
+    assert shared["empty"].fields == []
+    with pytest.raises(KeyError):
+        shared["missing"]
+
+
+def test_many_entries_and_empty_library():
+    entries = [Entry("article", f"key{i}", [Field("title", f"Title {i}")]) for i in range(1000)]
+    with SharedLibrary.create(entries) as shared:
+        assert all(shared[f"key{i}"]["title"] == f"Title {i}" for i in range(1000))
+        assert "key1000" not in shared
+        shared.unlink()
+
+    with SharedLibrary.create([]) as shared:
+        assert len(shared) == 0
+        assert "key" not in shared
+        shared.unlink()
+
+
+def test_invalid_libraries():
+    with pytest.raises(ValueError, match="Duplicate entry key"):
+        SharedLibrary.create([Entry("article", "a", []), Entry("book", "a", [])])
+    with pytest.raises(TypeError, match="Only string values"):
+        SharedLibrary.create([Entry("article", "a", [Field("author", ["A", "B"])])])
+
+
+def _read_in_other_process(name, queue):
+    with SharedLibrary.attach(name) as shared:
+        queue.put((shared.size, shared["smith2020"]["title"]))
+
+
+def test_attach_from_other_process(shared):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_read_in_other_process, args=(shared.name, queue))
+    process.start()
+    assert queue.get(timeout=60) == (shared.size, "Ünïcode Title")
+    process.join(timeout=60)
+    assert process.exitcode == 0
+
+    # The memory is still available after the other process exited
+    with SharedLibrary.attach(shared.name) as attached:
+        assert attached["doe2019"]["year"] == "2020"
+
+
+def test_attach_to_other_memory(shared):
+    shared._memory.buf[:8] = b"NOTABIB\x00"
+    with pytest.raises(ValueError, match="does not hold a shared library"):
+        SharedLibrary.attach(shared.name)
@@ -0,0 +1,208 @@
+import pickle
+
+import pytest
+
+from bibtexparser import parse_file
+from bibtexparser import parse_string
+from bibtexparser import write_string
+from bibtexparser.library import Library
+from bibtexparser.middlewares import SortBlocksByTypeAndKeyMiddleware
+from bibtexparser.middlewares import SortFieldsAlphabeticallyMiddleware
+from bibtexparser.middlewares.parsestack import default_parse_stack
+from bibtexparser.model import DuplicateBlockKeyBlock
+from bibtexparser.model import Entry
+from bibtexparser.model import Field
+from bibtexparser.model import String
+from bibtexparser.splitter import Splitter
+from bibtexparser.sqlite import SqliteLibrary
+
+BIBTEX = r"""@string{jmlr = {Journal of Machine Learning Research}}
+
+@preamble{"Ünïcode preamble"}
+
+@article{smith2020,
+  author = {Smith, John},
+  title = {A Title},
+  journal = jmlr,
+  year = 2020
+}
+
+@comment{An explicit comment}
+
+An implicit comment
+
+@book{doe2019,
+  title = {A Book},
+  year = 2020
+}
+
+@misc{broken,
+  title = {Missing brace
+"""
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "library.sqlite"
+
+
+def _unparsed():
+    return Splitter(BIBTEX).split()
+
+
+def test_blocks_round_trip(path):
+    library = _unparsed()
+    with SqliteLibrary(path, library.blocks) as stored:
+        assert write_string(stored) == write_string(library)
+        assert len(stored.blocks) == len(library.blocks)
+
+    # The blocks are persisted
+    with SqliteLibrary(path) as stored:
+        # (The last block holds an exception, which is never equal to another one)
+        assert list(stored.blocks)[:-1] == library.blocks[:-1]
+        assert stored.blocks[-3:-1] == library.blocks[-3:-1]
+        assert stored.blocks[2] == library.blocks[2]
+        assert list(stored.entries) == library.entries
+        assert list(stored.comments) == library.comments
+        assert list(stored.preambles) == library.preambles
+        assert stored.strings == library.strings
+        assert len(stored.failed_blocks) == 1
+        assert stored.failed_blocks[0].raw == library.failed_blocks[0].raw
+        assert write_string(stored) == write_string(library)
+
+
+def test_lookups(path):
+    with SqliteLibrary(path, _unparsed().blocks) as library:
+        assert library.entries_dict["doe2019"]["title"] == "{A Book}"
+        assert "smith2020" in library.entries_dict and "missing" not in library.entries_dict
+        assert list(library.entries_dict) == ["smith2020", "doe2019"]
+        assert library.strings_dict["jmlr"].value == "{Journal of Machine Learning Research}"
+
+        # Cached blocks are returned again
+        assert library.entries_dict["doe2019"] is library.entries[1]
+
+        assert [e.key for e in library.find_entries(entry_type="article")] == ["smith2020"]
+        assert [e.key for e in library.find_entries(fields={"year": "2020"})] == [
+            "smith2020",
+            "doe2019",
+        ]
+        assert [e.key for e in library.find_entries(fields={"journal": None})] == ["smith2020"]
+        assert list(library.find_entries("book", {"journal": None})) == []
+
+
+def test_duplicate_keys(path):
+    with SqliteLibrary(path) as library:
+        library.add(Entry("article", "a", [Field("title", "First")]))
+        library.add([Entry("article", "b", []), Entry("book", "a", []), Entry("misc", "b", [])])
+        assert [e.key for e in library.entries] == ["a", "b"]
+        assert [type(b) for b in library.failed_blocks] == [DuplicateBlockKeyBlock] * 2
+        assert library.failed_blocks[0].previous_block["title"] == "First"
+
+        with pytest.raises(ValueError, match=r"Duplicate keys found: \['a'\]"):
+            library.add(Entry("article", "a", []), fail_on_duplicate_key=True)
+        with pytest.raises(ValueError, match="Duplicate key found"):
+            library.replace(library.entries_dict["b"], Entry("article", "a", []))
+        assert library.entries_dict["b"].entry_type == "article"
+
+
+def test_remove_and_replace(path):
+    with SqliteLibrary(path, _unparsed().blocks, cache_size=0) as library:
+        library.remove(library.entries_dict["smith2020"])
+        library.replace(library.strings[0], String("jmlr", "{JMLR}"))
+        library.replace(library.comments[0], String("other", "{Other}"))
+        with pytest.raises(ValueError, match="not in library"):
+            library.remove(Entry("article", "smith2020", []))
+
+    with SqliteLibrary(path) as library:
+        assert [e.key for e in library.entries] == ["doe2019"]
+        assert library.strings_dict["jmlr"].value == "{JMLR}"
+        assert list(library.strings_dict) == ["jmlr", "other"]
+        assert library.blocks[2] == String("other", "{Other}")
+
+
+@pytest.mark.parametrize("cache_size", [1, 100])
+def test_changes_to_cached_blocks_are_saved(path, cache_size):
+    with SqliteLibrary(path, _unparsed().blocks, cache_size=cache_size) as library:
+        library.entries_dict["smith2020"]["title"] = "Changed"
+        library.entries_dict["doe2019"].fields.append(Field("note", ["Not", "a", "string"]))
+        library.entries_dict["doe2019"].parser_metadata["checked"] = True
+
+    with SqliteLibrary(path) as library:
+        assert library.entries_dict["smith2020"]["title"] == "Changed"
+        assert library.entries_dict["doe2019"]["note"] == ["Not", "a", "string"]
+        assert library.entries_dict["doe2019"].parser_metadata == {"checked": True}
+
+
+def _numbered_entries(num_entries):
+    return [
+        Entry("article", f"k{i}", [Field("title", f"Title {i}"), Field("year", "2020")])
+        for i in range(num_entries)
+    ]
+
+
+@pytest.mark.parametrize("cache_size", [1, 5, 100])
+def test_changes_while_iterating_are_saved(path, cache_size):
+    with SqliteLibrary(path, _numbered_entries(10), cache_size=cache_size) as library:
+        for entry in library.entries:
+            entry["note"] = entry.key
+
+    with SqliteLibrary(path) as library:
+        assert [entry["note"] for entry in library.entries] == [f"k{i}" for i in range(10)]
+
+
+def test_iterating_with_partly_filled_cache(path):
+    with SqliteLibrary(path, _numbered_entries(12), cache_size=5) as library:
+        # The first iteration leaves the last entries in the cache, which the second
+        #   iteration evicts before reaching them
+        for _ in range(2):
+            entries = list(library.entries)
+            assert [[f.key for f in entry.fields] for entry in entries] == [["title", "year"]] * 12
+        entries[-1]["note"] = "Changed"
+
+    with SqliteLibrary(path) as library:
+        assert [f.key for f in library.entries[-1].fields] == ["title", "year", "note"]
+        assert library.entries[9]["title"] == "Title 9"
+
+
+def test_apply_parse_stack(path, tmp_path):
+    bibtex_file = tmp_path / "library.bib"
+    bibtex_file.write_text(BIBTEX, encoding="UTF-8")
+    expected = parse_string(BIBTEX)
+
+    with SqliteLibrary(path, cache_size=2) as library:
+        library.add(_unparsed().blocks)
+        library.apply(default_parse_stack())
+        assert write_string(library) == write_string(expected)
+        assert (
+            library.entries_dict["smith2020"]["journal"] == "Journal of Machine Learning Research"
+        )
+
+        library.apply([SortBlocksByTypeAndKeyMiddleware(), SortFieldsAlphabeticallyMiddleware()])
+        assert [e.key for e in library.entries] == ["doe2019", "smith2020"]
+        assert [f.key for f in library.entries[1].fields] == ["author", "journal", "title", "year"]
+
+    # Parsing the file in batches gives the same library as parsing it at once
+    with SqliteLibrary(tmp_path / "other.sqlite") as library:
+        library.add_bibtex(bibtex_file, batch_size=2)
+        assert write_string(library) == write_string(parse_file(str(bibtex_file)))
+
+
+def test_modification_tracking_is_stored(path):
+    blocks = parse_string(BIBTEX, track_modifications=True).blocks
+    blocks[2]["title"] = "Modified"
+    with SqliteLibrary(path, blocks) as library:
+        assert [block.is_unmodified() for block in library.blocks] == [
+            block.is_unmodified() for block in blocks
+        ]
+        assert library.blocks[0].is_unmodified() and not library.blocks[2].is_unmodified()
+        # Unmodified blocks are stored in columns; the modified entry and the failed block
+        #   are stored as pickles
+        pickled = library._db.execute("SELECT id FROM blocks WHERE data IS NOT NULL").fetchall()
+        assert len(pickled) == 2
+
+
+def test_not_picklable(path):
+    with SqliteLibrary(path) as library:
+        with pytest.raises(TypeError, match="can not be pickled"):
+            pickle.dumps(library)
+        assert Library(blocks=library.blocks).blocks == []
@@ -0,0 +1,189 @@
+import io
+import pickle
+
+import pytest
+
+from bibtexparser import Library
+from bibtexparser.exceptions import BlockAbortedException
+from bibtexparser.middlewares import SortBlocksByTypeAndKeyMiddleware
+from bibtexparser.model import DuplicateBlockKeyBlock
+from bibtexparser.model import Entry
+from bibtexparser.model import ExplicitComment
+from bibtexparser.model import ImplicitComment
+from bibtexparser.model import ParsingFailedBlock
+from bibtexparser.model import Preamble
+from bibtexparser.model import String
+from bibtexparser.splitter import Splitter
+from bibtexparser.streaming import iter_blocks
+from bibtexparser.streaming import merge_sorted
+from bibtexparser.streaming import sort_blocks
+
+BIBTEX = """% A leading comment
+@string{jmlr = {Journal of Machine Learning Research}}
+
+@article{zeta,
+  title = {Zeta @ {Conference}},
+  journal = jmlr,
+  year = 2021
+}
+
+@comment{An explicit comment}
+% An implicit comment, above alpha
+@article{alpha,
+  title = {Alpha},
+  year = 2019
+}
+@preamble{"A preamble"}
+@article{broken, title = {Not closed
+@article{mu, title = "Mu", year = 2020}
+% A trailing comment
+"""
+
+
+def _summary(blocks):
+    return [(type(b).__name__, b.start_line, b.raw) for b in blocks]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 16, 100, 10_000])
+def test_iter_blocks_matches_splitter(chunk_size):
+    expected = Splitter(BIBTEX).split().blocks
+    blocks = list(iter_blocks(io.StringIO(BIBTEX), chunk_size=chunk_size))
+    assert _summary(blocks) == _summary(expected)
+    assert blocks[2]["title"] == "{Zeta @ {Conference}}"
+
+
+def test_iter_blocks_from_path(tmp_path):
+    path = tmp_path / "library.bib"
+    path.write_text(BIBTEX, encoding="UTF-8")
+    blocks = list(iter_blocks(path, chunk_size=32))
+    assert _summary(blocks) == _summary(Splitter(BIBTEX).split().blocks)
+
+
+def test_iter_blocks_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        list(iter_blocks(io.StringIO(BIBTEX), chunk_size=0))
+
+
+@pytest.mark.parametrize("max_blocks_in_memory", [1, 3, 1000])
+@pytest.mark.parametrize("preserve_comments_on_top", [True, False])
+def test_sort_blocks_matches_sort_middleware(max_blocks_in_memory, preserve_comments_on_top):
+    expected = SortBlocksByTypeAndKeyMiddleware(
+        preserve_comments_on_top=preserve_comments_on_top
+    ).transform(Splitter(BIBTEX).split())
+
+    blocks = sort_blocks(
+        iter_blocks(io.StringIO(BIBTEX), chunk_size=64),
+        preserve_comments_on_top=preserve_comments_on_top,
+        max_blocks_in_memory=max_blocks_in_memory,
+    )
+    assert _summary(blocks) == _summary(expected.blocks)
+
+
+def test_sort_blocks_custom_key_and_order():
+    blocks = Splitter(BIBTEX).split().blocks
+    sorted_blocks = list(
+        sort_blocks(
+            blocks,
+            block_type_order=(Entry, String),
+            key=lambda block: block["year"] if isinstance(block, Entry) else "",
+            max_blocks_in_memory=2,
+        )
+    )
+
+    assert [b.key for b in sorted_blocks if isinstance(b, Entry)] == ["alpha", "mu", "zeta"]
+    # Comments stay on top of their block
+    alpha_index = next(i for i, b in enumerate(sorted_blocks) if getattr(b, "key", "") == "alpha")
+    assert isinstance(sorted_blocks[alpha_index - 1], ImplicitComment)
+    assert isinstance(sorted_blocks[alpha_index - 2], ExplicitComment)
+    # Types not in the order are put at the end
+    assert {type(b) for b in sorted_blocks[-3:]} == {ParsingFailedBlock, Preamble, ImplicitComment}
+
+
+def test_sort_blocks_empty():
+    assert list(sort_blocks([])) == []
+    assert list(sort_blocks(Library().blocks, max_blocks_in_memory=1)) == []
+
+
+def test_parsing_exceptions_can_be_pickled():
+    failed_block = Splitter(BIBTEX).split().failed_blocks[0]
+    unpickled = pickle.loads(pickle.dumps(failed_block))
+
+    assert isinstance(unpickled.error, BlockAbortedException)
+    assert unpickled.error.abort_reason == failed_block.error.abort_reason
+    assert unpickled.error.end_index == failed_block.error.end_index
+    assert unpickled.raw == failed_block.raw
+
+
+def _sorted_bibtex(*keys_and_titles):
+    return "".join(
+        f"% About {key}\n@article{{{key}, title = {{{title}}}}}\n" for key, title in keys_and_titles
+    )
+
+
+MERGE_SOURCES = [
+    _sorted_bibtex(("a", "A1"), ("c", "C1"), ("e", "E1")),
+    _sorted_bibtex(("b", "B2"), ("c", "C2")),
+    _sorted_bibtex(("c", "C3"), ("d", "D3")),
+]
+
+
+def _merged(on_duplicate, **kwargs):
+    sources = [iter_blocks(io.StringIO(source)) for source in MERGE_SOURCES]
+    return list(merge_sorted(sources, on_duplicate=on_duplicate, **kwargs))
+
+
+@pytest.mark.parametrize("on_duplicate, expected_c", [("first", "C1"), ("last", "C3")])
+def test_merge_sorted_keep_one(on_duplicate, expected_c):
+    blocks = _merged(on_duplicate)
+    entries = [b for b in blocks if isinstance(b, Entry)]
+    assert [e.key for e in entries] == ["a", "b", "c", "d", "e"]
+    assert entries[2]["title"] == "{" + expected_c + "}"
+    # Dropped duplicates are dropped with their comments
+    assert len(blocks) == 2 * len(entries)
+    assert all(isinstance(b, ImplicitComment) for b in blocks[::2])
+
+
+def test_merge_sorted_fail_on_duplicates():
+    blocks = _merged("fail")
+    assert [getattr(b, "key", None) for b in blocks if not isinstance(b, ImplicitComment)] == [
+        "a",
+        "b",
+        "c",
+        "c",
+        "c",
+        "d",
+        "e",
+    ]
+    first_c, *duplicates = [b for b in blocks if getattr(b, "key", None) == "c"]
+    assert first_c["title"] == "{C1}"
+    assert all(isinstance(b, DuplicateBlockKeyBlock) for b in duplicates)
+    assert [b.ignore_error_block["title"] for b in duplicates] == ["{C2}", "{C3}"]
+    assert all(b.previous_block is first_c for b in duplicates)
+
+
+def test_merge_sorted_from_paths(tmp_path):
+    paths = []
+    for i, source in enumerate(MERGE_SOURCES):
+        paths.append(tmp_path / f"{i}.bib")
+        paths[-1].write_text(source, encoding="UTF-8")
+    blocks = list(merge_sorted(paths, on_duplicate="first"))
+    assert [b.key for b in blocks if isinstance(b, Entry)] == ["a", "b", "c", "d", "e"]
+
+
+def test_merge_sorted_matches_sort_of_concatenation():
+    sorter = SortBlocksByTypeAndKeyMiddleware(allow_inplace_modification=False)
+    halves = [BIBTEX[: BIBTEX.index("@comment")], BIBTEX[BIBTEX.index("@comment") :]]
+    sorted_halves = [sorter.transform(Splitter(half).split()).blocks for half in halves]
+    expected = sorter.transform(Splitter(BIBTEX).split())
+    # Line numbers differ, as the halves were split independently
+    assert [(t, raw) for t, _, raw in _summary(merge_sorted(sorted_halves))] == [
+        (t, raw) for t, _, raw in _summary(expected.blocks)
+    ]
+
+
+def test_merge_sorted_invalid_input():
+    unsorted = Splitter(_sorted_bibtex(("b", "B"), ("a", "A"))).split().blocks
+    with pytest.raises(ValueError, match="not sorted"):
+        list(merge_sorted([unsorted]))
+    with pytest.raises(ValueError):
+        list(merge_sorted([], on_duplicate="ignore"))
@@ -5,6 +5,7 @@ import pytest
 from bibtexparser import BibtexFormat
 from bibtexparser import Library
 from bibtexparser import writer
+from bibtexparser.model import Block
 from bibtexparser.model import Entry
 from bibtexparser.model import ExplicitComment
 from bibtexparser.model import Field
@@ -105,6 +106,34 @@ def test_entry_value_column(value_column):
         assert f"{bib_format.indent}veryverylongkeyfield = 2020" in string
 
 
+def test_entry_value_column_auto_does_not_change_format():
+    entry_block = _dummy_entry()
+    entry_block.set_field(Field(key="veryverylongkeyfield", value="2020"))
+    bib_format = BibtexFormat()
+    bib_format.value_column = "auto"
+    bib_format.trailing_comma = True
+
+    string = writer.write(Library(blocks=[entry_block]), bib_format)
+    assert string.endswith("\tveryverylongkeyfield = 2020,\n}\n")
+    assert bib_format.value_column == "auto"
+    # Keys of another library lead to another alignment
+    assert '\ttitle  = "myTitle",' in writer.write(Library(blocks=[_dummy_entry()]), bib_format)
+
+
+def test_write_entry_without_fields_and_block_subclasses():
+    class CustomEntry(Entry):
+        pass
+
+    class CustomComment(ImplicitComment):
+        pass
+
+    library = Library(blocks=[CustomEntry("misc", "empty", []), CustomComment(comment="% custom")])
+    assert writer.write(library) == "@misc{empty,\n}\n\n\n% custom\n"
+
+    with pytest.raises(ValueError, match="Unknown block type"):
+        writer.write(Library(blocks=[Block()]))
+
+
 @pytest.mark.parametrize("block_separator", [None, "\n\n", "\n-----\n"])
 def test_block_separator(block_separator):
     library = Library(blocks=[_DUMMY_STRING, _DUMMY_PREAMBLE])
@@ -143,3 +172,27 @@ def test_write_failed_block():
     assert lines[2] == "except = {that-there-need-to-be},"
     assert lines[3] == "other = {multiple-lines}"
     assert lines[4] == "}"
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+@pytest.mark.parametrize("value_column", [0, "auto"])
+def test_write_with_workers(workers, value_column):
+    blocks = []
+    for i in range(25):
+        entry = _dummy_entry()
+        entry.key = f"key{i}"
+        entry.set_field(Field(key="x" * i, value='"long key"'))
+        blocks.extend([entry, ImplicitComment(comment=f"% comment {i}")])
+    library = Library(blocks=blocks + [_DUMMY_STRING, _DUMMY_PREAMBLE])
+    bib_format = BibtexFormat()
+    bib_format.value_column = value_column
+
+    expected = writer.write(library, bib_format)
+    assert writer.write(library, bib_format, workers=workers) == expected
+    chunks = list(writer.write_iter(library, bib_format, workers=workers))
+    assert 1 < len(chunks) < len(library.blocks)
+    assert "".join(chunks) == expected
+
+
+def test_write_empty_library_with_workers():
+    assert writer.write(Library(), workers=4) == ""